@@ -0,0 +1,276 @@
+"""What one player can infer about where the cards they cannot see are.
+
+A Beliefs tracks, from one seat's point of view and once trump is known, the mask of cards each
+other seat (and the kitty) could still hold and how many hidden cards each holds. Every card
+played to a trick is an O(1) update: the card leaves every mask, and a seat that fails to follow
+the led effective suit (so the left bower counts as trump) can hold no more of it. The lead card
+is either known to be in the kitty (turned down), or in the dealer's hand or the kitty (picked up,
+the dealer may have discarded it).
+
+sample draws an assignment of the hidden cards to their holders uniformly from all those
+consistent with what is known, without rejection. Cards that the same holders could hold are
+interchangeable, so a deal is a choice of how many of each such class of cards goes to each
+holder. The number of deals completing each partial choice is counted once per state and
+memoized, and each sample then walks the classes, picking counts in proportion to those numbers.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import random
+import typing
+
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import EFFECTIVE_SUIT_MASKS
+from pyeuchre.bitboard import FULL_MASK
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import suit_index
+from pyeuchre.bitboard import to_mask
+
+
+# only import game classes for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.events import CardPlayed
+    from pyeuchre.game import Hand
+    from pyeuchre.people.players import Player
+
+
+SEATS = 4
+HAND_SIZE = 5
+KITTY_SIZE = 3
+
+# Holder index of the kitty, after the seats
+KITTY = SEATS
+HOLDERS = SEATS + 1
+
+# A class of interchangeable hidden cards: their indices, and the holders that could hold them
+_Class = tuple[list[int], tuple[int, ...]]
+# The deals completing a step of sampling: their number, each way to split the class among its holders that leads to
+# any, and the running total of deals up to each split
+_Step = tuple[int, list[tuple[int, ...]], list[int]]
+_Plan = tuple[list[_Class], dict[tuple[int, tuple[int, ...]], _Step]]
+
+
+class Beliefs:
+    """One seat's knowledge of which hidden cards each other seat and the kitty could hold."""
+
+    __slots__ = ("seat", "trump", "skip", "own", "possible", "counts", "led", "played", "_plan")
+
+    def __init__(
+        self,
+        seat: int,
+        trump: int,
+        own: int,
+        dealer: int,
+        up: int,
+        picked_up: bool,
+        discard: int | None = None,
+        skip: int | None = None,
+    ) -> None:
+        """Initialize beliefs as play begins.
+
+        Args:
+            seat (int): Seat whose knowledge this is.
+            trump (int): Trump suit index.
+            own (int): Mask of the cards the seat holds, after any discard.
+            dealer (int): Dealer's seat.
+            up (int): Card index of the lead card.
+            picked_up (bool): Whether the dealer picked the lead card up.
+            discard (int): Card index the dealer discarded, if the seat is the dealer and picked up.
+            skip (int): Seat sitting out because their partner went alone.
+        """
+        self.seat = seat
+        self.trump = trump
+        self.skip = skip
+        self.own = own
+
+        seen = own
+        if not picked_up:
+            seen |= 1 << up
+        elif discard is not None:
+            seen |= 1 << discard
+        hidden = FULL_MASK & ~seen
+
+        self.possible = [0 if holder == seat else hidden for holder in range(HOLDERS)]
+        self.counts = [0 if holder == seat else HAND_SIZE for holder in range(SEATS)]
+        # The kitty also holds the dealer's discard, unless this seat is the dealer and knows what it was
+        self.counts.append(KITTY_SIZE + (picked_up and discard is None))
+        if picked_up and not own >> up & 1:
+            # The dealer either kept the lead card or discarded it into the kitty
+            for holder in range(SEATS):
+                if holder != dealer:
+                    self.possible[holder] &= ~(1 << up)
+
+        # Effective suit led to the current trick, and the number of cards played to it
+        self.led = -1
+        self.played = 0
+        self._plan: _Plan | None = None
+
+    @classmethod
+    def from_hand(cls, hand: Hand, player: Player, discard: int | None = None) -> Beliefs:
+        """Derive a player's beliefs from a live hand once trump has been called, replaying the tricks so far.
+
+        Seats are indices into hand.players.players.
+
+        Args:
+            hand (Hand): Hand being played.
+            player (Player): Player whose knowledge this is.
+            discard (int): Card index the player discarded, if they are the dealer and picked up.
+
+        Raises:
+            ValueError: If trump has not been called.
+        """
+        if hand.trump_suit is None or hand.lead is None:
+            raise ValueError("beliefs need a hand with trump called")
+        seats = hand.players.players
+        played = [entry for trick in hand.tricks for entry in trick.cards]
+        beliefs = cls(
+            seats.index(player),
+            suit_index(hand.trump_suit),
+            to_mask(player.cards) | to_mask(entry["card"] for entry in played if entry["player"] is player),
+            seats.index(hand.players.dealer),
+            card_index(hand.lead),
+            hand.discard is not None,
+            discard,
+            next((seat for seat, other in enumerate(seats) if other.skip), None),
+        )
+        for entry in played:
+            beliefs.play(seats.index(entry["player"]), card_index(entry["card"]))
+        return beliefs
+
+    def play(self, seat: int, card: int) -> None:
+        """Update for a card played to the current trick.
+
+        Args:
+            seat (int): Seat that played the card.
+            card (int): Card index played.
+        """
+        keep = ~(1 << card)
+        possible = self.possible
+        for holder in range(HOLDERS):
+            possible[holder] &= keep
+        if seat == self.seat:
+            self.own &= keep
+        else:
+            self.counts[seat] -= 1
+
+        suit = EFFECTIVE_SUIT[self.trump][card]
+        if not self.played:
+            self.led = suit
+        elif suit != self.led:
+            possible[seat] &= ~EFFECTIVE_SUIT_MASKS[self.trump][self.led]
+
+        self.played += 1
+        if self.played == (SEATS if self.skip is None else SEATS - 1):
+            self.led, self.played = -1, 0
+        self._plan = None
+
+    def update(self, event: CardPlayed) -> None:
+        """Update for a CardPlayed event, for following a game's events."""
+        seats = event.trick.hand.players.players
+        self.play(seats.index(event.player), card_index(event.card))
+
+    @property
+    def hidden(self) -> int:
+        """Mask of the cards this seat cannot see."""
+        mask = 0
+        for possible in self.possible:
+            mask |= possible
+        return mask
+
+    def _classes(self) -> list[_Class]:
+        """Group the hidden cards by the holders that could hold them, most constrained first."""
+        groups: dict[tuple[int, ...], list[int]] = {}
+        for card in indices(self.hidden):
+            holders = tuple(holder for holder in range(HOLDERS) if self.possible[holder] >> card & 1)
+            groups.setdefault(holders, []).append(card)
+        return sorted(((cards, holders) for holders, cards in groups.items()), key=lambda group: len(group[1]))
+
+    def _prepare(self) -> _Plan:
+        """Return the classes of hidden cards and the memoized deal counts for the current state."""
+        if self._plan is None:
+            classes = self._classes()
+            steps: dict[tuple[int, tuple[int, ...]], _Step] = {}
+            _count(classes, 0, tuple(self.counts), steps)
+            self._plan = (classes, steps)
+        return self._plan
+
+    def count(self) -> int:
+        """Return the number of deals of the hidden cards consistent with what is known."""
+        _classes, steps = self._prepare()
+        step = steps.get((0, tuple(self.counts)))
+        return step[0] if step else 0
+
+    def sample(self, rng: random.Random) -> list[int]:
+        """Deal the hidden cards uniformly at random among the deals consistent with what is known.
+
+        Args:
+            rng (Random): Random number generator.
+
+        Returns:
+            The mask of cards each seat holds, this seat's own included, then the kitty's hidden cards.
+
+        Raises:
+            ValueError: If no deal is consistent, which can only happen if a player reneged.
+        """
+        classes, steps = self._prepare()
+        room = tuple(self.counts)
+        if not steps.get((0, room), (0,))[0]:
+            raise ValueError("no deal is consistent with the cards played")
+
+        hands = [0] * HOLDERS
+        hands[self.seat] = self.own
+        for k, (cards, holders) in enumerate(classes):
+            total, splits, cumulative = steps[k, room]
+            split = splits[bisect.bisect_right(cumulative, rng.randrange(total))]
+            shuffled = rng.sample(cards, len(cards))
+            rest = list(room)
+            start = 0
+            for holder, n in zip(holders, split):
+                for card in shuffled[start : start + n]:
+                    hands[holder] |= 1 << card
+                start += n
+                rest[holder] -= n
+            room = tuple(rest)
+        return hands
+
+
+def _compositions(n: int, holders: tuple[int, ...], room: tuple[int, ...]) -> typing.Iterator[tuple[int, ...]]:
+    """Yield each way to split n cards among holders, as counts per holder within each holder's room."""
+    if len(holders) == 1:
+        if n <= room[holders[0]]:
+            yield (n,)
+        return
+    for first in range(min(n, room[holders[0]]) + 1):
+        for rest in _compositions(n - first, holders[1:], room):
+            yield (first, *rest)
+
+
+def _count(
+    classes: list[_Class],
+    k: int,
+    room: tuple[int, ...],
+    steps: dict[tuple[int, tuple[int, ...]], _Step],
+) -> int:
+    """Count the deals of classes k onward into holders with room, memoizing the choices at each step."""
+    if k == len(classes):
+        return 0 if any(room) else 1
+    if (k, room) in steps:
+        return steps[k, room][0]
+
+    cards, holders = classes[k]
+    total, splits, cumulative = 0, [], []
+    for split in _compositions(len(cards), holders, room):
+        rest = list(room)
+        for holder, n in zip(holders, split):
+            rest[holder] -= n
+        ways = _count(classes, k + 1, tuple(rest), steps)
+        if ways:
+            # Which of the class's cards go where: a multinomial coefficient
+            total += ways * math.factorial(len(cards)) // math.prod(math.factorial(n) for n in split)
+            splits.append(split)
+            cumulative.append(total)
+    steps[k, room] = (total, splits, cumulative)
+    return total
@@ -0,0 +1,324 @@
+"""Reproducible micro and end-to-end benchmarks of the engine's hot paths.
+
+Every benchmark builds its inputs from a fixed seed, is warmed up, then timed over several rounds
+of a calibrated number of operations. Results report per-operation statistics and can be saved as
+JSON and compared against a saved baseline to catch regressions::
+
+    python -m pyeuchre.bench --json current.json --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import typing
+
+from pyeuchre.bitboard import CARDS
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Deck
+from pyeuchre.cards import is_trump
+from pyeuchre.game import Hand
+from pyeuchre.game import Trick
+from pyeuchre.people.groups import Players
+from pyeuchre.sim import play_game
+from pyeuchre.sim import random_players
+from pyeuchre.utility.input import parse_card
+
+
+VERSION = 1
+
+# A benchmark takes a seeded random number generator and returns the operation to time
+Setup = typing.Callable[[random.Random], typing.Callable[[], object]]
+
+
+class BenchResult(typing.NamedTuple):
+    """Timings of one benchmark, in seconds per operation."""
+
+    name: str
+    number: int
+    samples: list[float]
+
+    @property
+    def mean(self) -> float:
+        """Mean time per operation."""
+        return statistics.fmean(self.samples)
+
+    @property
+    def median(self) -> float:
+        """Median time per operation."""
+        return statistics.median(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        """Standard deviation of the time per operation across rounds."""
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def best(self) -> float:
+        """Fastest round's time per operation."""
+        return min(self.samples)
+
+    @property
+    def ops_per_second(self) -> float:
+        """Operations per second at the median."""
+        return 1 / self.median if self.median else 0.0
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the result as JSON-serializable data."""
+        return {
+            "number": self.number,
+            "samples": self.samples,
+            "mean": self.mean,
+            "median": self.median,
+            "stdev": self.stdev,
+            "best": self.best,
+            "ops_per_second": self.ops_per_second,
+        }
+
+
+def _deck(rng: random.Random) -> typing.Callable[[], object]:
+    """Build, shuffle and deal out a deck."""
+
+    def run() -> object:
+        deck = Deck()
+        deck.shuffle(rng)
+        return [list(deck.deal(5)) for _i in range(4)]
+
+    return run
+
+
+def _hand_deal(rng: random.Random) -> typing.Callable[[], object]:
+    """Shuffle and deal a hand to a table."""
+    players = random_players(random.Random(rng.random()))
+    return lambda: Hand(players, rng=rng)
+
+
+def _trick_resolve(rng: random.Random) -> typing.Callable[[], object]:
+    """Resolve the winner of a trick card by card."""
+    players = random_players(random.Random(rng.random()))
+    hand = Hand(players, rng=rng)
+    deals = [rng.sample(CARDS, 4) for _i in range(256)]
+    trumps = [rng.choice(SUITS) for _i in range(256)]
+    plays = itertools.cycle(list(zip(deals, trumps)))
+
+    def run() -> object:
+        cards, trump = next(plays)
+        trick = Trick(hand, trump)
+        for player, card in zip(players, cards):
+            trick.add(player, card)
+        return trick.winner
+
+    return run
+
+
+def _hand_play(rng: random.Random) -> typing.Callable[[], object]:
+    """Play out the five tricks of a dealt hand with trump already called."""
+    players = random_players(random.Random(rng.random()))
+    decks = [[*CARDS] for _i in range(256)]
+    for cards in decks:
+        rng.shuffle(cards)
+    deals = itertools.cycle(decks)
+
+    def run() -> object:
+        hand = Hand(players, deck=Deck([*next(deals)]), shuffle_deck=False)
+        hand.trump_suit = hand.lead.suit
+        hand.caller = players.dealer
+        hand.trump_team = players.get_team(hand.caller)
+        while hand.active:
+            hand.start_trick()
+            typing.cast(Trick, hand.trick).play()
+        return hand.score()
+
+    return run
+
+
+def _is_trump(rng: random.Random) -> typing.Callable[[], object]:
+    """Classify every card against every trump suit."""
+    pairs = [(card, suit) for card in CARDS for suit in SUITS]
+    rng.shuffle(pairs)
+    return lambda: sum(is_trump(card, suit) for card, suit in pairs)
+
+
+def _players(rng: random.Random) -> typing.Callable[[], object]:
+    """Order the table from each seat and look up each player's team."""
+    players: Players = random_players(random.Random(rng.random()))
+    seats = players.players
+
+    def run() -> object:
+        return [(list(players.ordered(player)), players.get_team(player)) for player in seats]
+
+    return run
+
+
+def _parse_card(rng: random.Random) -> typing.Callable[[], object]:
+    """Parse a mix of short and long card descriptions."""
+    texts = [f"{card.rank.short}{card.suit.short}" for card in CARDS]
+    texts += [f"{card.rank.long} of {card.suit.long}" for card in CARDS]
+    rng.shuffle(texts)
+    return lambda: [parse_card(text) for text in texts]
+
+
+def _full_game(rng: random.Random) -> typing.Callable[[], object]:
+    """Play a complete game between seeded bots."""
+    players = random_players(rng)
+    return lambda: play_game(players, rng)
+
+
+BENCHMARKS: dict[str, Setup] = {
+    "deck": _deck,
+    "hand_deal": _hand_deal,
+    "trick_resolve": _trick_resolve,
+    "hand_play": _hand_play,
+    "is_trump": _is_trump,
+    "players": _players,
+    "parse_card": _parse_card,
+    "full_game": _full_game,
+}
+
+
+def measure(
+    run: typing.Callable[[], object],
+    name: str = "",
+    rounds: int = 7,
+    round_time: float = 0.1,
+    warmup: float = 0.05,
+) -> BenchResult:
+    """Time an operation over several rounds.
+
+    The number of operations per round is calibrated (doubling, as timeit does) during warm-up so
+    each round takes about round_time.
+
+    Args:
+        run (Callable): Operation to time.
+        name (str): Benchmark name.
+        rounds (int): Number of timed rounds.
+        round_time (float): Target seconds per round.
+        warmup (float): Minimum seconds to run before timing.
+    """
+    timer = time.perf_counter
+    number, elapsed, spent = 1, 0.0, 0.0
+    while True:
+        start = timer()
+        for _i in range(number):
+            run()
+        elapsed = timer() - start
+        spent += elapsed
+        if elapsed >= round_time or (spent >= warmup and elapsed * 2 > round_time):
+            break
+        number *= 2
+
+    samples = []
+    for _round in range(rounds):
+        start = timer()
+        for _i in range(number):
+            run()
+        samples.append((timer() - start) / number)
+    return BenchResult(name, number, samples)
+
+
+def run_benchmarks(
+    names: typing.Iterable[str] | None = None,
+    seed: int = 0,
+    rounds: int = 7,
+    round_time: float = 0.1,
+    warmup: float = 0.05,
+) -> dict[str, BenchResult]:
+    """Run benchmarks, each from its own seeded random number generator.
+
+    Args:
+        names (Iterable): Benchmarks to run, defaulting to all of BENCHMARKS.
+        seed (int): Master seed.
+        rounds (int): Timed rounds per benchmark.
+        round_time (float): Target seconds per round.
+        warmup (float): Minimum warm-up seconds per benchmark.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        run = BENCHMARKS[name](random.Random(f"{seed}:{name}"))
+        results[name] = measure(run, name, rounds, round_time, warmup)
+    return results
+
+
+def to_json(results: dict[str, BenchResult], seed: int = 0) -> dict[str, typing.Any]:
+    """Return results as JSON-serializable data, with the environment they were measured in."""
+    return {
+        "version": VERSION,
+        "seed": seed,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": {name: result.as_dict() for name, result in results.items()},
+    }
+
+
+def compare(
+    baseline: dict[str, typing.Any],
+    current: dict[str, typing.Any],
+    threshold: float = 0.1,
+) -> dict[str, tuple[float, bool]]:
+    """Compare median times against a baseline.
+
+    Args:
+        baseline (dict): JSON data from to_json for the baseline.
+        current (dict): JSON data from to_json for the current run.
+        threshold (float): Relative slowdown counted as a regression.
+
+    Returns:
+        For each benchmark in both, the ratio of current to baseline median time and whether it regressed.
+    """
+    ratios = {}
+    for name, result in current["results"].items():
+        if name in baseline["results"]:
+            ratio = result["median"] / baseline["results"][name]["median"]
+            ratios[name] = (ratio, ratio > 1 + threshold)
+    return ratios
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks, print a report and optionally save or compare JSON.
+
+    Returns:
+        1 if any benchmark regressed against the baseline, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--round-time", type=float, default=0.1)
+    parser.add_argument("--json", help="file to save results to")
+    parser.add_argument("--compare", help="baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.names, args.seed, args.rounds, args.round_time)
+    data = to_json(results, args.seed)
+    for name, result in results.items():
+        print(
+            f"{name:14} {result.median * 1e6:12.2f} us/op  ±{result.stdev / result.mean * 100:5.1f}%  "
+            f"{result.ops_per_second:12.0f} ops/s"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            ratios = compare(json.load(f), data, args.threshold)
+        for name, (ratio, regressed) in ratios.items():
+            print(f"{name:14} {ratio:6.2f}x{'  REGRESSION' if regressed else ''}")
+        return int(any(regressed for _ratio, regressed in ratios.values()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
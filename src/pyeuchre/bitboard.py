@@ -0,0 +1,238 @@
+"""Compact integer representation of cards, hands and decks.
+
+Each of the 24 cards is assigned a bit index, its id, in the same order ``Deck()`` builds its
+cards (suit-major over ``SUITS``, rank-minor over ``RANKS``), so a set of cards is a 24-bit int
+mask. Trump and follow-suit questions become single AND operations against the masks
+precomputed at import time below.
+"""
+
+import typing
+
+from pyeuchre.cards import CARDS
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Deck
+from pyeuchre.cards import Suit
+
+
+CARD_COUNT = len(SUITS) * len(RANKS)
+FULL_MASK = (1 << CARD_COUNT) - 1
+
+JACK = next(i for i, rank in enumerate(RANKS) if rank.trumper)
+
+# The other suit of the same color as each suit (ie the suit of the left bower)
+SAME_COLOR = [
+    next(j for j, other in enumerate(SUITS) if j != i and suit.is_same_color(other))
+    for i, suit in enumerate(SUITS)
+]
+
+# Cards of each natural suit
+SUIT_MASKS = [((1 << len(RANKS)) - 1) << (s * len(RANKS)) for s in range(len(SUITS))]
+
+# Index of each suit's right bower, which is the left bower of SAME_COLOR[s]
+BOWERS = [s * len(RANKS) + JACK for s in range(len(SUITS))]
+
+# Cards that are trump, keyed by trump suit: the whole suit plus the left bower
+TRUMP_MASKS = [SUIT_MASKS[t] | 1 << BOWERS[SAME_COLOR[t]] for t in range(len(SUITS))]
+
+# Cards that belong to each effective suit, keyed by [trump][suit]
+EFFECTIVE_SUIT_MASKS = [
+    [
+        TRUMP_MASKS[t] if s == t else SUIT_MASKS[s] & ~TRUMP_MASKS[t]
+        for s in range(len(SUITS))
+    ]
+    for t in range(len(SUITS))
+]
+
+# Effective suit of every card, keyed by [trump][card index]
+EFFECTIVE_SUIT = [
+    [
+        next(s for s in range(len(SUITS)) if EFFECTIVE_SUIT_MASKS[t][s] >> i & 1)
+        for i in range(CARD_COUNT)
+    ]
+    for t in range(len(SUITS))
+]
+
+
+def suit_index(suit: Suit) -> int:
+    """Return the index of a suit within SUITS."""
+    return suit.id
+
+
+def card_index(card: Card) -> int:
+    """Return the bit index of a card."""
+    return card.id
+
+
+def index_card(i: int) -> Card:
+    """Return the card for a bit index."""
+    return CARDS[i]
+
+
+def to_mask(cards: typing.Iterable[Card]) -> int:
+    """Convert cards to a mask.
+
+    Args:
+        cards (Iterable): Cards to convert.
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << card_index(card)
+    return mask
+
+
+def indices(mask: int) -> typing.Generator[int, None, None]:
+    """Yield the bit indices set in a mask, lowest first.
+
+    Args:
+        mask (int): Mask to iterate over.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def indices_mask(order: typing.Iterable[int]) -> int:
+    """Convert card indices to a mask.
+
+    Args:
+        order (Iterable): Card indices to convert.
+    """
+    mask = 0
+    for i in order:
+        mask |= 1 << i
+    return mask
+
+
+def from_mask(mask: int) -> list[Card]:
+    """Convert a mask to a list of cards, in bit index order.
+
+    Args:
+        mask (int): Mask to convert.
+    """
+    return [CARDS[i] for i in indices(mask)]
+
+
+def is_trump(i: int, trump: int) -> bool:
+    """Given a trump suit index, determines if a card index is a trump or not."""
+    return bool(TRUMP_MASKS[trump] >> i & 1)
+
+
+def effective_suit(i: int, trump: int) -> int:
+    """Return the suit index a card index counts as under a trump suit index."""
+    return EFFECTIVE_SUIT[trump][i]
+
+
+def follow_mask(mask: int, led: int, trump: int) -> int:
+    """Return the cards in a mask that follow the led effective suit.
+
+    Args:
+        mask (int): Cards held.
+        led (int): Effective suit index that was led.
+        trump (int): Trump suit index.
+    """
+    return mask & EFFECTIVE_SUIT_MASKS[trump][led]
+
+
+def legal_mask(mask: int, led: int | None, trump: int) -> int:
+    """Return the cards in a mask that may be played: those following the led effective suit, or any if void.
+
+    Args:
+        mask (int): Cards held.
+        led (int): Effective suit index that was led, or None when leading.
+        trump (int): Trump suit index.
+    """
+    if led is None:
+        return mask
+    return mask & EFFECTIVE_SUIT_MASKS[trump][led] or mask
+
+
+def legal_cards(cards: typing.Sequence[Card], led: Suit | None, trump: Suit) -> list[Card]:
+    """Return the cards that may be played, in the order they are held.
+
+    Args:
+        cards (Sequence): Cards held.
+        led (Suit): Effective suit that was led, or None when leading.
+        trump (Suit): Trump suit.
+    """
+    legal = legal_mask(to_mask(cards), None if led is None else led.id, trump.id)
+    return [card for card in cards if legal >> card.id & 1]
+
+
+def is_legal(card: Card, cards: typing.Sequence[Card], led: Suit | None, trump: Suit) -> bool:
+    """Return whether playing a held card follows suit.
+
+    Args:
+        card (Card): Card to play.
+        cards (Sequence): Cards held, including card.
+        led (Suit): Effective suit that was led, or None when leading.
+        trump (Suit): Trump suit.
+    """
+    return bool(legal_mask(to_mask(cards), None if led is None else led.id, trump.id) >> card.id & 1)
+
+
+def deck_to_indices(deck: Deck) -> list[int]:
+    """Convert a deck to a list of card indices, preserving order."""
+    return [card_index(card) for card in deck.cards]
+
+
+def deck_from_indices(order: typing.Iterable[int]) -> Deck:
+    """Build a deck whose cards are in the order given by card indices.
+
+    Args:
+        order (Iterable): Card indices, in the same order as Deck.cards.
+    """
+    return Deck([CARDS[i] for i in order])
+
+
+def deck_from_deal(order: typing.Sequence[int]) -> Deck:
+    """Build a deck that Hand.deal will deal in the given order.
+
+    Args:
+        order (Sequence): Card indices in dealing order: five cards for each seat in turn, the lead card, then the kitty.
+    """
+    return deck_from_indices(reversed(order))
+
+
+def deal_order(deck: Deck) -> list[int]:
+    """Return the order in which Hand.deal would deal a deck's cards, the inverse of deck_from_deal."""
+    return deck_to_indices(deck)[::-1]
+
+
+def _strength(i: int, trump: int, led: int) -> int:
+    """Compute how strongly a card index plays in a trick.
+
+    Trump beats the led suit, which beats everything else (0, a card that cannot win).
+    """
+    if i == BOWERS[trump]:
+        return 27
+    if i == BOWERS[SAME_COLOR[trump]]:
+        return 26
+    if is_trump(i, trump):
+        return 20 + i % len(RANKS)
+    if EFFECTIVE_SUIT[trump][i] == led:
+        return 1 + i % len(RANKS)
+    return 0
+
+
+# Effective strength of every card in a trick, keyed by [trump][led effective suit][card index]
+STRENGTH = [
+    [
+        tuple(_strength(i, t, led) for i in range(CARD_COUNT))
+        for led in range(len(SUITS))
+    ]
+    for t in range(len(SUITS))
+]
+
+
+def trick_winner(played: typing.Sequence[int], trump: int) -> int:
+    """Return the position within a trick of the winning card.
+
+    Args:
+        played (Sequence): Card indices in the order they were played.
+        trump (int): Trump suit index.
+    """
+    strength = STRENGTH[trump][EFFECTIVE_SUIT[trump][played[0]]]
+    return max(range(len(played)), key=lambda j: strength[played[j]])
@@ -0,0 +1,108 @@
+"""Canonical forms of hands, deals and positions under suit relabelling.
+
+Relabelling suits so that colors stay paired (eg swapping hearts with diamonds, or swapping both
+red suits with both black suits) maps bowers to bowers, so it changes nothing about how a hand
+plays. There are eight such permutations of SUITS; two of them map a given trump suit to hearts.
+Canonicalizing picks one representative per equivalence class, so caches and tables keyed on
+positions need only store one entry per class.
+
+A permutation is a tuple mapping each suit index to its new suit index.
+"""
+
+import itertools
+import typing
+
+from pyeuchre.bitboard import SUIT_MASKS
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import index_card
+from pyeuchre.bitboard import suit_index
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+
+
+Permutation = tuple[int, ...]
+
+IDENTITY: Permutation = tuple(range(len(SUITS)))
+
+# Every suit permutation that keeps colors paired
+PERMUTATIONS: list[Permutation] = [
+    perm
+    for perm in itertools.permutations(range(len(SUITS)))
+    if all(
+        SUITS[a].is_same_color(SUITS[b]) == SUITS[perm[a]].is_same_color(SUITS[perm[b]])
+        for a in range(len(SUITS))
+        for b in range(len(SUITS))
+    )
+]
+
+# Canonical trump suit index
+TRUMP = 0
+
+# The permutations taking each trump suit to the canonical trump
+TRUMP_PERMUTATIONS = [[perm for perm in PERMUTATIONS if perm[trump] == TRUMP] for trump in range(len(SUITS))]
+
+
+def invert(perm: Permutation) -> Permutation:
+    """Return the permutation that undoes perm."""
+    inverse = [0] * len(perm)
+    for a, b in enumerate(perm):
+        inverse[b] = a
+    return tuple(inverse)
+
+
+def permute_mask(mask: int, perm: Permutation) -> int:
+    """Relabel the suits of the cards in a mask.
+
+    Args:
+        mask (int): Card mask.
+        perm (Permutation): Suit permutation.
+    """
+    out = 0
+    for suit, target in enumerate(perm):
+        out |= (mask & SUIT_MASKS[suit]) >> suit * len(RANKS) << target * len(RANKS)
+    return out
+
+
+def permute_index(i: int, perm: Permutation) -> int:
+    """Relabel the suit of a card index."""
+    return perm[i // len(RANKS)] * len(RANKS) + i % len(RANKS)
+
+
+def permute_card(card: Card, perm: Permutation) -> Card:
+    """Relabel the suit of a card."""
+    return index_card(permute_index(card_index(card), perm))
+
+
+def permute_suit(suit: Suit, perm: Permutation) -> Suit:
+    """Relabel a suit."""
+    return SUITS[perm[suit_index(suit)]]
+
+
+def canonicalize(
+    masks: typing.Sequence[int],
+    trump: int | None = None,
+) -> tuple[tuple[int, ...], Permutation]:
+    """Return the canonical form of a position and the permutation that produced it.
+
+    The canonical form is the least (as a tuple) relabelling of the masks. Given a trump suit, only
+    relabellings that make it the canonical trump (hearts) are considered, so the canonical trump is
+    always TRUMP. Apply invert(perm) to map anything found for the canonical form back.
+
+    Args:
+        masks (Sequence): Card masks describing the position, eg each seat's hand, then cards played.
+        trump (int): Trump suit index, if trump has been called.
+    """
+    perms = PERMUTATIONS if trump is None else TRUMP_PERMUTATIONS[trump]
+    return min((tuple(permute_mask(mask, perm) for mask in masks), perm) for perm in perms)
+
+
+def is_canonical(masks: typing.Sequence[int], trump: int | None = None) -> bool:
+    """Return whether a position is already in canonical form (with trump as the canonical trump).
+
+    Args:
+        masks (Sequence): Card masks describing the position.
+        trump (int): Trump suit index, if trump has been called.
+    """
+    return (trump is None or trump == TRUMP) and canonicalize(masks, trump)[0] == tuple(masks)
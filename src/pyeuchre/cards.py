@@ -10,37 +10,60 @@ from pyeuchre.exceptions import DeckExhaustedError
 
 
 class Rank:
-    """Represents a card's rank."""
+    """Represents a card's rank.
 
-    def __init__(self, rank: tuple[int, bool, str, str]) -> None:
-        """Initialize rank.
+    Ranks are interned: constructing a rank that already exists returns the shared instance, so
+    ranks compare by identity and hash by their small integer id.
+    """
+
+    __slots__ = ("id", "weight", "trumper", "short", "long")
+
+    id: int
+    weight: int
+    trumper: bool
+    short: str
+    long: str
+
+    _interned: typing.ClassVar[dict[str, "Rank"]] = {}
+
+    def __new__(cls, rank: tuple[int, bool, str, str]) -> "Rank":
+        """Return the rank, creating it the first time it is seen.
 
         Args:
             rank (tuple): Weight, trumper status (ie jack), short and long format for rank.
-        """
-        self.weight = rank[0]
-        self.trumper = rank[1]
-        self.short = rank[2]
-        self.long = rank[3]
 
-    def __eq__(self, other: object) -> bool:
-        """Is this rank the same as another rank."""
-        if not isinstance(other, Rank):
-            raise NotImplementedError
-
-        return self.long == other.long
+        Raises:
+            ValueError: If a rank with the same long name but other attributes already exists.
+        """
+        interned = cls._interned.get(rank[3])
+        if interned is None:
+            interned = object.__new__(cls)
+            interned.id = len(cls._interned)
+            interned.weight, interned.trumper, interned.short, interned.long = rank
+            cls._interned[rank[3]] = interned
+        elif (interned.weight, interned.trumper, interned.short, interned.long) != tuple(rank):
+            raise ValueError(f"{rank!r} conflicts with the existing {interned!r}")
+        return interned
+
+    def __hash__(self) -> int:
+        """Return the rank's id."""
+        return self.id
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        """Unpickle and copy to the shared instance."""
+        return Rank, ((self.weight, self.trumper, self.short, self.long),)
 
     def __gt__(self, other: object) -> bool:
         """Is this rank greater than another rank."""
         if not isinstance(other, Rank):
-            raise NotImplementedError
+            return NotImplemented
 
         return self.weight > other.weight
 
     def __lt__(self, other: object) -> bool:
         """Is this rank less than another rank."""
         if not isinstance(other, Rank):
-            raise NotImplementedError
+            return NotImplemented
 
         return self.weight < other.weight
 
@@ -54,25 +77,47 @@ class Rank:
 
 
 class Suit:
-    """Represents a suit."""
+    """Represents a suit.
+
+    Suits are interned like ranks.
+    """
+
+    __slots__ = ("id", "color", "short", "ascii", "long")
 
-    def __init__(self, suit: tuple[int, str, str, str]) -> None:
-        """Initialize suit.
+    id: int
+    color: int
+    short: str
+    ascii: str
+    long: str
+
+    _interned: typing.ClassVar[dict[str, "Suit"]] = {}
+
+    def __new__(cls, suit: tuple[int, str, str, str]) -> "Suit":
+        """Return the suit, creating it the first time it is seen.
 
         Args:
             suit (tuple): Color (as an int), short, "ascii", and long format of suit.
-        """
-        self.color = suit[0]
-        self.short = suit[1]
-        self.ascii = suit[2]
-        self.long = suit[3]
-
-    def __eq__(self, other: object) -> bool:
-        """Is this suit the same as another suit."""
-        if not isinstance(other, Suit):
-            raise NotImplementedError
 
-        return self.long == other.long
+        Raises:
+            ValueError: If a suit with the same long name but other attributes already exists.
+        """
+        interned = cls._interned.get(suit[3])
+        if interned is None:
+            interned = object.__new__(cls)
+            interned.id = len(cls._interned)
+            interned.color, interned.short, interned.ascii, interned.long = suit
+            cls._interned[suit[3]] = interned
+        elif (interned.color, interned.short, interned.ascii, interned.long) != tuple(suit):
+            raise ValueError(f"{suit!r} conflicts with the existing {interned!r}")
+        return interned
+
+    def __hash__(self) -> int:
+        """Return the suit's id."""
+        return self.id
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        """Unpickle and copy to the shared instance."""
+        return Suit, ((self.color, self.short, self.ascii, self.long),)
 
     def is_same_color(self, other: object) -> bool:
         """Is this suit the same color as another suit."""
@@ -116,24 +161,50 @@ RANKS = [
 
 
 class Card:
-    """Represents a card."""
+    """Represents a card.
+
+    Cards are interned like ranks and suits. The id of each of the 24 standard cards is its index in
+    CARDS (suit-major, rank-minor), worked out from its suit and rank; any other card is numbered
+    after them.
+    """
+
+    __slots__ = ("id", "suit", "rank")
 
-    def __init__(self, suit: Suit, rank: Rank) -> None:
-        """Initialize card.
+    id: int
+    suit: Suit
+    rank: Rank
+
+    _interned: typing.ClassVar[dict[tuple[int, int], "Card"]] = {}
+    # Number of cards made from ranks or suits outside the standard deck
+    _extra: typing.ClassVar[int] = 0
+
+    def __new__(cls, suit: Suit, rank: Rank) -> "Card":
+        """Return the card, creating it the first time it is seen.
 
         Args:
             suit (Suit): Suit of the card.
             rank (Rank): Rank of the card.
         """
-        self.suit = suit
-        self.rank = rank
-
-    def __eq__(self, other: object) -> bool:
-        """Is this card the same as another card."""
-        if not isinstance(other, Card):
-            raise NotImplementedError
-
-        return self.suit == other.suit and self.rank == other.rank
+        interned = cls._interned.get((suit.id, rank.id))
+        if interned is None:
+            interned = object.__new__(cls)
+            if suit.id < len(SUITS) and rank.id < len(RANKS):
+                interned.id = suit.id * len(RANKS) + rank.id
+            else:
+                interned.id = len(SUITS) * len(RANKS) + cls._extra
+                cls._extra += 1
+            interned.suit = suit
+            interned.rank = rank
+            cls._interned[suit.id, rank.id] = interned
+        return interned
+
+    def __hash__(self) -> int:
+        """Return the card's id."""
+        return self.id
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        """Unpickle and copy to the shared instance."""
+        return Card, (self.suit, self.rank)
 
     def __str__(self) -> str:
         """Return card as a printable string."""
@@ -146,19 +217,33 @@ class Card:
         return f"{type(self).__name__}(suit={self.suit}, rank={self.rank})"
 
 
+# Every card, in id order
+CARDS = [Card(suit, rank) for suit in SUITS for rank in RANKS]
+
+
 class Deck:
     """Represents a deck of cards."""
 
-    def __init__(self) -> None:
-        """Initialize (build) a deck."""
-        self.cards = [Card(suit, rank) for suit in SUITS for rank in RANKS]
+    def __init__(self, cards: list[Card] | None = None) -> None:
+        """Initialize (build) a deck.
+
+        Args:
+            cards (list): Cards to use for a custom deck, top of the deck last.
+        """
+        if cards is not None:
+            self.cards = cards
+        else:
+            self.cards = CARDS[:]
 
-    def shuffle(self) -> None:
+    def shuffle(self, rng: random.Random | None = None) -> None:
         """Shuffle the deck.
 
         TODO: Implement deck cutting.
+
+        Args:
+            rng (Random): Random number generator to shuffle with, defaulting to the random module.
         """
-        random.shuffle(self.cards)
+        (rng or random).shuffle(self.cards)
 
     def deal(self, n: int = 1) -> typing.Generator[Card, None, None]:
         """Deal X number of cards, removing them from the deck.
@@ -20,7 +20,9 @@ def main() -> None:
             display.print(score=True, tricks=False, lead=True, hands=True, dealer=True)
             game.hand.process_call_trump()
 
-            while game.hand.active:
+            while game.hand.trump_suit and game.hand.active:
                 game.hand.start_trick()
                 display.print(tricks=True, hands=True, trump=True)
                 game.hand.trick.play()
+
+            game.score_hand()
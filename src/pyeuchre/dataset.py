@@ -0,0 +1,288 @@
+"""Self-play training data: decision points streamed into memory-mapped .npy shards.
+
+Requires the optional numpy dependency. A SampleWriter follows simulated games through their
+DecisionMade events and writes one sample per decision: the observation (see features), the
+action taken, the mask of legal actions, and the outcome for the deciding player's team. Samples
+are buffered for one game at a time, then copied into shard files preallocated with
+numpy.lib.format.open_memmap, so generating a dataset never holds more than a game and the pages
+of the open shard in memory::
+
+    simulate(100_000, seed=0, writer=SampleWriter("data"))
+
+A dataset is a directory::
+
+    manifest.json       layout of the features, fields and filled rows of each shard
+    000000/<field>.npy  one array per field, shard_size rows long
+
+Shards are preallocated at full size; only the first manifest "rows" rows of the last one are
+filled, and reopening a dataset to append to it resumes that shard. SampleReader maps each shard read-only and slices it to its rows, so loaders see the data
+without copying it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from pyeuchre.events import DecisionMade
+from pyeuchre.events import HandScored
+from pyeuchre.features import ACTIONS
+from pyeuchre.features import LAYOUT
+from pyeuchre.features import WIDTH
+from pyeuchre.features import legal_mask
+from pyeuchre.features import observe
+from pyeuchre.features import to_action
+from pyeuchre.sim import simulate
+
+
+# only import game classes for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Game
+    from pyeuchre.game import Hand
+
+
+VERSION = 1
+
+# dtype and shape of each row of every field
+FIELDS: dict[str, tuple[npt.DTypeLike, tuple[int, ...]]] = {
+    # Observation of the decision, see features.LAYOUT
+    "features": (np.uint8, (WIDTH,)),
+    # Action taken, see features.ACTIONS
+    "action": (np.uint8, ()),
+    # Bit a set for each legal action a
+    "legal": (np.uint32, ()),
+    # Points the hand scored for the deciding player's team, negative if the other team scored
+    "points": (np.int8, ()),
+    # 1 if the deciding player's team won the game, otherwise -1
+    "won": (np.int8, ()),
+    # Number of the game within the writer's run
+    "game": (np.uint32, ()),
+}
+
+
+class SampleWriter:
+    """Writer of decision samples from simulated games into shards; pass it as the writer of simulate."""
+
+    def __init__(self, path: str | os.PathLike[str], shard_size: int = 1 << 20) -> None:
+        """Open a dataset for appending, creating it if needed.
+
+        Args:
+            path (PathLike): Dataset directory.
+            shard_size (int): Rows per shard.
+        """
+        self.path = pathlib.Path(path)
+        self.shard_size = shard_size
+
+        manifest = self.path / "manifest.json"
+        if manifest.exists():
+            self.manifest = json.loads(manifest.read_text())
+            if self.manifest["version"] != VERSION or self.manifest["width"] != WIDTH:
+                raise ValueError("not a compatible dataset")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.manifest = {
+                "version": VERSION,
+                "width": WIDTH,
+                "actions": ACTIONS,
+                "layout": {name: [group.start, group.stop] for name, group in LAYOUT.items()},
+                "fields": {name: [np.dtype(dtype).str, list(shape)] for name, (dtype, shape) in FIELDS.items()},
+                "games": 0,
+                "shards": [],
+            }
+
+        # Open shard's fields, its filled rows and its size, which differs from shard_size for a resumed shard
+        self._shard: dict[str, np.memmap[typing.Any, typing.Any]] | None = None
+        self._rows = 0
+        self._size = shard_size
+        self._resume_shard()
+
+        # The current game's samples, the seat that made each decision and how many hands have been scored
+        self._features: list[bytearray] = []
+        self._actions: list[int] = []
+        self._legal: list[int] = []
+        self._seats: list[int] = []
+        self._points: list[int] = []
+        self._scored = 0
+
+    def __enter__(self) -> SampleWriter:
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the writer."""
+        self.close()
+
+    @property
+    def rows(self) -> int:
+        """Number of samples written to shards."""
+        return sum(shard["rows"] for shard in self.manifest["shards"])
+
+    def begin_game(self, game: Game) -> None:
+        """Start following a game's decisions."""
+        game.events.subscribe(self._decided, DecisionMade)
+        game.events.subscribe(self._scored_hand, HandScored)
+
+    def write_hand(self, hand: Hand) -> None:
+        """Nothing to do: a hand's decisions and outcome arrive as events."""
+
+    def end_game(self, game: Game) -> None:
+        """Label the game's samples with the winner and write them out."""
+        game.events.unsubscribe(self._decided, DecisionMade)
+        game.events.unsubscribe(self._scored_hand, HandScored)
+
+        n = len(self._actions)
+        if n:
+            first, second = (team.score for team in game.players.teams)
+            winner = 0 if first > second else 1
+            seats = np.array(self._seats, dtype=np.uint8)
+            self._append(
+                {
+                    "features": np.frombuffer(b"".join(self._features), dtype=np.uint8).reshape(n, WIDTH),
+                    "action": np.array(self._actions, dtype=np.uint8),
+                    "legal": np.array(self._legal, dtype=np.uint32),
+                    "points": np.array(self._points, dtype=np.int8),
+                    "won": np.where(seats & 1 == winner, 1, -1).astype(np.int8),
+                    "game": np.full(n, self.manifest["games"], dtype=np.uint32),
+                }
+            )
+
+        self.manifest["games"] += 1
+        self._features, self._actions, self._legal, self._seats, self._points = [], [], [], [], []
+        self._scored = 0
+
+    def _decided(self, event: DecisionMade) -> None:
+        """Record a decision."""
+        hand, player, request, args, answer = event
+        self._features.append(observe(hand, player, request, args))
+        self._actions.append(to_action(hand, player, request, args, answer))
+        self._legal.append(legal_mask(hand, player, request, args))
+        self._seats.append(hand.players.players.index(player))
+
+    def _scored_hand(self, event: HandScored) -> None:
+        """Label the hand's decisions with the points each team scored."""
+        team = event.hand.players.teams.index(event.team) if event.team else 0
+        for seat in self._seats[self._scored :]:
+            self._points.append(event.points if seat & 1 == team else -event.points)
+        self._scored = len(self._seats)
+
+    def _append(self, arrays: dict[str, npt.NDArray[typing.Any]]) -> None:
+        """Copy rows into shards, opening new ones as each fills."""
+        n, done = len(arrays["action"]), 0
+        while done < n:
+            if self._shard is None:
+                self._open_shard()
+            shard = typing.cast("dict[str, np.memmap[typing.Any, typing.Any]]", self._shard)
+            count = min(n - done, self._size - self._rows)
+            for name, array in arrays.items():
+                shard[name][self._rows : self._rows + count] = array[done : done + count]
+            self._rows += count
+            done += count
+            if self._rows == self._size:
+                self._close_shard()
+
+    def _resume_shard(self) -> None:
+        """Reopen the last shard of an existing dataset if it has rows left to fill."""
+        if not self.manifest["shards"]:
+            return
+        last = self.manifest["shards"][-1]
+        directory = self.path / last["name"]
+        shard = {field: np.lib.format.open_memmap(directory / f"{field}.npy", mode="r+") for field in FIELDS}
+        size = len(shard["action"])
+        if last["rows"] < size:
+            self._shard, self._rows, self._size = shard, last["rows"], size
+
+    def _open_shard(self) -> None:
+        """Preallocate the files of a new shard."""
+        name = f"{len(self.manifest['shards']):06d}"
+        directory = self.path / name
+        directory.mkdir()
+        self._shard = {
+            field: np.lib.format.open_memmap(
+                directory / f"{field}.npy", mode="w+", dtype=dtype, shape=(self.shard_size, *shape)
+            )
+            for field, (dtype, shape) in FIELDS.items()
+        }
+        self._rows = 0
+        self._size = self.shard_size
+        self.manifest["shards"].append({"name": name, "rows": 0})
+
+    def _close_shard(self) -> None:
+        """Flush the current shard and record its rows in the manifest."""
+        if self._shard is None:
+            return
+        for array in self._shard.values():
+            array.flush()
+        self.manifest["shards"][-1]["rows"] = self._rows
+        self._write_manifest()
+        self._shard = None
+
+    def _write_manifest(self) -> None:
+        """Replace the manifest atomically."""
+        tmp = self.path / "manifest.json.tmp"
+        tmp.write_text(json.dumps(self.manifest))
+        tmp.replace(self.path / "manifest.json")
+
+    def close(self) -> None:
+        """Flush the last, partly filled shard and the manifest."""
+        self._close_shard()
+        self._write_manifest()
+
+
+class SampleReader:
+    """Zero-copy reader of a dataset written by SampleWriter."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a dataset.
+
+        Args:
+            path (PathLike): Dataset directory.
+        """
+        self.path = pathlib.Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        if self.manifest["version"] != VERSION or self.manifest["width"] != WIDTH:
+            raise ValueError("not a compatible dataset")
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return sum(shard["rows"] for shard in self.manifest["shards"])
+
+    def __iter__(self) -> typing.Generator[dict[str, npt.NDArray[typing.Any]], None, None]:
+        """Yield each shard's fields, memory-mapped and sliced to its filled rows."""
+        for shard in self.manifest["shards"]:
+            if shard["rows"]:
+                yield self.shard(shard["name"], shard["rows"])
+
+    def shard(self, name: str, rows: int) -> dict[str, npt.NDArray[typing.Any]]:
+        """Return a shard's fields, memory-mapped read-only.
+
+        Args:
+            name (str): Shard name from the manifest.
+            rows (int): Filled rows of the shard.
+        """
+        return {
+            field: np.load(self.path / name / f"{field}.npy", mmap_mode="r")[:rows] for field in self.manifest["fields"]
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Generate a dataset from random self-play."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="dataset directory")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=1 << 20)
+    args = parser.parse_args(argv)
+
+    with SampleWriter(args.path, args.shard_size) as writer:
+        result = simulate(args.games, seed=args.seed, writer=writer)
+    print(f"{writer.rows} samples from {len(result.results)} games in {result.elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
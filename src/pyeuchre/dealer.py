@@ -0,0 +1,77 @@
+"""Vectorized dealing of many deals at once, for Monte Carlo work.
+
+Requires the optional numpy dependency. A deal is a row of 24 card indices in dealing
+order: five cards for each seat in turn, the lead card, then the three cards of the kitty.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import deck_from_deal
+from pyeuchre.cards import Deck
+
+
+SEATS = 4
+HAND_SIZE = 5
+LEAD = SEATS * HAND_SIZE
+
+# Columns of the array returned by deal_masks
+LEAD_COLUMN = SEATS
+KITTY_COLUMN = SEATS + 1
+
+
+def deal_permutations(n: int, rng: np.random.Generator | None = None) -> npt.NDArray[np.uint8]:
+    """Deal n independent, uniformly random deals.
+
+    Args:
+        n (int): Number of deals.
+        rng (Generator): numpy random generator, defaulting to a freshly seeded one.
+
+    Returns:
+        An (n, 24) array whose rows are permutations of the card indices in dealing order.
+    """
+    rng = rng or np.random.default_rng()
+    return rng.random((n, CARD_COUNT)).argsort(axis=1).astype(np.uint8)
+
+
+def permutation_masks(permutations: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint32]:
+    """Pack deals into card masks.
+
+    Args:
+        permutations (ndarray): (n, 24) array of deals, as returned by deal_permutations.
+
+    Returns:
+        An (n, 6) array holding the mask of each seat's hand, the lead card and the kitty.
+    """
+    n = len(permutations)
+    bits = np.left_shift(np.uint32(1), permutations.astype(np.uint32))
+
+    masks = np.empty((n, SEATS + 2), dtype=np.uint32)
+    # Every card is a distinct bit, so summing is the same as OR-ing
+    masks[:, :SEATS] = bits[:, :LEAD].reshape(n, SEATS, HAND_SIZE).sum(axis=2, dtype=np.uint32)
+    masks[:, LEAD_COLUMN] = bits[:, LEAD]
+    masks[:, KITTY_COLUMN] = bits[:, LEAD + 1 :].sum(axis=1, dtype=np.uint32)
+    return masks
+
+
+def deal_masks(n: int, rng: np.random.Generator | None = None) -> npt.NDArray[np.uint32]:
+    """Deal n deals, packed as masks.
+
+    Args:
+        n (int): Number of deals.
+        rng (Generator): numpy random generator, defaulting to a freshly seeded one.
+
+    Returns:
+        An (n, 6) array holding the mask of each seat's hand, the lead card and the kitty.
+    """
+    return permutation_masks(deal_permutations(n, rng))
+
+
+def deck_from_permutation(permutation: npt.NDArray[np.uint8]) -> Deck:
+    """Build a pre-dealt deck from one deal, for Hand(deck=..., shuffle_deck=False).
+
+    Args:
+        permutation (ndarray): One row of deal_permutations.
+    """
+    return deck_from_deal(permutation.tolist())
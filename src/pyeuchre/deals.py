@@ -0,0 +1,314 @@
+"""Numbering of every possible deal, for sharding exhaustive and stratified studies.
+
+A deal is each seat's five cards, the lead card and the kitty, as masks in the layout of
+dealer.deal_masks. Order within a hand or the kitty does not matter, so deals are numbered
+0 to count() - 1 by the combinatorial number system: each hand is ranked among the C(n, 5)
+subsets of the n cards still undealt, and the ranks are combined as a mixed-radix number with
+seat 0 most significant. There are under 2**49 deals, so an index fits a 64-bit int, and a study
+can be split into index ranges that workers unrank independently::
+
+    for deck in iter_deals(*shard_range(shard, shards)):
+        hand = Hand(players, deck=deck, shuffle_deck=False)
+
+With symmetric=True, deals that differ only by a color-preserving suit relabelling (see
+canonical) share one index. Their canonical form is the least relabelling of the masks, so after
+each hand is chosen only the relabellings that fix the hands so far (its stabilizer) remain. Most
+hands have no symmetry, leaving plain mixed-radix ranking below them; where one does, classes are
+counted with Burnside's lemma.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import itertools
+import math
+import typing
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import FULL_MASK
+from pyeuchre.bitboard import deck_from_deal
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import indices_mask
+from pyeuchre.canonical import IDENTITY
+from pyeuchre.canonical import PERMUTATIONS
+from pyeuchre.canonical import Permutation
+from pyeuchre.canonical import canonicalize
+from pyeuchre.canonical import permute_index
+from pyeuchre.canonical import permute_mask
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import Deck
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+
+
+SEATS = 4
+HAND_SIZE = 5
+
+# Sizes of the ranked parts of a deal: each seat's hand, then the lead card; the kitty is what is left
+PARTS = (HAND_SIZE,) * SEATS + (1,)
+
+Group = tuple[Permutation, ...]
+
+TRIVIAL: Group = (IDENTITY,)
+SYMMETRIES: Group = tuple(PERMUTATIONS)
+
+
+def _free(n: int, parts: typing.Sequence[int]) -> int:
+    """Count the ways to deal parts from n cards, with no symmetry."""
+    total = 1
+    for k in parts:
+        total *= math.comb(n, k)
+        n -= k
+    return total
+
+
+DEALS = _free(CARD_COUNT, PARTS)
+
+
+def _subset_rank(mask: int, remaining: int) -> int:
+    """Return the colex rank of a mask among the same-size subsets of remaining."""
+    rank, k = 0, 0
+    for position, i in enumerate(indices(remaining)):
+        if mask >> i & 1:
+            k += 1
+            rank += math.comb(position, k)
+    return rank
+
+
+def _subset_unrank(rank: int, remaining: int, k: int) -> int:
+    """Return the k-card subset of remaining with a colex rank."""
+    positions = list(indices(remaining))
+    mask = 0
+    c = len(positions)
+    while k:
+        c -= 1
+        while math.comb(c, k) > rank:
+            c -= 1
+        rank -= math.comb(c, k)
+        mask |= 1 << positions[c]
+        k -= 1
+    return mask
+
+
+def _stabilizer(mask: int, group: Group) -> Group:
+    """Return the relabellings in group that leave a mask unchanged."""
+    return tuple(perm for perm in group if permute_mask(mask, perm) == mask)
+
+
+@functools.lru_cache(maxsize=4096)
+def _ways(cycles: tuple[int, ...], room: tuple[int, ...]) -> int:
+    """Count the ways to fill parts with room for some cards exactly, with cycles of cards that must stay together.
+
+    The count does not depend on the order of the parts, so room is kept sorted to share cached results.
+    """
+    if not cycles:
+        return 1
+    length, rest = cycles[0], cycles[1:]
+    return sum(
+        _ways(rest, tuple(sorted(room[:p] + (space - length,) + room[p + 1 :])))
+        for p, space in enumerate(room)
+        if space >= length
+    )
+
+
+def _fixed(remaining: int, parts: tuple[int, ...], perm: Permutation) -> int:
+    """Count the ways to deal parts from remaining that a relabelling leaves unchanged.
+
+    A deal is unchanged when each part is a union of the relabelling's cycles of cards.
+    """
+    if perm == IDENTITY:
+        return _free(remaining.bit_count(), parts)
+
+    cycles, seen = [], 0
+    for i in indices(remaining):
+        length = 0
+        while not seen >> i & 1:
+            seen |= 1 << i
+            i = permute_index(i, perm)
+            length += 1
+        if length:
+            cycles.append(length)
+    room = (*parts, remaining.bit_count() - sum(parts))
+    return _ways(tuple(sorted(cycles, reverse=True)), tuple(sorted(room)))
+
+
+def _count(remaining: int, parts: tuple[int, ...], group: Group) -> int:
+    """Count the classes of deals of parts from remaining under a group of relabellings (Burnside's lemma)."""
+    if len(group) == 1:
+        return _free(remaining.bit_count(), parts)
+    return sum(_fixed(remaining, parts, perm) for perm in group) // len(group)
+
+
+@functools.lru_cache(maxsize=256)
+def _choices(remaining: int, parts: tuple[int, ...], group: Group) -> tuple[list[int], list[int]]:
+    """List the canonical choices of the next part and the number of classes before each.
+
+    Returns:
+        The masks the first part can take in a canonical deal, ascending, and the cumulative class counts from 0.
+    """
+    # permute_mask inlined for the four suits: where each perm moves each suit's bits to, leaving out the identity
+    shifts = [tuple(target * len(RANKS) for target in perm) for perm in group if perm != IDENTITY]
+    suit = (1 << len(RANKS)) - 1
+    width = len(RANKS)
+
+    choices = []
+    for combination in itertools.combinations(indices(remaining), parts[0]):
+        mask = indices_mask(combination)
+        h, d, c, s = mask & suit, mask >> width & suit, mask >> 2 * width & suit, mask >> 3 * width
+        images = [h << a | d << b | c << e | s << f for a, b, e, f in shifts]
+        if min(images, default=mask) >= mask:
+            choices.append((mask, images.count(mask)))
+    choices.sort()
+
+    # Below a choice with no symmetry every deal of the rest is its own class
+    free = _free(remaining.bit_count() - parts[0], parts[1:])
+    offsets = [0]
+    for mask, symmetries in choices:
+        classes = _count(remaining ^ mask, parts[1:], _stabilizer(mask, group)) if symmetries else free
+        offsets.append(offsets[-1] + classes)
+    return [mask for mask, _symmetries in choices], offsets
+
+
+def _rank(masks: typing.Sequence[int], remaining: int, parts: tuple[int, ...], group: Group) -> int:
+    """Rank canonical masks among the classes of deals of parts from remaining."""
+    index = 0
+    while parts:
+        mask = masks[len(PARTS) - len(parts)]
+        rest = remaining ^ mask
+        if len(group) == 1:
+            index += _subset_rank(mask, remaining) * _free(rest.bit_count(), parts[1:])
+        else:
+            choices, offsets = _choices(remaining, parts, group)
+            index += offsets[bisect.bisect_left(choices, mask)]
+            group = _stabilizer(mask, group)
+        remaining, parts = rest, parts[1:]
+    return index
+
+
+def _unrank(index: int, remaining: int, parts: tuple[int, ...], group: Group) -> list[int]:
+    """Return the canonical masks of the deal with an index among the classes of deals of parts from remaining."""
+    masks = []
+    while parts:
+        if len(group) == 1:
+            size = _free(remaining.bit_count() - parts[0], parts[1:])
+            mask = _subset_unrank(index // size, remaining, parts[0])
+            index %= size
+        else:
+            choices, offsets = _choices(remaining, parts, group)
+            choice = bisect.bisect_right(offsets, index) - 1
+            mask = choices[choice]
+            index -= offsets[choice]
+            group = _stabilizer(mask, group)
+        masks.append(mask)
+        remaining, parts = remaining ^ mask, parts[1:]
+    return masks
+
+
+# Number of classes of deals under suit relabelling, just over DEALS / len(SYMMETRIES)
+SYMMETRIC_DEALS = _count(FULL_MASK, PARTS, SYMMETRIES)
+
+
+def count(symmetric: bool = False) -> int:
+    """Return the number of deals, or of classes of deals under suit relabelling if symmetric."""
+    return SYMMETRIC_DEALS if symmetric else DEALS
+
+
+def hand_masks(hand: Hand) -> tuple[int, ...]:
+    """Return the masks of each seat's dealt cards, the lead card and the kitty of a dealt hand.
+
+    Uses the cards as dealt, so this is unaffected by the dealer picking up or play.
+
+    Args:
+        hand (Hand): Hand that has been dealt.
+    """
+    dealt = [card.id for card in hand.dealt]
+    lead = SEATS * HAND_SIZE
+    return (
+        *(indices_mask(dealt[seat * HAND_SIZE : (seat + 1) * HAND_SIZE]) for seat in range(SEATS)),
+        1 << dealt[lead],
+        indices_mask(dealt[lead + 1 :]),
+    )
+
+
+def rank_masks(masks: typing.Sequence[int], symmetric: bool = False) -> int:
+    """Return the index of a deal.
+
+    Args:
+        masks (Sequence): Mask of each seat's hand and the lead card; a trailing kitty mask is ignored.
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+    """
+    masks = masks[: len(PARTS)]
+    if symmetric:
+        return _rank(canonicalize(masks)[0], FULL_MASK, PARTS, SYMMETRIES)
+    return _rank(masks, FULL_MASK, PARTS, TRIVIAL)
+
+
+def unrank_masks(index: int, symmetric: bool = False) -> tuple[int, ...]:
+    """Return the masks of each seat's hand, the lead card and the kitty of the deal with an index.
+
+    With symmetric, the deal returned is the canonical member of its class.
+
+    Args:
+        index (int): Deal index, from 0 to count(symmetric) - 1.
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+
+    Raises:
+        IndexError: If index is out of range.
+    """
+    if not 0 <= index < count(symmetric):
+        raise IndexError(f"deal index {index} out of range")
+    masks = _unrank(index, FULL_MASK, PARTS, SYMMETRIES if symmetric else TRIVIAL)
+    # The parts are disjoint, so summing is the same as OR-ing
+    return (*masks, FULL_MASK ^ sum(masks))
+
+
+def rank(hand: Hand, symmetric: bool = False) -> int:
+    """Return the index of the deal of a dealt hand.
+
+    Args:
+        hand (Hand): Hand that has been dealt.
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+    """
+    return rank_masks(hand_masks(hand), symmetric)
+
+
+def unrank(index: int, symmetric: bool = False) -> Deck:
+    """Return a deck that Hand(deck=..., shuffle_deck=False) deals as the deal with an index.
+
+    Args:
+        index (int): Deal index, from 0 to count(symmetric) - 1.
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+    """
+    return deck_from_deal([i for mask in unrank_masks(index, symmetric) for i in indices(mask)])
+
+
+def iter_deals(
+    start: int = 0,
+    stop: int | None = None,
+    symmetric: bool = False,
+) -> typing.Generator[Deck, None, None]:
+    """Lazily yield the decks of a range of deal indices.
+
+    Args:
+        start (int): First deal index.
+        stop (int): Deal index to stop before, defaulting to count(symmetric).
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+    """
+    for index in range(start, count(symmetric) if stop is None else stop):
+        yield unrank(index, symmetric)
+
+
+def shard_range(shard: int, shards: int, symmetric: bool = False) -> tuple[int, int]:
+    """Return the start and stop of one of shards near-equal, contiguous ranges of deal indices.
+
+    Args:
+        shard (int): Shard number, from 0 to shards - 1.
+        shards (int): Number of shards.
+        symmetric (bool): Number classes of deals under suit relabelling rather than deals.
+    """
+    total = count(symmetric)
+    return total * shard // shards, total * (shard + 1) // shards
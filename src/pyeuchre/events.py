@@ -0,0 +1,129 @@
+"""Typed events emitted by Game, Hand and Trick as the state of a game changes.
+
+Subscribe a handler to the events of a game to follow it incrementally instead of polling::
+
+    game.events.subscribe(print, CardPlayed, TrickWon)
+
+Events are only built when something is subscribed, so an unobserved game pays one dict check at
+each emitting site.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+
+
+# only import game classes for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.game import Trick
+    from pyeuchre.people.groups import Team
+    from pyeuchre.people.players import Player
+
+
+class HandDealt(typing.NamedTuple):
+    """Cards have been dealt and the lead card turned up."""
+
+    hand: Hand
+
+
+class TrumpCalled(typing.NamedTuple):
+    """A player has called trump, either ordering up the lead card or choosing a suit."""
+
+    hand: Hand
+    player: Player
+    suit: Suit
+    ordered_up: bool
+
+
+class LonerDeclared(typing.NamedTuple):
+    """The caller has decided to go alone."""
+
+    hand: Hand
+    player: Player
+
+
+class DecisionMade(typing.NamedTuple):
+    """A player has answered a request, which the hand has not acted on yet.
+
+    request is the name of the Player hook that was called (eg "request_play_card") and args its
+    arguments after the hand. A replace_card hook has already swapped the card into the player's hand.
+    """
+
+    hand: Hand
+    player: Player
+    request: str
+    args: tuple[typing.Any, ...]
+    answer: typing.Any
+
+
+class CardPlayed(typing.NamedTuple):
+    """A card has been played to a trick."""
+
+    trick: Trick
+    player: Player
+    card: Card
+
+
+class TrickWon(typing.NamedTuple):
+    """Every card of a trick has been played."""
+
+    trick: Trick
+    player: Player
+    card: Card
+
+
+class HandScored(typing.NamedTuple):
+    """Points for a hand have been awarded (team is None if it was thrown in)."""
+
+    hand: Hand
+    team: Team | None
+    points: int
+
+
+Event = typing.Union[HandDealt, TrumpCalled, LonerDeclared, DecisionMade, CardPlayed, TrickWon, HandScored]
+Handler = typing.Callable[[typing.Any], None]
+
+EVENTS: tuple[type, ...] = (HandDealt, TrumpCalled, LonerDeclared, DecisionMade, CardPlayed, TrickWon, HandScored)
+
+
+class Events:
+    """Subscribers to the events of a game."""
+
+    def __init__(self) -> None:
+        """Initialize with no subscribers.
+
+        handlers maps each event type to its handlers. Types with no handlers have no key, so an empty
+        dict means nobody is listening.
+        """
+        self.handlers: dict[type, list[Handler]] = {}
+
+    def subscribe(self, handler: Handler, *kinds: type) -> None:
+        """Call a handler with each event of the given types (every type if none are given).
+
+        Args:
+            handler (Callable): Called with each event.
+            kinds (type): Event types to subscribe to.
+        """
+        for kind in kinds or EVENTS:
+            self.handlers.setdefault(kind, []).append(handler)
+
+    def unsubscribe(self, handler: Handler, *kinds: type) -> None:
+        """Stop calling a handler with events of the given types (every type if none are given)."""
+        for kind in kinds or EVENTS:
+            handlers = self.handlers.get(kind, [])
+            if handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self.handlers.pop(kind, None)
+
+    def emit(self, event: Event) -> None:
+        """Call every handler subscribed to the event's type, as subscribed when the event was emitted.
+
+        Handlers may subscribe or unsubscribe handlers (including themselves) while being called.
+        """
+        for handler in tuple(self.handlers.get(type(event), ())):
+            handler(event)
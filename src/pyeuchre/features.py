@@ -0,0 +1,237 @@
+"""Fixed-width encoding of decision points, for training and running learned bots.
+
+Requires the optional numpy dependency. An observation is what a player knows when asked to
+decide, as one row of WIDTH uint8 features; LAYOUT names the columns of each group. Seats are
+relative to the player deciding (0 is the player, 1 the next seat to their left, 2 their partner)
+and teams are 0 for the player's own team, so the same situation encodes the same way from any seat.
+
+Every decision maps into one action space of ACTIONS ints: a card index to play or discard,
+SUIT_ACTION plus a suit index to choose trump, or PASS and CALL for yes/no requests (ordering up,
+going alone).
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import to_mask
+from pyeuchre.cards import CARDS
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.people.players import Player
+
+
+SEATS = 4
+HAND_SIZE = 5
+
+# Player hooks that are decision points, in the order of the kind feature
+REQUESTS = (
+    "request_trump_call",
+    "request_trump_choose",
+    "request_loner",
+    "request_replace_card",
+    "request_play_card",
+)
+
+SUIT_ACTION = CARD_COUNT
+PASS = SUIT_ACTION + len(SUITS)
+CALL = PASS + 1
+ACTIONS = CALL + 1
+
+
+def _layout(*groups: tuple[str, int]) -> dict[str, slice]:
+    """Lay out named groups of columns one after another."""
+    layout, offset = {}, 0
+    for name, width in groups:
+        layout[name] = slice(offset, offset + width)
+        offset += width
+    return layout
+
+
+LAYOUT = _layout(
+    ("kind", len(REQUESTS)),
+    # Cards the player holds; the dealer's six when discarding
+    ("cards", CARD_COUNT),
+    ("up_card", CARD_COUNT),
+    ("dealer", SEATS),
+    ("trump", len(SUITS)),
+    ("caller", SEATS),
+    ("loner", 1),
+    # Cards already played to the current trick, one slot of CARD_COUNT per card in play order
+    ("trick", (SEATS - 1) * CARD_COUNT),
+    # Seat that led the current trick, so the trick's cards can be told apart by who played them
+    ("leader", SEATS),
+    # Cards played to earlier tricks of the hand
+    ("played", CARD_COUNT),
+    # Tricks taken this hand and game score, by team
+    ("tricks", 2),
+    ("score", 2),
+)
+WIDTH = max(group.stop for group in LAYOUT.values())
+
+_KIND = {request: LAYOUT["kind"].start + i for i, request in enumerate(REQUESTS)}
+_CARDS = LAYOUT["cards"].start
+_UP_CARD = LAYOUT["up_card"].start
+_DEALER = LAYOUT["dealer"].start
+_TRUMP = LAYOUT["trump"].start
+_CALLER = LAYOUT["caller"].start
+_LONER = LAYOUT["loner"].start
+_TRICK = LAYOUT["trick"].start
+_LEADER = LAYOUT["leader"].start
+_PLAYED = LAYOUT["played"].start
+_TRICKS = LAYOUT["tricks"].start
+_SCORE = LAYOUT["score"].start
+
+
+def held_cards(hand: Hand, player: Player, request: str, args: tuple[typing.Any, ...]) -> list[Card]:
+    """Return the cards a player chooses from: their hand, plus the up card when discarding.
+
+    Works both before and after a replace_card hook has swapped the up card in, as the dealer
+    still holds exactly the cards they were dealt until then.
+    """
+    if request != "request_replace_card":
+        return player.cards
+    seat = hand.players.players.index(player)
+    return [*hand.dealt[seat * HAND_SIZE : (seat + 1) * HAND_SIZE], args[0]]
+
+
+def observe(hand: Hand, player: Player, request: str, args: tuple[typing.Any, ...] = ()) -> bytearray:
+    """Encode what a player knows when a hand requests a decision, as a row of WIDTH bytes.
+
+    Args:
+        hand (Hand): Hand requesting the decision.
+        player (Player): Player deciding.
+        request (str): Player hook requested, one of REQUESTS.
+        args (tuple): Arguments of the request after the hand.
+    """
+    row = bytearray(WIDTH)
+    seats = hand.players.players
+    me = seats.index(player)
+
+    row[_KIND[request]] = 1
+    for card in held_cards(hand, player, request, args):
+        row[_CARDS + card.id] = 1
+    row[_UP_CARD + hand.lead.id] = 1
+    row[_DEALER + (seats.index(hand.dealer) - me) % SEATS] = 1
+
+    if hand.trump_suit:
+        row[_TRUMP + hand.trump_suit.id] = 1
+    if hand.caller:
+        row[_CALLER + (seats.index(hand.caller) - me) % SEATS] = 1
+    row[_LONER] = hand.loner_player is not None
+
+    # A card is only requested for a trick still being played
+    trick = hand.trick
+    if trick:
+        # With no cards down the player is leading (hand.leader may be a seat sitting out)
+        leader = trick.cards[0]["player"] if trick.cards else player
+        row[_LEADER + (seats.index(leader) - me) % SEATS] = 1
+        for slot, entry in enumerate(trick.cards):
+            row[_TRICK + slot * CARD_COUNT + entry["card"].id] = 1
+    for earlier in hand.tricks:
+        if earlier is not trick:
+            for entry in earlier.cards:
+                row[_PLAYED + entry["card"].id] = 1
+
+    teams = hand.players.teams
+    ours = me & 1
+    row[_TRICKS], row[_TRICKS + 1] = teams[ours].tricks, teams[ours ^ 1].tricks
+    row[_SCORE], row[_SCORE + 1] = teams[ours].score, teams[ours ^ 1].score
+    return row
+
+
+def legal_actions(hand: Hand, player: Player, request: str, args: tuple[typing.Any, ...] = ()) -> list[int]:
+    """Return the actions a player may take for a request.
+
+    Args:
+        hand (Hand): Hand requesting the decision.
+        player (Player): Player deciding.
+        request (str): Player hook requested, one of REQUESTS.
+        args (tuple): Arguments of the request after the hand.
+    """
+    if request == "request_play_card":
+        return [card.id for card in player.legal_cards(hand)]
+    if request == "request_replace_card":
+        return [card.id for card in held_cards(hand, player, request, args)]
+    if request == "request_trump_choose":
+        actions = [SUIT_ACTION + suit.id for suit in SUITS if suit != hand.lead.suit]
+        # The dealer may not pass the second round (stick the dealer)
+        return actions if hand.players.dealer is player else [*actions, PASS]
+    return [PASS, CALL]
+
+
+def legal_mask(hand: Hand, player: Player, request: str, args: tuple[typing.Any, ...] = ()) -> int:
+    """Return the legal actions for a request as an int with bit a set for each legal action a."""
+    mask = 0
+    for action in legal_actions(hand, player, request, args):
+        mask |= 1 << action
+    return mask
+
+
+def to_action(
+    hand: Hand,
+    player: Player,
+    request: str,
+    args: tuple[typing.Any, ...],
+    answer: typing.Any,
+) -> int:
+    """Return the action a player's answer to a request took.
+
+    For a replace_card request, call this after the hook has swapped the up card in (eg from a DecisionMade event).
+
+    Args:
+        hand (Hand): Hand requesting the decision.
+        player (Player): Player who decided.
+        request (str): Player hook requested, one of REQUESTS.
+        args (tuple): Arguments of the request after the hand.
+        answer (Any): What the hook returned.
+    """
+    if request == "request_play_card":
+        return typing.cast(Card, answer).id
+    if request == "request_replace_card":
+        kept = to_mask(player.cards)
+        return next(card.id for card in held_cards(hand, player, request, args) if not kept >> card.id & 1)
+    if request == "request_trump_choose":
+        return PASS if answer is None else SUIT_ACTION + typing.cast(Suit, answer).id
+    return CALL if answer else PASS
+
+
+def from_action(request: str, action: int) -> Card | Suit | bool | None:
+    """Return the answer to give a request to take an action.
+
+    Args:
+        request (str): Player hook requested, one of REQUESTS.
+        action (int): Legal action for the request.
+
+    Returns:
+        The card to play or discard, the suit chosen (or None to pass) for trump_choose, otherwise whether to call.
+    """
+    if action < SUIT_ACTION:
+        return CARDS[action]
+    if action < PASS:
+        return SUITS[action - SUIT_ACTION]
+    if request == "request_trump_choose":
+        return None
+    return action == CALL
+
+
+def encode(hand: Hand, player: Player, request: str, args: tuple[typing.Any, ...] = ()) -> npt.NDArray[np.uint8]:
+    """Encode what a player knows when a hand requests a decision as a uint8 array of WIDTH features.
+
+    Args:
+        hand (Hand): Hand requesting the decision.
+        player (Player): Player deciding.
+        request (str): Player hook requested, one of REQUESTS.
+        args (tuple): Arguments of the request after the hand.
+    """
+    return np.frombuffer(observe(hand, player, request, args), dtype=np.uint8)
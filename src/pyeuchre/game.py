@@ -2,14 +2,87 @@
 
 from __future__ import annotations
 
+import random
+import time
+import typing
+
+from pyeuchre import instrument
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import is_legal
+from pyeuchre.bitboard import legal_cards
+from pyeuchre.bitboard import suit_index
+from pyeuchre.cards import SUITS
 from pyeuchre.cards import Card
 from pyeuchre.cards import Deck
-from pyeuchre.cards import is_trump
+from pyeuchre.cards import Suit
+from pyeuchre.events import CardPlayed
+from pyeuchre.events import DecisionMade
+from pyeuchre.events import Events
+from pyeuchre.events import HandDealt
+from pyeuchre.events import HandScored
+from pyeuchre.events import LonerDeclared
+from pyeuchre.events import TrickWon
+from pyeuchre.events import TrumpCalled
 from pyeuchre.exceptions import NotActiveError
+from pyeuchre.exceptions import RenegeError
 from pyeuchre.people.groups import Players
 from pyeuchre.people.groups import Team
 from pyeuchre.people.players import Human
 from pyeuchre.people.players import Player
+from pyeuchre.rng import CounterRandom
+
+
+# A decision the flow of a hand needs: the name of the Player hook to call, the player and any extra arguments
+Request = tuple[str, Player, tuple[typing.Any, ...]]
+Flow = typing.Generator[Request, typing.Any, None]
+
+
+def _run(flow: Flow, hand: Hand) -> None:
+    """Drive a flow, answering each request with the player's hook."""
+    probe = instrument.current
+    events = hand.events
+    try:
+        name, player, args = next(flow)
+        while True:
+            if probe is None:
+                answer = getattr(player, name)(hand, *args)
+            else:
+                start = time.perf_counter()
+                answer = getattr(player, name)(hand, *args)
+                probe.decision(hand.players.players.index(player), player, name, time.perf_counter() - start)
+            if events.handlers:
+                events.emit(DecisionMade(hand, player, name, args, answer))
+            name, player, args = flow.send(answer)
+    except StopIteration:
+        pass
+
+
+async def _arun(flow: Flow, hand: Hand) -> None:
+    """Drive a flow, answering each request by awaiting the player's async hook.
+
+    Players that don't override an async hook are answered with the sync hook directly, which
+    saves creating a coroutine for every decision a bot makes.
+    """
+    probe = instrument.current
+    events = hand.events
+    try:
+        name, player, args = next(flow)
+        while True:
+            start = time.perf_counter() if probe else 0.0
+            hook = getattr(type(player), "a" + name)
+            if hook is getattr(Player, "a" + name):
+                answer = getattr(player, name)(hand, *args)
+            else:
+                answer = await hook(player, hand, *args)
+            if probe:
+                probe.decision(hand.players.players.index(player), player, name, time.perf_counter() - start)
+            if events.handlers:
+                events.emit(DecisionMade(hand, player, name, args, answer))
+            name, player, args = flow.send(answer)
+    except StopIteration:
+        pass
 
 
 class Game:
@@ -19,12 +92,15 @@ class Game:
         self,
         players: Players | None = None,
         hand: Hand | None = None,
+        rng: random.Random | None = None,
     ) -> None:
         """Initialize game.
 
         Args:
             players (Players): Players to start this game with.
             hand: (Hand): A custom hand to start the game on.
+            rng (Random): Random number generator used to shuffle each hand's deck. A CounterRandom deals hand k from
+                its stream k, so each deal depends only on its key and k.
         """
         if players:
             self.players = players
@@ -41,6 +117,11 @@ class Game:
             )
 
         self.hand: Hand | None = hand if hand else None
+        self.rng = rng
+        self.events = Events()
+
+        # Number of hands dealt so far
+        self.deals = 0
 
     def __str__(self) -> str:
         """Return Game as a printable string.
@@ -58,13 +139,80 @@ class Game:
         """Is this game active."""
         return not any([team.score >= 10 for team in self.players.teams])
 
-    def deal_hand(self) -> None:
-        """Begin a hand."""
-        if self.active:
-            self.hand = Hand(self.players)
-        else:
+    def deal_hand(self, deck: Deck | None = None) -> None:
+        """Begin a hand.
+
+        Args:
+            deck (Deck): Pre-dealt deck to deal from instead of shuffling a new one.
+        """
+        if not self.active:
             raise NotActiveError
 
+        rng = self.rng.stream(self.deals) if isinstance(self.rng, CounterRandom) else self.rng
+        self.deals += 1
+        with instrument.phase("deal"):
+            self.hand = Hand(self.players, deck=deck, shuffle_deck=deck is None, rng=rng, events=self.events)
+
+    def score_hand(self) -> tuple[Team, int] | None:
+        """Award the points for the current hand and pass the deal.
+
+        Returns:
+            The team awarded points and the number of points, or None if the hand was thrown in.
+        """
+        if not self.hand:
+            raise NotActiveError
+
+        result = None
+        if self.hand.trump_team:
+            result = self.hand.score()
+            result[0].score += result[1]
+
+        if self.events.handlers:
+            self.events.emit(HandScored(self.hand, *(result or (None, 0))))
+
+        self.players.rotate_dealer()
+        return result
+
+    def play_hand(self, deck: Deck | None = None) -> tuple[Team, int] | None:
+        """Deal, bid and play out a full hand, then score it.
+
+        Args:
+            deck (Deck): Pre-dealt deck to deal from instead of shuffling a new one.
+
+        Returns:
+            The team awarded points and the number of points, or None if the hand was thrown in.
+        """
+        self.deal_hand(deck)
+        hand = typing.cast(Hand, self.hand)
+
+        hand.process_call_trump()
+        if hand.trump_suit:
+            while hand.active:
+                hand.start_trick()
+                typing.cast(Trick, hand.trick).play()
+
+        return self.score_hand()
+
+    async def aplay_hand(self, deck: Deck | None = None) -> tuple[Team, int] | None:
+        """Deal, bid and play out a full hand with the players' async hooks, then score it.
+
+        Args:
+            deck (Deck): Pre-dealt deck to deal from instead of shuffling a new one.
+
+        Returns:
+            The team awarded points and the number of points, or None if the hand was thrown in.
+        """
+        self.deal_hand(deck)
+        hand = typing.cast(Hand, self.hand)
+
+        await hand.aprocess_call_trump()
+        if hand.trump_suit:
+            while hand.active:
+                hand.start_trick()
+                await typing.cast(Trick, hand.trick).aplay()
+
+        return self.score_hand()
+
 
 class Hand:
     """Represents a hand."""
@@ -74,6 +222,8 @@ class Hand:
         players: Players,
         deck: Deck | None = None,
         shuffle_deck: bool = True,
+        rng: random.Random | None = None,
+        events: Events | None = None,
     ) -> None:
         """Initialize hand.
 
@@ -81,12 +231,21 @@ class Hand:
             players (Players): Players for this hand.
             deck (Deck): Custom deck to use.
             shuffle_deck (bool): Whether to auto-shuffle the deck.
+            rng (Random): Random number generator to shuffle the deck with.
+            events (Events): Subscribers to this hand's events.
         """
         self.players = players
+        self.events = events if events is not None else Events()
         self.lead: Card | None = None
         self.kitty: list[Card] = []
 
         self.trick: Trick | None = None
+        self.tricks: list[Trick] = []
+        self.leader: Player = players.start_player
+
+        self.dealer: Player = players.dealer
+        self.caller: Player | None = None
+        self.discard: Card | None = None
 
         self.trump_team: Team | None = None
         self.trump_suit: Suit | None = None
@@ -99,7 +258,7 @@ class Hand:
             self.deck = Deck()
 
         if shuffle_deck:
-            self.deck.shuffle()
+            self.deck.shuffle(rng)
 
         self.deal()
 
@@ -115,50 +274,96 @@ class Hand:
     def active(self) -> bool:
         """Determine whether a hand is active."""
         for player in self.players:
-            if len(player.cards) > 0:
+            if len(player.cards) > 0 and not player.skip:
                 return True
 
         return False
 
     def deal(self) -> None:
         """Deals hand."""
+        for team in self.players.teams:
+            team.tricks = 0
+
+        # Cards in the order they are dealt, kept for records
+        self.dealt = self.deck.cards[::-1]
+
         for player in self.players:
             player.cards = list(self.deck.deal(5))
+            player.skip = False
 
         self.lead = next(self.deck.deal(1))
         self.kitty = list(self.deck.deal(3))
 
+        if self.events.handlers:
+            self.events.emit(HandDealt(self))
+
     def process_call_trump(self) -> None:
         """Processes calling trump."""
+        with instrument.phase("bidding"):
+            _run(self._call_trump(), self)
+
+    async def aprocess_call_trump(self) -> None:
+        """Processes calling trump with the players' async hooks."""
+        with instrument.phase("bidding"):
+            await _arun(self._call_trump(), self)
+
+    def _call_trump(self) -> Flow:
+        """Flow of calling trump."""
         # Let players pick the lead card up if desired
         for player in self.players.ordered(self.players.start_player):
-            if player.request_trump_call(self):
+            if (yield "request_trump_call", player, ()):
                 self.trump_suit = self.lead.suit
-                player.request_replace_card(self, self.lead)
-                self.trump_team = self.players.get_team(player)
-                if player.request_loner(self):
-                    self.loner_player = player
-                    self.players.get_partner(player).skip = True
+                yield from self._call(player, True)
+                held = [*self.dealer.cards, self.lead]
+                yield "request_replace_card", self.dealer, (self.lead,)
+                self.discard = next(card for card in held if card not in self.dealer.cards)
                 return None
 
         # If the lead card is not picked up, let players choose trump
         for player in self.players.ordered(self.players.start_player):
-            choice = player.request_trump_choose(self)
+            choice = yield "request_trump_choose", player, ()
             if choice:
                 self.trump_suit = choice
-                self.trump_team = self.players.get_team(player)
-                if player.request_loner(self):
-                    self.loner_player = player
-                    self.players.get_partner(player).skip = True
+                yield from self._call(player, False)
                 return None
 
+    def _call(self, player: Player, ordered_up: bool) -> Flow:
+        """Make a player's team the makers, and let the player go alone."""
+        self.caller = player
+        self.trump_team = self.players.get_team(player)
+        if self.events.handlers:
+            self.events.emit(TrumpCalled(self, player, typing.cast(Suit, self.trump_suit), ordered_up))
+
+        if (yield "request_loner", player, ()):
+            self.loner_player = player
+            self.players.get_partner(player).skip = True
+            if self.events.handlers:
+                self.events.emit(LonerDeclared(self, player))
+
     def start_trick(self) -> None:
         """Starts the next trick."""
-        if self.active:
-            self.trick = Trick(self, self.trump_suit)
-        else:
+        if not self.active:
             raise NotActiveError
 
+        with instrument.phase("start_trick"):
+            self.trick = Trick(self, self.trump_suit)
+            self.tricks.append(self.trick)
+
+    def score(self) -> tuple[Team, int]:
+        """Score a finished hand.
+
+        Returns:
+            The team awarded points and the number of points.
+        """
+        makers = typing.cast(Team, self.trump_team)
+
+        if makers.tricks == 5:
+            return makers, 4 if self.loner_player else 2
+        if makers.tricks >= 3:
+            return makers, 1
+
+        return next(team for team in self.players.teams if team is not makers), 2
+
 
 class Trick:
     """Represents a Trick."""
@@ -166,61 +371,98 @@ class Trick:
     def __init__(self, hand: Hand, trump: Suit) -> None:
         """Init Trick."""
         self.hand: Hand = hand
-        self.cards = []
+        self.cards: list[dict[str, typing.Any]] = []
         self.trump: Suit = trump
         self.suit: Suit | None = None
 
+        # Running winner, updated as each card is played
+        self.winner: Player | None = None
+        self.winning_card: Card | None = None
+
+        self._trump = suit_index(trump)
+        self._strength: tuple[int, ...] | None = None
+        self._best = -1
+
     def __str__(self) -> str:
         """Return Trick as a printable string."""
         return f"{self.cards}"
 
+    def add(self, player: Player, card: Card) -> None:
+        """Add a played card to the trick, updating the current winner.
+
+        Args:
+            player (Player): Player who played the card.
+            card (Card): Card that was played.
+        """
+        i = card_index(card)
+
+        if self._strength is None:
+            led = EFFECTIVE_SUIT[self._trump][i]
+            self.suit = SUITS[led]
+            self._strength = STRENGTH[self._trump][led]
+
+        self.cards.append({"player": player, "card": card})
+
+        if self._strength[i] > self._best:
+            self._best = self._strength[i]
+            self.winner = player
+            self.winning_card = card
+
+    def play_card(self, player: Player, card: Card) -> None:
+        """Move a card from a player's hand to the trick, checking that it follows suit.
+
+        Args:
+            player (Player): Player playing the card.
+            card (Card): One of the player's cards.
+
+        Raises:
+            RenegeError: If the player could follow the suit led but did not.
+        """
+        if not is_legal(card, player.cards, self.suit, self.trump):
+            raise RenegeError(f"{player} must follow {typing.cast(Suit, self.suit).long} rather than play {card!r}")
+        player.cards.remove(card)
+        self.add(player, card)
+        if self.hand.events.handlers:
+            self.hand.events.emit(CardPlayed(self, player, card))
+
+    def legal_cards(self, player: Player) -> list[Card]:
+        """Return the cards a player may play to the trick.
+
+        Args:
+            player (Player): Player to play next.
+        """
+        return legal_cards(player.cards, self.suit, self.trump)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every player still in the hand has played to the trick."""
+        return len(self.cards) == sum(not player.skip for player in self.hand.players)
+
+    def award(self) -> None:
+        """Award a complete trick to its winner, who leads the next trick."""
+        winner = typing.cast(Player, self.winner)
+        self.hand.players.get_team(winner).tricks += 1
+        self.hand.leader = winner
+        if self.hand.events.handlers:
+            self.hand.events.emit(TrickWon(self, winner, typing.cast(Card, self.winning_card)))
+
     def play(self) -> None:
-        for player in self.hand.players.ordered(self.hand.players.start_player):
+        """Request a card from each player in turn and award the trick to the winner."""
+        with instrument.phase("trick"):
+            _run(self._play(), self.hand)
+
+    async def aplay(self) -> None:
+        """Await a card from each player in turn and award the trick to the winner."""
+        with instrument.phase("trick"):
+            await _arun(self._play(), self.hand)
+
+    def _play(self) -> Flow:
+        """Flow of playing the trick."""
+        for player in self.hand.players.ordered(self.hand.leader):
             if player.skip:
                 continue
 
-            card = player.request_play_card(self.hand)
-
-            if not self.suit:
-                self.suit = card.suit
-            self.cards.append({"player": player, "card": card})
-
-        wc = self.cards[0]["card"]
-        wp = self.cards[0]["player"]
-
-        for entry in self.cards[1:]:
-            card = entry["card"]
-            player = entry["player"]
-            # if this card is trump, and...
-            if is_trump(card, self.trump):
-                # ... the current winner is not trump
-                if not is_trump(wc, self.trump):
-                    wp = player
-                    wc = card
-                else:
-                    # ... this card is a "trumper (ie jack)", and...
-                    if card.rank.trumper:
-                        # ... the current winner is not a trumper
-                        if not wc.rank.trumper:
-                            wp = player
-                            wc = card
-                        # ... the current winner is a trumper, and...
-                        else:
-                            # ... this card has a higher rank than the current winner
-                            if card.rank > wc.rank:
-                                wp = player
-                                wc = card
-                            # ... this card is the exact same suit as the trump suit (left vs right bower)
-                            if card.suit == self.trump:
-                                wp = player
-                                wc = card
-                    # ... this card has a higher rank than the current winner
-                    elif card.rank > wc.rank:
-                        wp = player
-                        wc = card
-            # if this card is on suit and has a higher rank than the current winner
-            elif card.suit == self.suit and card.rank > wc.rank:
-                wp = player
-                wc = card
-
-        self.hand.players.get_team(wp).tricks += 1
+            card = yield "request_play_card", player, ()
+            self.play_card(player, card)
+
+        self.award()
@@ -0,0 +1,325 @@
+"""Search-based bot players."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+import typing
+
+from pyeuchre.beliefs import Beliefs
+from pyeuchre.bitboard import EFFECTIVE_SUIT_MASKS
+from pyeuchre.bitboard import FULL_MASK
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import suit_index
+from pyeuchre.bitboard import to_mask
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+from pyeuchre.people.players import Bot
+from pyeuchre.search import VALUE
+from pyeuchre.search import SearchState
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.strength import HandStrengthTable
+
+
+SEATS = 4
+
+# Trump cards, bowers included, other seats are assumed to need before calling when this bot passes
+CALL_LENGTH = 3
+
+
+def _trump_length(mask: int, trump: int) -> int:
+    """Return how many trump cards, bowers included, a mask holds."""
+    return (mask & EFFECTIVE_SUIT_MASKS[trump][trump]).bit_count()
+
+
+def discard(mask: int, trump: int) -> int:
+    """Return the card index a heuristic dealer would discard: the weakest, keeping trump where possible.
+
+    Args:
+        mask (int): Cards held, including the picked up card.
+        trump (int): Trump suit index.
+    """
+    return min(indices(mask), key=VALUE[trump].__getitem__)
+
+
+class _Node:
+    """Node of an information set search tree."""
+
+    __slots__ = ("move", "seat", "parent", "children", "visits", "available", "reward")
+
+    def __init__(self, move: int, seat: int, parent: _Node | None) -> None:
+        self.move = move
+        self.seat = seat
+        self.parent = parent
+        self.children: dict[int, _Node] = {}
+        self.visits = 0
+        self.available = 0
+        self.reward = 0.0
+
+
+class _View:
+    """What a bot knows about the trick-play phase of a hand."""
+
+    __slots__ = ("beliefs", "trump", "makers", "skip", "leader", "tricks", "played")
+
+    def __init__(self, bot: ISMCTSBot, hand: Hand) -> None:
+        seats = hand.players.players
+        discard = card_index(hand.discard) if hand.discard is not None and hand.players.dealer is bot else None
+        self.beliefs = Beliefs.from_hand(hand, bot, discard)
+        self.trump = self.beliefs.trump
+        self.makers = seats.index(hand.caller) & 1
+        self.skip = self.beliefs.skip
+        self.tricks = [team.tricks for team in hand.players.teams]
+
+        self.leader = seats.index(hand.leader)
+        self.played: list[int] = []
+        trick = hand.trick
+        if trick and trick.cards and len(trick.cards) < SEATS - (self.skip is not None):
+            self.leader = seats.index(trick.cards[0]["player"])
+            self.played = [card_index(entry["card"]) for entry in trick.cards]
+
+    def determinize(self, rng: random.Random) -> list[int]:
+        """Deal the hidden cards to the other seats, uniformly among the deals consistent with play so far."""
+        return self.beliefs.sample(rng)[:SEATS]
+
+
+class ISMCTSBot(Bot):
+    """A bot that searches with determinized information set Monte Carlo tree search.
+
+    Card play uses single-observer ISMCTS over sampled deals of the cards the bot cannot see; bidding,
+    loner and discard decisions compare their options with UCB1 over sampled deals played out greedily.
+    Each decision runs until its wall-clock or iteration budget runs out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rng: random.Random | None = None,
+        time_budget: float | None = 0.05,
+        iterations: int | None = None,
+        exploration: float = 0.7,
+        table: HandStrengthTable | None = None,
+        call_threshold: float = 0.6,
+    ) -> None:
+        """Initialize bot.
+
+        Args:
+            name (str): Bot's display name.
+            rng (Random): Random number generator for sampling.
+            time_budget (float): Seconds to spend on each decision, or None for no limit.
+            iterations (int): Iterations to run for each decision, or None for no limit.
+            exploration (float): UCB exploration constant.
+            table (HandStrengthTable): Precomputed hand strengths to bid from instead of sampling.
+            call_threshold (float): Probability of making needed to call trump from the table.
+        """
+        super().__init__(name, rng)
+        self.time_budget = time_budget
+        self.iterations = iterations if iterations or time_budget else 200
+        self.exploration = exploration
+        self.table = table
+        self.call_threshold = call_threshold
+
+    def _budget(self) -> typing.Generator[int, None, None]:
+        """Yield iteration numbers until the decision budget is spent."""
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else math.inf
+        i = 0
+        while (self.iterations is None or i < self.iterations) and time.perf_counter() < deadline:
+            yield i
+            i += 1
+
+    def _card(self, i: int) -> Card:
+        """Return the held card with a card index."""
+        return next(card for card in self.cards if card_index(card) == i)
+
+    def request_play_card(self, hand: Hand) -> Card:
+        """Search for the best card to play."""
+        legal = self.legal_cards(hand)
+        if len(legal) == 1:
+            return legal[0]
+
+        view = _View(self, hand)
+        root = _Node(-1, -1, None)
+        for _i in self._budget():
+            state = SearchState(view.determinize(self.rng), view.trump, view.makers, view.leader, view.skip, view.tricks, view.played)
+            self._iterate(root, state)
+
+        if not root.children:
+            return legal[0]
+        best = max(root.children.values(), key=lambda node: node.visits)
+        return self._card(best.move)
+
+    def _iterate(self, root: _Node, state: SearchState) -> None:
+        """Run one ISMCTS iteration on a determinized state."""
+        node = root
+        while not state.terminal:
+            moves = list(indices(state.legal()))
+            untried = [move for move in moves if move not in node.children]
+            if untried:
+                move = self.rng.choice(untried)
+                node.children[move] = _Node(move, state.seat, node)
+            for legal in moves:
+                if legal in node.children:
+                    node.children[legal].available += 1
+            if untried:
+                node = node.children[move]
+                state.apply(move)
+                break
+
+            log = math.log
+            node = max(
+                (node.children[move] for move in moves),
+                key=lambda child: child.reward / child.visits + self.exploration * math.sqrt(log(child.available) / child.visits),
+            )
+            state.apply(node.move)
+
+        while not state.terminal:
+            state.apply(state.greedy())
+
+        while node is not root:
+            node.visits += 1
+            node.reward += (state.points(node.seat & 1) + 4) / 8
+            node = typing.cast(_Node, node.parent)
+
+    def _choose(self, options: list[typing.Any], evaluate: typing.Callable[[typing.Any], float]) -> typing.Any:
+        """Pick the option with the best mean reward, sampling options with UCB1."""
+        if len(options) == 1:
+            return options[0]
+
+        visits = [0] * len(options)
+        rewards = [0.0] * len(options)
+        for i in self._budget():
+            if i < len(options):
+                pick = i
+            else:
+                pick = max(
+                    range(len(options)),
+                    key=lambda j: rewards[j] / visits[j] + self.exploration * math.sqrt(math.log(i) / visits[j]),
+                )
+            visits[pick] += 1
+            rewards[pick] += evaluate(options[pick])
+
+        return options[max(range(len(options)), key=lambda j: rewards[j] / visits[j] if visits[j] else -1.0)]
+
+    def _deal(self, hand: Hand, own: int, trump: int, up_to_dealer: bool) -> list[int]:
+        """Sample the other seats' hands before play, with the dealer picking up the lead card if ordered."""
+        seats = hand.players.players
+        me, dealer = seats.index(self), seats.index(hand.players.dealer)
+        up = card_index(hand.lead)
+
+        pool = list(indices(FULL_MASK & ~own & ~(1 << up) & ~to_mask(self.cards)))
+        self.rng.shuffle(pool)
+
+        hands = [0] * SEATS
+        hands[me] = own
+        for seat in range(SEATS):
+            if seat != me:
+                for card in pool[:5]:
+                    hands[seat] |= 1 << card
+                del pool[:5]
+
+        if up_to_dealer and dealer != me:
+            hands[dealer] |= 1 << up
+            hands[dealer] ^= 1 << discard(hands[dealer], trump)
+        return hands
+
+    def _playout(self, hand: Hand, hands: list[int], trump: int, makers: int, skip: int | None) -> float:
+        """Play a sampled deal out greedily, returning this bot's reward."""
+        seats = hand.players.players
+        me = seats.index(self)
+        state = SearchState(hands, trump, makers, seats.index(hand.players.start_player), skip)
+        while not state.terminal:
+            state.apply(state.greedy())
+        return (state.points(me & 1) + 4) / 8
+
+    def _evaluate_call(self, hand: Hand, trump: int, up_to_dealer: bool, alone: bool = False) -> float:
+        """Sample a deal and play it out with this bot's team making trump."""
+        seats = hand.players.players
+        me = seats.index(self)
+        own = to_mask(self.cards)
+        if up_to_dealer and seats.index(hand.players.dealer) == me:
+            own |= 1 << card_index(hand.lead)
+            own ^= 1 << discard(own, trump)
+        hands = self._deal(hand, own, trump, up_to_dealer)
+        return self._playout(hand, hands, trump, me & 1, (me + 2) % SEATS if alone else None)
+
+    def _evaluate_pass(self, hand: Hand, round_one: bool) -> float:
+        """Sample a deal and play it out after this bot passes.
+
+        The seats still to bid call the first suit they hold CALL_LENGTH trump in, the dealer being stuck
+        with their longest suit if everyone passes the second round.
+        """
+        seats = hand.players.players
+        me, dealer = seats.index(self), seats.index(hand.players.dealer)
+        up_suit = suit_index(hand.lead.suit)
+        hands = self._deal(hand, to_mask(self.cards), up_suit, False)
+
+        start = seats.index(hand.players.start_player)
+        order = [(start + k) % SEATS for k in range(SEATS)]
+        rest = order[order.index(me) + 1 :]
+        if round_one:
+            caller = next((seat for seat in rest if _trump_length(hands[seat], up_suit) >= CALL_LENGTH), None)
+            if caller is not None:
+                hands[dealer] |= 1 << card_index(hand.lead)
+                hands[dealer] ^= 1 << discard(hands[dealer], up_suit)
+                return self._playout(hand, hands, up_suit, caller & 1, None)
+            # Everyone passed the lead card, so the second round starts over, this bot included
+            rest = order
+
+        others = [suit for suit in range(len(SUITS)) if suit != up_suit]
+        longest = [max(others, key=lambda suit: _trump_length(mask, suit)) for mask in hands]
+        caller = next((seat for seat in rest if _trump_length(hands[seat], longest[seat]) >= CALL_LENGTH), dealer)
+        return self._playout(hand, hands, longest[caller], caller & 1, None)
+
+    def request_trump_call(self, hand: Hand) -> bool:
+        """Decide whether ordering up the lead card beats passing."""
+        trump = suit_index(hand.lead.suit)
+        if self.table:
+            return self.table.for_player(hand, self, trump).make >= self.call_threshold
+        return bool(self._choose([False, True], lambda call: self._evaluate_call(hand, trump, True) if call else self._evaluate_pass(hand, True)))
+
+    def request_trump_choose(self, hand: Hand) -> Suit | None:
+        """Choose the trump suit that samples best, or pass if passing is allowed and best."""
+        options: list[Suit | None] = [suit for suit in SUITS if suit != hand.lead.suit]
+        if self.table:
+            table = self.table
+            makes = {suit_index(suit): table.for_player(hand, self, suit_index(suit)).make for suit in options}
+            best = max(makes, key=makes.__getitem__)
+            return SUITS[best] if makes[best] >= self.call_threshold or hand.players.dealer is self else None
+
+        if hand.players.dealer is not self:
+            options.append(None)
+        return typing.cast(
+            Suit | None,
+            self._choose(
+                options, lambda suit: self._evaluate_call(hand, suit_index(suit), False) if suit else self._evaluate_pass(hand, False)
+            ),
+        )
+
+    def request_loner(self, hand: Hand) -> bool:
+        """Decide whether going alone samples better than playing with a partner."""
+        trump = suit_index(hand.trump_suit)
+        up_to_dealer = hand.trump_suit == hand.lead.suit
+        return bool(self._choose([False, True], lambda alone: self._evaluate_call(hand, trump, up_to_dealer, alone)))
+
+    def request_replace_card(self, hand: Hand, card: Card) -> None:
+        """Choose the discard that samples best, with trump already set."""
+        seats = hand.players.players
+        trump = suit_index(hand.trump_suit)
+        makers = seats.index(hand.caller) & 1
+        skip = next((seat for seat, player in enumerate(seats) if player.skip), None)
+        held = to_mask(self.cards) | 1 << card_index(card)
+
+        def evaluate(out: int) -> float:
+            hands = self._deal(hand, held ^ 1 << out, trump, False)
+            return self._playout(hand, hands, trump, makers, skip)
+
+        out = self._choose(list(indices(held)), evaluate)
+        if out != card_index(card):
+            self.cards[self.cards.index(self._card(out))] = card
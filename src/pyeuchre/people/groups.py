@@ -51,11 +51,12 @@ class Team:
 class Players:
     """Represents a group of players within teams."""
 
-    def __init__(self, teams: tuple[Team, Team]) -> None:
+    def __init__(self, teams: tuple[Team, Team], dealer: int = 0) -> None:
         """Initialize players.
 
         Args:
             teams (tuple): Tuple of teams.
+            dealer (int): Index of the first dealer.
         """
         self.teams = teams
         self.players: list[Player] = []
@@ -65,7 +66,7 @@ class Players:
             self.players.append(self.teams[0].players[i])
             self.players.append(self.teams[1].players[i])
 
-        self._dealer_index = 0
+        self._dealer_index = dealer
 
     def __getitem__(self, i: int) -> Player:
         """Return self.players if self is treated as a list."""
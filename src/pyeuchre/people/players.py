@@ -1,7 +1,11 @@
 """Classes pertaining to players."""
 
+import random
 import typing
 
+from pyeuchre.bitboard import is_legal
+from pyeuchre.bitboard import legal_cards
+from pyeuchre.cards import SUITS
 from pyeuchre.cards import Card
 from pyeuchre.cards import Suit
 from pyeuchre.exceptions import InvalidInputError
@@ -49,7 +53,7 @@ class Player:
         """Request a player to decide if they want to choose a trump."""
         raise NotImplementedError
 
-    def request_replace_card(self, hand: "Hand") -> None:  # noqa: N803
+    def request_replace_card(self, hand: "Hand", card: Card) -> None:  # noqa: N803
         """Request a player replace a card in their hand with a new card."""
         raise NotImplementedError
 
@@ -61,6 +65,40 @@ class Player:
         """
         raise NotImplementedError
 
+    def legal_cards(self, hand: "Hand") -> list[Card]:
+        """Return the cards this player may play to the current trick.
+
+        Args:
+            hand (Hand): Hand being played.
+        """
+        trick = hand.trick
+        if not trick:
+            return self.cards
+        return legal_cards(self.cards, trick.suit, typing.cast(Suit, hand.trump_suit))
+
+    # Awaitable versions of the hooks, used when hands are played on an event loop. They default to
+    # the synchronous hooks; players that wait on I/O override them instead.
+
+    async def arequest_loner(self, hand: "Hand") -> bool:  # noqa: N803
+        """Await a player's decision to go alone."""
+        return self.request_loner(hand)
+
+    async def arequest_trump_call(self, hand: "Hand") -> bool:  # noqa: N803
+        """Await a player's decision to call a face up trump value."""
+        return self.request_trump_call(hand)
+
+    async def arequest_trump_choose(self, hand: "Hand") -> Suit | None:  # noqa: N803
+        """Await a player's choice of trump."""
+        return self.request_trump_choose(hand)
+
+    async def arequest_replace_card(self, hand: "Hand", card: Card) -> None:  # noqa: N803
+        """Await a player replacing a card in their hand with a new card."""
+        self.request_replace_card(hand, card)
+
+    async def arequest_play_card(self, hand: "Hand") -> Card:
+        """Await a player's card to play."""
+        return self.request_play_card(hand)
+
 
 class Human(Player):
     """Represents a human player."""
@@ -152,6 +190,9 @@ class Human(Player):
                 card = parse_card(choice)
                 if card not in self.cards:
                     raise InvalidInputError
+                if hand.trick and not is_legal(card, self.cards, hand.trick.suit, typing.cast(Suit, hand.trump_suit)):
+                    print("You must follow suit.")
+                    continue
                 return card
             except InvalidInputError:
                 print("Invalid choice.")
@@ -160,5 +201,44 @@ class Human(Player):
 class Bot(Player):
     """Represents a bot player."""
 
-    # TODO write code here - subclass again for varying bot strengths?
-    pass
+    def __init__(self, name: str, rng: random.Random | None = None) -> None:
+        """Initialize bot.
+
+        Args:
+            name (str): Bot's display name.
+            rng (Random): Random number generator for the bot's decisions.
+        """
+        super().__init__(name)
+        self.rng = rng or random.Random()
+
+
+class RandomBot(Bot):
+    """A bot that makes uniformly random legal decisions."""
+
+    call_probability = 0.5
+    loner_probability = 0.1
+
+    def request_trump_call(self, hand: "Hand") -> bool:  # noqa: N803
+        """Randomly decide whether to order up the lead card."""
+        return self.rng.random() < self.call_probability
+
+    def request_trump_choose(self, hand: "Hand") -> Suit | None:  # noqa: N803
+        """Randomly choose a trump suit, or pass if not the dealer."""
+        choices: list[Suit | None] = [suit for suit in SUITS if suit != hand.lead.suit]
+        if hand.players.dealer is not self:
+            choices.append(None)
+        return self.rng.choice(choices)
+
+    def request_loner(self, hand: "Hand") -> bool:  # noqa: N803
+        """Randomly decide whether to go alone."""
+        return self.rng.random() < self.loner_probability
+
+    def request_replace_card(self, hand: "Hand", card: Card) -> None:  # noqa: N803
+        """Randomly discard one of the held cards or the lead card."""
+        i = self.rng.randrange(len(self.cards) + 1)
+        if i < len(self.cards):
+            self.cards[i] = card
+
+    def request_play_card(self, hand: "Hand") -> Card:
+        """Randomly play a legal card."""
+        return self.rng.choice(self.legal_cards(hand))
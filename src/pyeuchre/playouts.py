@@ -0,0 +1,193 @@
+"""Vectorized simulation of many games between random bots at once.
+
+Requires the optional numpy dependency. play_random_games plays a batch of games in lockstep: every
+step of a hand (the deal, each bidding seat, each card of each trick) is a handful of array
+operations over all the games still running, so the interpreter's cost is paid per step rather
+than per game. Decisions are drawn with RandomBot's probabilities, as in sim.play_random_game.
+
+Every game deals first from seat 0 and passes the deal each hand, so all games of a batch share
+the dealer. A player's cards are the five card indices dealt to their seat, with a mask of those
+still held.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import SUITS
+from pyeuchre.dealer import deal_permutations
+from pyeuchre.people.players import RandomBot
+from pyeuchre.sim import GameResult
+from pyeuchre.sim import SimulationResult
+
+
+SEATS = 4
+HAND_SIZE = 5
+LEAD = SEATS * HAND_SIZE
+WINNING_SCORE = 10
+
+# Effective suit of every card, keyed by [trump, card index]
+_EFFECTIVE = np.array(EFFECTIVE_SUIT, dtype=np.int8)
+# Strength of every card in a trick, keyed by [trump, led effective suit, card index]
+_STRENGTH = np.array(STRENGTH, dtype=np.int8)
+# The suits other than each suit, for choosing trump in the second round
+_OTHERS = np.array([[other for other in range(len(SUITS)) if other != suit] for suit in range(len(SUITS))], dtype=np.int8)
+
+
+def _bid(
+    cards: npt.NDArray[np.uint8],
+    dealer: int,
+    rng: np.random.Generator,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+    """Bid a hand in every game, picking the lead card up for the dealer where it is ordered up.
+
+    Returns:
+        The caller's seat, trump suit index and whether the caller goes alone, for each game.
+    """
+    n = len(cards)
+    rows = np.arange(n)
+    up = cards[:, LEAD].astype(np.int64)
+    seats = (dealer + 1 + np.arange(SEATS)) % SEATS
+
+    # First round: the first seat to order the lead card up calls its suit
+    orders = rng.random((n, SEATS)) < RandomBot.call_probability
+    ordered = orders.any(axis=1)
+    caller = seats[orders.argmax(axis=1)]
+    trump = up // len(RANKS)
+
+    # The dealer discards any of their five cards or the lead card itself (slot LEAD)
+    discard = rng.integers(0, HAND_SIZE + 1, n)
+    swap = ordered & (discard < HAND_SIZE)
+    cards[rows[swap], dealer * HAND_SIZE + discard[swap]] = up[swap]
+
+    # Second round: each seat picks one of the other three suits or passes, except the dealer who must pick
+    choices = rng.integers(0, len(SUITS) - 1 + (seats != dealer), (n, SEATS))
+    chose = choices < len(SUITS) - 1
+    first = chose.argmax(axis=1)
+    second = ~ordered
+    caller[second] = seats[first[second]]
+    trump[second] = _OTHERS[trump[second], choices[second, first[second]]]
+
+    alone = rng.random(n) < RandomBot.loner_probability
+    return caller, trump, alone
+
+
+def _play(
+    cards: npt.NDArray[np.uint8],
+    dealer: int,
+    caller: npt.NDArray[np.int64],
+    trump: npt.NDArray[np.int64],
+    alone: npt.NDArray[np.bool_],
+    rng: np.random.Generator,
+) -> npt.NDArray[np.int64]:
+    """Play out a hand in every game with uniformly random legal cards.
+
+    Returns:
+        The tricks each game's makers took.
+    """
+    n = len(cards)
+    rows = np.arange(n)
+    hands = cards[:, :LEAD].reshape(n, SEATS, HAND_SIZE).astype(np.int64)
+    held = np.ones((n, SEATS, HAND_SIZE), dtype=bool)
+    skip = np.where(alone, (caller + 2) % SEATS, -1)
+    effective = _EFFECTIVE[trump[:, None, None], hands]
+
+    leader = np.full(n, (dealer + 1) % SEATS)
+    leader[leader == skip] = (leader[leader == skip] + 1) % SEATS
+    taken = np.zeros(n, dtype=np.int64)
+    for _trick in range(HAND_SIZE):
+        led = np.zeros(n, dtype=np.int64)
+        best = np.full(n, -1, dtype=np.int64)
+        winner = leader.copy()
+        for position in range(SEATS):
+            seat = (leader + position) % SEATS
+            playing = seat != skip
+            mine = held[rows, seat]
+            if position:
+                follow = mine & (effective[rows, seat] == led[:, None])
+                mine = np.where(follow.any(axis=1, keepdims=True), follow, mine)
+            # A uniformly random legal card: the legal slot with the highest random key
+            slot = np.where(mine, rng.random((n, HAND_SIZE)), -1.0).argmax(axis=1)
+            card = hands[rows, seat, slot]
+            held[rows[playing], seat[playing], slot[playing]] = False
+            if not position:
+                led = _EFFECTIVE[trump, card].astype(np.int64)
+            strength = np.where(playing, _STRENGTH[trump, led, card], -1)
+            wins = strength > best
+            best = np.where(wins, strength, best)
+            winner = np.where(wins, seat, winner)
+        taken += (winner & 1) == (caller & 1)
+        leader = winner
+    return taken
+
+
+def play_random_games(games: int, rng: np.random.Generator | None = None) -> list[GameResult]:
+    """Play games between four random bots, all at once.
+
+    Args:
+        games (int): Number of games to play.
+        rng (Generator): numpy random generator, defaulting to a freshly seeded one.
+    """
+    rng = rng or np.random.default_rng()
+    scores = np.zeros((games, 2), dtype=np.int64)
+    hands = np.zeros(games, dtype=np.int64)
+    running = np.arange(games)
+
+    dealer = 0
+    while len(running):
+        n = len(running)
+        cards = deal_permutations(n, rng)
+        caller, trump, alone = _bid(cards, dealer, rng)
+        taken = _play(cards, dealer, caller, trump, alone, rng)
+
+        makers = caller & 1
+        points = np.where(taken == HAND_SIZE, np.where(alone, 4, 2), np.where(taken >= 3, 1, 2))
+        team = np.where(taken >= 3, makers, makers ^ 1)
+        scores[running, team] += points
+        hands[running] += 1
+
+        running = running[scores[running].max(axis=1) < WINNING_SCORE]
+        dealer = (dealer + 1) % SEATS
+
+    return [
+        GameResult((int(first), int(second)), 0 if first > second else 1, int(count))
+        for (first, second), count in zip(scores, hands)
+    ]
+
+
+def simulate_random(games: int, seed: int | None = None, batch: int = 1 << 14) -> SimulationResult:
+    """Play a number of games between random bots in batches with play_random_games.
+
+    Args:
+        games (int): Number of games to play.
+        seed (int): Seed for dealing and for the bots.
+        batch (int): Games played at once.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    results = []
+    for first in range(0, games, batch):
+        results += play_random_games(min(batch, games - first), rng)
+    return SimulationResult(results, time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a vectorized simulation and report throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = simulate_random(args.games, args.seed)
+    print(f"{len(result.results)} games in {result.elapsed:.2f}s ({result.games_per_second:.0f} games/s), wins {result.wins}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Learned policy bots, with batched inference across many concurrent tables.
+
+Requires the optional numpy dependency. An MLP scores the ACTIONS of a batch of observations (see
+features) with one matrix multiply per layer, so its cost barely depends on the batch size up to
+a few hundred rows. A PolicyBot asked to decide on its own scores a batch of one. Playing through
+play_batched instead, many tables advance in lockstep on one event loop: each PolicyBot's async
+hooks hand their observation to a shared BatchScheduler and wait, and once every table is waiting
+the scheduler scores all their decisions in a single call and dispatches each answer back::
+
+    result = play_batched(10_000, MLP.random((64,)), tables=256, seed=0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+from pyeuchre.features import ACTIONS
+from pyeuchre.features import WIDTH
+from pyeuchre.features import from_action
+from pyeuchre.features import legal_mask
+from pyeuchre.features import observe
+from pyeuchre.game import Game
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import Bot
+from pyeuchre.rng import derive
+from pyeuchre.sim import GameResult
+from pyeuchre.sim import SimulationResult
+from pyeuchre.sim import game_rng
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+
+
+Array = npt.NDArray[np.float32]
+
+# Bit a of row i is set when action a is legal, for expanding legal masks into a boolean array
+_BITS = np.arange(ACTIONS, dtype=np.uint32)
+
+
+class MLP:
+    """Multi-layer perceptron with ReLU hidden layers, scoring each action of a batch of observations."""
+
+    def __init__(self, weights: typing.Sequence[Array], biases: typing.Sequence[Array]) -> None:
+        """Initialize model.
+
+        Args:
+            weights (Sequence): Weight matrix of each layer, the first WIDTH rows deep and the last ACTIONS columns wide.
+            biases (Sequence): Bias vector of each layer.
+        """
+        if weights[0].shape[0] != WIDTH or weights[-1].shape[1] != ACTIONS:
+            raise ValueError(f"model must map {WIDTH} features to {ACTIONS} actions")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def random(cls, hidden: typing.Sequence[int] = (), rng: np.random.Generator | None = None) -> MLP:
+        """Build an untrained model with He-initialized weights; with no hidden layers it is linear.
+
+        Args:
+            hidden (Sequence): Width of each hidden layer.
+            rng (Generator): numpy random generator, defaulting to a freshly seeded one.
+        """
+        rng = rng or np.random.default_rng()
+        sizes = [WIDTH, *hidden, ACTIONS]
+        weights = [rng.standard_normal((a, b), dtype=np.float32) * np.sqrt(2 / a) for a, b in zip(sizes, sizes[1:])]
+        return cls(weights, [np.zeros(b, dtype=np.float32) for b in sizes[1:]])
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> MLP:
+        """Load a model saved with save."""
+        with np.load(path) as data:
+            layers = len(data.files) // 2
+            return cls([data[f"w{i}"] for i in range(layers)], [data[f"b{i}"] for i in range(layers)])
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the model's weights to an .npz file."""
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, **arrays)
+
+    def __call__(self, features: npt.NDArray[typing.Any]) -> Array:
+        """Score every action for a batch of observations.
+
+        Args:
+            features (ndarray): (n, WIDTH) array of observations.
+
+        Returns:
+            An (n, ACTIONS) array of scores.
+        """
+        x = features.astype(np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+
+def select(
+    scores: Array,
+    legal: npt.NDArray[np.uint32],
+    temperature: float = 0.0,
+    rng: np.random.Generator | None = None,
+) -> npt.NDArray[np.intp]:
+    """Choose a legal action for each row of scores.
+
+    Args:
+        scores (ndarray): (n, ACTIONS) array of scores.
+        legal (ndarray): n legal action masks, with bit a set when action a is legal.
+        temperature (float): Softmax temperature to sample actions at; 0 takes the best legal action.
+        rng (Generator): numpy random generator to sample with.
+    """
+    allowed = (legal[:, None] >> _BITS & 1).astype(bool)
+    if temperature > 0:
+        # Gumbel-max: adding Gumbel noise and taking the argmax samples from the softmax
+        scores = scores / temperature + (rng or np.random.default_rng()).gumbel(size=scores.shape)
+    return np.where(allowed, scores, -np.inf).argmax(axis=1)
+
+
+class BatchScheduler:
+    """Gathers the pending decisions of concurrent tables and scores them in batches."""
+
+    def __init__(
+        self,
+        model: MLP,
+        max_batch: int | None = None,
+        temperature: float = 0.0,
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """Initialize scheduler.
+
+        Args:
+            model (MLP): Model scoring each batch.
+            max_batch (int): Most decisions to score at once, defaulting to one per table.
+            temperature (float): Softmax temperature to sample actions at; 0 takes the best legal action.
+            rng (Generator): numpy random generator to sample with.
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.temperature = temperature
+        self.rng = rng or np.random.default_rng()
+
+        # Tables playing, each of which is either running or waiting on one pending decision
+        self.tables = 0
+        self._rows: list[bytearray] = []
+        self._legal: list[int] = []
+        self._futures: list[asyncio.Future[int]] = []
+
+        self.batches = 0
+        self.decisions = 0
+
+    @property
+    def mean_batch(self) -> float:
+        """Mean number of decisions scored per batch."""
+        return self.decisions / self.batches if self.batches else 0.0
+
+    def decide(self, row: bytearray, legal: int) -> asyncio.Future[int]:
+        """Queue a decision, scoring the batch if every table is now waiting.
+
+        Args:
+            row (bytearray): Observation, from features.observe.
+            legal (int): Legal action mask, from features.legal_mask.
+
+        Returns:
+            Future resolving to the action chosen.
+        """
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._rows.append(row)
+        self._legal.append(legal)
+        self._futures.append(future)
+        self._maybe_flush()
+        return future
+
+    def start_table(self) -> None:
+        """Count a table as playing."""
+        self.tables += 1
+
+    def finish_table(self) -> None:
+        """Stop counting a table, scoring the batch if every other table is waiting."""
+        self.tables -= 1
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        """Score the pending decisions once every table waits on one, or the batch is full."""
+        pending = len(self._futures)
+        if pending and (pending >= self.tables or (self.max_batch and pending >= self.max_batch)):
+            self.flush()
+
+    def flush(self) -> None:
+        """Score every pending decision and resolve their futures."""
+        n = len(self._futures)
+        features = np.frombuffer(b"".join(self._rows), dtype=np.uint8).reshape(n, WIDTH)
+        legal = np.array(self._legal, dtype=np.uint32)
+        actions = select(self.model(features), legal, self.temperature, self.rng).tolist()
+
+        futures = self._futures
+        self._rows, self._legal, self._futures = [], [], []
+        self.batches += 1
+        self.decisions += n
+        for future, action in zip(futures, actions):
+            future.set_result(action)
+
+
+class PolicyBot(Bot):
+    """A bot taking the legal action its model scores highest, or sampling with a temperature.
+
+    Its async hooks defer to a BatchScheduler when it has one, so it can only be used with a
+    scheduler on the scheduler's event loop; its sync hooks always score a batch of one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: MLP,
+        scheduler: BatchScheduler | None = None,
+        temperature: float = 0.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize bot.
+
+        Args:
+            name (str): Bot's display name.
+            model (MLP): Model scoring decisions made alone.
+            scheduler (BatchScheduler): Scheduler batching decisions made through the async hooks.
+            temperature (float): Softmax temperature to sample decisions made alone at.
+            rng (Random): Random number generator seeding the bot's sampling.
+        """
+        super().__init__(name, rng)
+        self.model = model
+        self.scheduler = scheduler
+        self.temperature = temperature
+        self._np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+    def _decide(self, hand: Hand, request: str, args: tuple[typing.Any, ...] = ()) -> typing.Any:
+        """Score a decision on its own and return the answer."""
+        features = np.frombuffer(observe(hand, self, request, args), dtype=np.uint8)[None]
+        legal = np.array([legal_mask(hand, self, request, args)], dtype=np.uint32)
+        action = int(select(self.model(features), legal, self.temperature, self._np_rng)[0])
+        return from_action(request, action)
+
+    async def _adecide(self, hand: Hand, request: str, args: tuple[typing.Any, ...] = ()) -> typing.Any:
+        """Queue a decision with the scheduler and await the answer."""
+        if self.scheduler is None:
+            return self._decide(hand, request, args)
+        row = observe(hand, self, request, args)
+        action = await self.scheduler.decide(row, legal_mask(hand, self, request, args))
+        return from_action(request, action)
+
+    def _replace(self, card: Card, discard: Card) -> None:
+        """Swap the up card into the hand in place of the discard, unless the up card is the discard."""
+        if discard is not card:
+            self.cards[self.cards.index(discard)] = card
+
+    def request_trump_call(self, hand: Hand) -> bool:
+        """Decide whether to order up the lead card."""
+        return bool(self._decide(hand, "request_trump_call"))
+
+    def request_trump_choose(self, hand: Hand) -> Suit | None:
+        """Choose a trump suit, or pass."""
+        return typing.cast("Suit | None", self._decide(hand, "request_trump_choose"))
+
+    def request_loner(self, hand: Hand) -> bool:
+        """Decide whether to go alone."""
+        return bool(self._decide(hand, "request_loner"))
+
+    def request_replace_card(self, hand: Hand, card: Card) -> None:
+        """Discard a held card or the lead card."""
+        self._replace(card, self._decide(hand, "request_replace_card", (card,)))
+
+    def request_play_card(self, hand: Hand) -> Card:
+        """Play a legal card."""
+        return typing.cast(Card, self._decide(hand, "request_play_card"))
+
+    async def arequest_trump_call(self, hand: Hand) -> bool:
+        """Decide whether to order up the lead card, batched with other tables."""
+        return bool(await self._adecide(hand, "request_trump_call"))
+
+    async def arequest_trump_choose(self, hand: Hand) -> Suit | None:
+        """Choose a trump suit, or pass, batched with other tables."""
+        return typing.cast("Suit | None", await self._adecide(hand, "request_trump_choose"))
+
+    async def arequest_loner(self, hand: Hand) -> bool:
+        """Decide whether to go alone, batched with other tables."""
+        return bool(await self._adecide(hand, "request_loner"))
+
+    async def arequest_replace_card(self, hand: Hand, card: Card) -> None:
+        """Discard a held card or the lead card, batched with other tables."""
+        self._replace(card, await self._adecide(hand, "request_replace_card", (card,)))
+
+    async def arequest_play_card(self, hand: Hand) -> Card:
+        """Play a legal card, batched with other tables."""
+        return typing.cast(Card, await self._adecide(hand, "request_play_card"))
+
+
+def policy_players(scheduler: BatchScheduler, rng: random.Random | None = None) -> Players:
+    """Build a table of four PolicyBots sharing a scheduler and its model.
+
+    Args:
+        scheduler (BatchScheduler): Scheduler batching the bots' decisions.
+        rng (Random): Random number generator shared by the bots.
+    """
+    model = scheduler.model
+    return Players(
+        (
+            Team((PolicyBot("North", model, scheduler, rng=rng), PolicyBot("South", model, scheduler, rng=rng))),
+            Team((PolicyBot("East", model, scheduler, rng=rng), PolicyBot("West", model, scheduler, rng=rng))),
+        )
+    )
+
+
+async def _play_game(players: Players, rng: random.Random) -> GameResult:
+    """Play a game to completion on the running event loop."""
+    for team in players.teams:
+        team.score = 0
+
+    game = Game(players, rng=rng)
+    hands = 0
+    while game.active:
+        await game.aplay_hand()
+        hands += 1
+
+    first, second = (team.score for team in players.teams)
+    return GameResult((first, second), 0 if first > second else 1, hands)
+
+
+async def arun_batched(
+    games: int,
+    scheduler: BatchScheduler,
+    tables: int = 64,
+    seed: int | None = None,
+    players: typing.Callable[[BatchScheduler, random.Random], Players] = policy_players,
+) -> list[GameResult]:
+    """Play games across concurrent tables on the running event loop, batching decisions with a scheduler.
+
+    Each table plays games back to back until all have been started. Game g is dealt from stream g of the seed,
+    as in sim.play_seeded.
+
+    Args:
+        games (int): Number of games to play.
+        scheduler (BatchScheduler): Scheduler batching the tables' decisions.
+        tables (int): Number of tables playing at once.
+        seed (int): Master seed for dealing and for the tables' bots.
+        players (Callable): Builds a game's table from the scheduler and the game's bot generator.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    results: list[GameResult | None] = [None] * games
+    games_started = 0
+
+    async def table() -> None:
+        nonlocal games_started
+        try:
+            while games_started < games:
+                game = games_started
+                games_started += 1
+                rng = game_rng(seed, game)
+                results[game] = await _play_game(players(scheduler, random.Random(derive(rng.key, "bots"))), rng)
+        finally:
+            scheduler.finish_table()
+
+    # Count every table before any starts, or the first would find itself the only one and never wait for the rest
+    tables = min(tables, games)
+    for _table in range(tables):
+        scheduler.start_table()
+    await asyncio.gather(*(table() for _table in range(tables)))
+    return typing.cast(list[GameResult], results)
+
+
+def play_batched(
+    games: int,
+    model: MLP,
+    tables: int = 64,
+    seed: int | None = None,
+    temperature: float = 0.0,
+) -> SimulationResult:
+    """Play games between PolicyBots across concurrent tables, scoring their decisions in batches.
+
+    Args:
+        games (int): Number of games to play.
+        model (MLP): Model every bot plays with.
+        tables (int): Number of tables playing at once, and so the largest batch.
+        seed (int): Master seed for dealing and for sampling actions.
+        temperature (float): Softmax temperature to sample actions at; 0 takes the best legal action.
+    """
+    scheduler = BatchScheduler(model, temperature=temperature, rng=np.random.default_rng(seed))
+    start = time.perf_counter()
+    results = asyncio.run(arun_batched(games, scheduler, tables, seed))
+    return SimulationResult(results, time.perf_counter() - start)
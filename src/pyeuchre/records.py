@@ -0,0 +1,330 @@
+"""Compact binary records of played games, and deterministic replay.
+
+A record file is a header followed by a stream of tagged records:
+
+- ``GAME``: the first dealer's seat.
+- ``HAND``: one byte packing the dealer seat, caller seat, trump suit, loner flag and whether trump
+  was called at all; the discarded card index; the 24 card indices in dealing order; then the
+  number of cards played and their indices in play order.
+- ``END``: each team's final score.
+
+Every other decision (who passed, which round trump was called in, who played each card) is
+implied by the rules, so a hand takes at most 48 bytes. Seats are indices into
+``Players.players``.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import typing
+
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import deck_from_deal
+from pyeuchre.bitboard import index_card
+from pyeuchre.bitboard import suit_index
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+from pyeuchre.game import Game
+from pyeuchre.game import Hand
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import Player
+
+
+MAGIC = b"PYEUREC\0"
+VERSION = 1
+HEADER = struct.Struct("<8sH")
+
+GAME = 1
+HAND = 2
+END = 3
+
+NO_CARD = 0xFF
+DEAL_SIZE = 24
+LEAD = 20
+
+
+class HandRecord(typing.NamedTuple):
+    """Everything needed to replay one hand."""
+
+    dealer: int
+    caller: int | None
+    trump: int | None
+    loner: bool
+    discard: int | None
+    deal: bytes
+    plays: bytes
+
+
+class GameRecord(typing.NamedTuple):
+    """Everything needed to replay one game."""
+
+    dealer: int
+    hands: list[HandRecord]
+    scores: tuple[int, int]
+
+
+def hand_record(hand: Hand) -> HandRecord:
+    """Build the record of a finished hand.
+
+    Args:
+        hand (Hand): Hand that has been played out (or thrown in).
+    """
+    seats = hand.players.players
+    called = hand.caller is not None
+    return HandRecord(
+        seats.index(hand.dealer),
+        seats.index(hand.caller) if called else None,
+        suit_index(hand.trump_suit) if called else None,
+        bool(hand.loner_player),
+        card_index(hand.discard) if hand.discard else None,
+        bytes(card_index(card) for card in hand.dealt),
+        bytes(card_index(entry["card"]) for trick in hand.tricks for entry in trick.cards),
+    )
+
+
+def encode_record(record: HandRecord) -> bytes:
+    """Encode a hand record as a HAND record.
+
+    Args:
+        record (HandRecord): Hand to encode.
+    """
+    flags = record.dealer
+    if record.caller is not None:
+        flags |= record.caller << 2 | typing.cast(int, record.trump) << 4 | record.loner << 6 | 1 << 7
+
+    discard = NO_CARD if record.discard is None else record.discard
+    return bytes((HAND, flags, discard)) + record.deal + bytes((len(record.plays),)) + record.plays
+
+
+class GameWriter(typing.Protocol):
+    """Anything that follows simulated games: told when each starts, after each hand and when each ends."""
+
+    def begin_game(self, game: Game) -> None:
+        """Start of a game, before its first hand is dealt."""
+
+    def write_hand(self, hand: Hand) -> None:
+        """A hand has been played out and scored."""
+
+    def end_game(self, game: Game) -> None:
+        """A game is over."""
+
+
+class RecordWriter:
+    """Append-only writer of game records, flushing in batches."""
+
+    def __init__(self, path: str | os.PathLike[str], buffer_size: int = 1 << 16) -> None:
+        """Open a record file for appending, writing the header if it is new.
+
+        Args:
+            path (PathLike): Record file.
+            buffer_size (int): Bytes to buffer before writing them out.
+        """
+        self._file = open(path, "ab")
+        self._buffer = bytearray()
+        self.buffer_size = buffer_size
+        if self._file.tell() == 0:
+            self._buffer += HEADER.pack(MAGIC, VERSION)
+
+    def __enter__(self) -> RecordWriter:
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Flush and close the writer."""
+        self.close()
+
+    def _write(self, data: bytes) -> None:
+        """Buffer data, flushing once the buffer is full."""
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def begin_game(self, game: Game) -> None:
+        """Record the start of a game, before its first hand is dealt."""
+        self._write(bytes((GAME, game.players.players.index(game.players.dealer))))
+
+    def write_hand(self, hand: Hand) -> None:
+        """Record a finished hand."""
+        self._write(encode_record(hand_record(hand)))
+
+    def end_game(self, game: Game) -> None:
+        """Record the final scores of a game."""
+        self._write(bytes((END, *(team.score for team in game.players.teams))))
+
+    def flush(self) -> None:
+        """Write out any buffered records."""
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self.flush()
+        self._file.close()
+
+
+class RecordReader:
+    """Memory-mapped reader of a record file."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a record file.
+
+        Args:
+            path (PathLike): Record file written by RecordWriter.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a compatible record file")
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    def __iter__(self) -> typing.Generator[GameRecord, None, None]:
+        """Yield every game in the file.
+
+        Raises:
+            ValueError: If a record is cut short or out of place, or the file ends partway through a game.
+        """
+        data = self._mmap
+        offset = HEADER.size
+        # Offset of the GAME record of the game being read, if any
+        start: int | None = None
+        dealer, hands = 0, []
+
+        while offset < len(data):
+            tag = data[offset]
+            if tag == GAME and start is None:
+                _check(data, offset, 2)
+                start, dealer, hands = offset, data[offset + 1], []
+                offset += 2
+            elif tag == HAND and start is not None:
+                record, offset = _read_hand(data, offset)
+                hands.append(record)
+            elif tag == END and start is not None:
+                _check(data, offset, 3)
+                yield GameRecord(dealer, hands, (data[offset + 1], data[offset + 2]))
+                start = None
+                offset += 3
+            else:
+                raise ValueError(f"corrupt record file at offset {offset}")
+
+        if start is not None:
+            raise ValueError(f"corrupt record file: game at offset {start} is incomplete")
+
+
+def _check(data: mmap.mmap, offset: int, size: int) -> None:
+    """Raise ValueError unless the file holds size bytes from offset."""
+    if offset + size > len(data):
+        raise ValueError(f"corrupt record file: record at offset {offset} is truncated")
+
+
+def _read_hand(data: mmap.mmap, offset: int) -> tuple[HandRecord, int]:
+    """Decode the HAND record at offset, returning it and the offset after it."""
+    _check(data, offset, 4 + DEAL_SIZE)
+    flags, discard = data[offset + 1], data[offset + 2]
+    deal = data[offset + 3 : offset + 3 + DEAL_SIZE]
+    count = data[offset + 3 + DEAL_SIZE]
+    _check(data, offset, 4 + DEAL_SIZE + count)
+    plays = data[offset + 4 + DEAL_SIZE : offset + 4 + DEAL_SIZE + count]
+
+    called = bool(flags >> 7)
+    record = HandRecord(
+        flags & 3,
+        flags >> 2 & 3 if called else None,
+        flags >> 4 & 3 if called else None,
+        bool(flags >> 6 & 1),
+        None if discard == NO_CARD else discard,
+        deal,
+        plays,
+    )
+    return record, offset + 4 + DEAL_SIZE + count
+
+
+class _Script:
+    """The recorded decisions of the hand being replayed, shared by every ReplayPlayer."""
+
+    def __init__(self) -> None:
+        self.record: HandRecord | None = None
+        self.plays: typing.Iterator[int] = iter(())
+
+    @property
+    def hand(self) -> HandRecord:
+        return typing.cast(HandRecord, self.record)
+
+
+class ReplayPlayer(Player):
+    """A player who repeats the decisions in a record."""
+
+    def __init__(self, name: str, seat: int, script: _Script) -> None:
+        """Initialize replay player.
+
+        Args:
+            name (str): Player's display name.
+            seat (int): Player's seat.
+            script (_Script): Recorded decisions shared by the table.
+        """
+        super().__init__(name)
+        self.seat = seat
+        self.script = script
+
+    def _is_caller(self, round_one: bool) -> bool:
+        record = self.script.hand
+        return record.caller == self.seat and (record.trump == record.deal[LEAD] // len(RANKS)) == round_one
+
+    def request_trump_call(self, hand: Hand) -> bool:
+        """Order up the lead card if that is what was recorded."""
+        return self._is_caller(True)
+
+    def request_trump_choose(self, hand: Hand) -> Suit | None:
+        """Choose the recorded trump suit if that is what was recorded."""
+        return SUITS[typing.cast(int, self.script.hand.trump)] if self._is_caller(False) else None
+
+    def request_loner(self, hand: Hand) -> bool:
+        """Go alone if that is what was recorded."""
+        return self.script.hand.loner
+
+    def request_replace_card(self, hand: Hand, card: Card) -> None:
+        """Discard the recorded card."""
+        discard = self.script.hand.discard
+        if discard is not None and discard != card_index(card):
+            self.cards[self.cards.index(index_card(discard))] = card
+
+    def request_play_card(self, hand: Hand) -> Card:
+        """Play the next recorded card."""
+        card = index_card(next(self.script.plays))
+        if card not in self.cards:
+            raise ValueError(f"record does not match replay: {self} does not hold {card}")
+        return card
+
+
+def replay(record: GameRecord) -> Game:
+    """Replay a recorded game through Game, Hand and Trick.
+
+    Args:
+        record (GameRecord): Game to replay.
+
+    Returns:
+        The finished game.
+    """
+    script = _Script()
+    seats = [ReplayPlayer(name, seat, script) for seat, name in enumerate(("North", "East", "South", "West"))]
+    players = Players((Team((seats[0], seats[2])), Team((seats[1], seats[3]))), dealer=record.dealer)
+
+    game = Game(players)
+    for hand in record.hands:
+        script.record = hand
+        script.plays = iter(hand.plays)
+        game.play_hand(deck_from_deal(hand.deal))
+
+    if tuple(team.score for team in players.teams) != record.scores:
+        raise ValueError("record does not match replay: final scores differ")
+    return game
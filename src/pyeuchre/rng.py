@@ -0,0 +1,118 @@
+"""Counter-based, jumpable random number streams.
+
+CounterRandom is a drop-in random.Random whose n-th 64-bit output is a pure function of its key
+and n (a SplitMix64 hash of their sum), rather than of everything drawn before. Streams derived
+from a key and a path (eg a game number, then a deal number) are independent of each other, so
+any game or deal of a seeded run can be regenerated directly without replaying the ones before it,
+and workers can generate disjoint slices of a run with no coordination.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import random
+import typing
+
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+LN2 = math.log(2)
+
+Seed = typing.Union[int, str, bytes, None]
+
+
+def mix(z: int) -> int:
+    """SplitMix64 finalizer: scramble a 64-bit int."""
+    z = (z ^ z >> 30) * 0xBF58476D1CE4E5B9 & MASK64
+    z = (z ^ z >> 27) * 0x94D049BB133111EB & MASK64
+    return z ^ z >> 31
+
+
+def derive(seed: Seed, *path: int | str) -> int:
+    """Derive a 64-bit key from a seed and a path of stream names or numbers.
+
+    Args:
+        seed (int): Master seed.
+        path (int): Stream names or numbers, outermost first.
+    """
+    digest = hashlib.blake2b(repr((seed, *path)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class CounterRandom(random.Random):
+    """A random.Random whose output n is mix(key + n * GOLDEN)."""
+
+    def __init__(self, seed: Seed = None, key: int | None = None) -> None:
+        """Initialize generator.
+
+        Args:
+            seed (int): Seed to derive the key from, or None for a random key.
+            key (int): 64-bit key to use directly instead of deriving one.
+        """
+        self.key = 0
+        self.counter = 0
+        super().__init__(seed)
+        if key is not None:
+            self.key = key & MASK64
+
+    def seed(self, a: typing.Any = None, version: int = 2) -> None:
+        """Derive the key from a seed (or randomly) and rewind to the start of the stream."""
+        self.key = derive(a) if a is not None else int.from_bytes(os.urandom(8), "little")
+        self.counter = 0
+        self.gauss_next = None
+
+    def getstate(self) -> tuple[int, int]:  # type: ignore[override]
+        """Return the key and counter."""
+        return self.key, self.counter
+
+    def setstate(self, state: tuple[int, int]) -> None:  # type: ignore[override]
+        """Restore a key and counter from getstate."""
+        self.key, self.counter = state
+        self.gauss_next = None
+
+    def _next(self) -> int:
+        """Return the next 64-bit output."""
+        z = mix((self.key + self.counter * GOLDEN) & MASK64)
+        self.counter += 1
+        return z
+
+    def random(self) -> float:
+        """Return the next float in [0, 1)."""
+        return (self._next() >> 11) * 2.0**-53
+
+    def getrandbits(self, k: int) -> int:
+        """Return an int with k random bits."""
+        if k <= 64:
+            return self._next() >> 64 - k if k else 0
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self._next() << shift
+        return bits & (1 << k) - 1
+
+    def shuffle(self, x: typing.MutableSequence[typing.Any]) -> None:  # type: ignore[override]
+        """Shuffle a sequence in place.
+
+        Draws log2(len(x)!) + 64 bits at once and reads the swaps off it in the factorial number system,
+        instead of drawing once per swap; the bias is below 2**-64.
+        """
+        n = len(x)
+        r = self.getrandbits(int(math.lgamma(n + 1) / LN2) + 65)
+        for i in range(n - 1, 0, -1):
+            r, j = divmod(r, i + 1)
+            x[i], x[j] = x[j], x[i]
+
+    def jump(self, n: int) -> None:
+        """Skip n outputs in O(1)."""
+        self.counter += n
+
+    def stream(self, *path: int | str) -> CounterRandom:
+        """Return the independent stream at a path below this generator's key.
+
+        The stream depends only on the key and the path, not on how much of this stream has been used.
+
+        Args:
+            path (int): Stream names or numbers, eg a game number.
+        """
+        return CounterRandom(key=derive(self.key, *path))
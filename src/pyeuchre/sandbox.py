@@ -0,0 +1,370 @@
+"""Out-of-process sandbox for untrusted bots.
+
+A SandboxedPlayer sits at a table like any other Player but forwards each decision to a bot living
+in a pooled worker process. The worker receives a compact view of the hand (see hand_view), rebuilds
+an equivalent Hand around its bot and returns the bot's answer. A bot that misses its deadline,
+crashes or answers illegally gets a fallback legal move in its place; dead or stuck workers are
+restarted. Workers stay warm across decisions and games, and each bot keeps its state between
+decisions as long as its worker lives.
+
+Worker messages are tuples sent over pipes:
+
+- ``("new", key, factory, name, seed)`` creates a bot; the reply is ``("ok", None)``.
+- ``("ask", key, hook, view, args)`` asks a bot for a decision; the reply is ``("ok", answer)``.
+- ``("drop", key)`` forgets a bot; there is no reply.
+
+Failures inside a worker are replied as ``("error", message)``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import random
+import typing
+from multiprocessing.connection import Connection
+
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import index_card
+from pyeuchre.bitboard import suit_index
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Deck
+from pyeuchre.cards import Suit
+from pyeuchre.game import Hand
+from pyeuchre.game import Trick
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import Bot
+from pyeuchre.people.players import Player
+
+
+SEATS = 4
+
+# Stored for fields with no value, eg the trump suit before trump is called
+NONE = 0xFF
+# Stored for the dealer's discard when another seat is looking
+HIDDEN = 0xFE
+
+BotFactory = typing.Callable[[str, random.Random], Bot]
+
+
+class HandView(typing.NamedTuple):
+    """What a player can see of a hand, as small integers and bytes."""
+
+    seat: int
+    dealer: int
+    leader: int
+    up: int
+    trump: int
+    caller: int
+    loner: bool
+    # Card index the dealer discarded on picking up: HIDDEN unless the player is the dealer, NONE if not picked up
+    discard: int
+    held: bytes
+    # Leader and cards of each trick started so far, the last one possibly still empty
+    tricks: tuple[tuple[int, bytes], ...]
+    taken: tuple[int, int]
+    scores: tuple[int, int]
+
+
+def hand_view(hand: Hand, player: Player) -> HandView:
+    """Build a player's view of a hand.
+
+    Args:
+        hand (Hand): Hand being played.
+        player (Player): Player whose view to build.
+    """
+    seats = hand.players.players
+    called = hand.caller is not None
+    if hand.discard is None:
+        discard = NONE
+    else:
+        discard = card_index(hand.discard) if hand.players.dealer is player else HIDDEN
+    return HandView(
+        seats.index(player),
+        seats.index(hand.players.dealer),
+        seats.index(hand.leader),
+        card_index(hand.lead),
+        suit_index(hand.trump_suit) if hand.trump_suit else NONE,
+        seats.index(hand.caller) if called else NONE,
+        bool(hand.loner_player),
+        discard,
+        bytes(card_index(card) for card in player.cards),
+        tuple(
+            (
+                seats.index(trick.cards[0]["player"] if trick.cards else hand.leader),
+                bytes(card_index(entry["card"]) for entry in trick.cards),
+            )
+            for trick in hand.tricks
+        ),
+        (hand.players.teams[0].tricks, hand.players.teams[1].tricks),
+        (hand.players.teams[0].score, hand.players.teams[1].score),
+    )
+
+
+def rebuild_hand(view: HandView, bot: Player) -> Hand:
+    """Rebuild a hand from a view, with the bot in its seat and the other seats holding no cards.
+
+    Args:
+        view (HandView): View of the hand.
+        bot (Player): Player to seat.
+    """
+    seats = [bot if seat == view.seat else Player(f"Seat {seat}") for seat in range(SEATS)]
+    players = Players((Team((seats[0], seats[2])), Team((seats[1], seats[3]))), dealer=view.dealer)
+    hand = Hand(players, deck=Deck(), shuffle_deck=False)
+    for seat, player in enumerate(seats):
+        player.cards = [index_card(i) for i in view.held] if seat == view.seat else []
+    for team, taken, score in zip(players.teams, view.taken, view.scores):
+        team.tricks, team.score = taken, score
+
+    hand.lead = index_card(view.up)
+    hand.leader = seats[view.leader]
+    if view.caller != NONE:
+        hand.caller = seats[view.caller]
+        hand.trump_team = players.get_team(hand.caller)
+        if view.loner:
+            hand.loner_player = hand.caller
+            players.get_partner(hand.caller).skip = True
+    if view.trump != NONE:
+        hand.trump_suit = SUITS[view.trump]
+    if view.discard != NONE:
+        # Other seats only know that the dealer discarded, so they see the lead card in its place
+        hand.discard = index_card(view.up if view.discard == HIDDEN else view.discard)
+
+    order = [player for player in seats if not player.skip]
+    for leader, plays in view.tricks:
+        trick = Trick(hand, typing.cast(Suit, hand.trump_suit))
+        for k, i in enumerate(plays):
+            trick.add(order[(order.index(seats[leader]) + k) % len(order)], index_card(i))
+        hand.tricks.append(trick)
+    hand.trick = hand.tricks[-1] if hand.tricks else None
+    return hand
+
+
+def _answer(bot: Player, hook: str, view: HandView, args: tuple[typing.Any, ...]) -> typing.Any:
+    """Ask a bot for a decision on a rebuilt hand, encoding cards and suits as indices."""
+    hand = rebuild_hand(view, bot)
+    if hook == "request_replace_card":
+        up = index_card(args[0])
+        held = [*bot.cards, up]
+        bot.request_replace_card(hand, up)
+        return next(card_index(card) for card in held if card not in bot.cards)
+
+    answer = getattr(bot, hook)(hand)
+    if isinstance(answer, Card):
+        return card_index(answer)
+    if isinstance(answer, Suit):
+        return suit_index(answer)
+    return answer
+
+
+def _work(conn: Connection) -> None:
+    """Worker process loop: host bots and answer for them until the pipe closes."""
+    bots: dict[int, Player] = {}
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+
+        kind, key = message[0], message[1]
+        if kind == "drop":
+            bots.pop(key, None)
+            continue
+
+        try:
+            if kind == "new":
+                factory, name, seed = message[2:]
+                bots[key] = factory(name, random.Random(seed))
+                reply: tuple[str, typing.Any] = ("ok", None)
+            else:
+                hook, view, args = message[2:]
+                reply = ("ok", _answer(bots[key], hook, view, args))
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    """A worker process and its end of the pipe."""
+
+    def __init__(self, context: typing.Any) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_work, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.bots: set[int] = set()
+
+    def kill(self) -> None:
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+
+
+class WorkerPool:
+    """A pool of warm worker processes hosting sandboxed bots."""
+
+    def __init__(self, workers: int = 2, timeout: float = 1.0, start_method: str | None = None) -> None:
+        """Start the workers.
+
+        Args:
+            workers (int): Number of worker processes.
+            timeout (float): Seconds a bot may take per decision.
+            start_method (str): Multiprocessing start method, defaulting to the platform's.
+        """
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = [_Worker(self._context) for _i in range(workers)]
+        self._keys = itertools.count()
+        self.restarts = 0
+
+    def __enter__(self) -> WorkerPool:
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop the workers."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers."""
+        for worker in self._workers:
+            worker.kill()
+
+    def register(self) -> tuple[int, int]:
+        """Allocate a key for a new bot and pin it to a worker, returning (key, worker)."""
+        key = next(self._keys)
+        return key, key % len(self._workers)
+
+    def _restart(self, index: int) -> None:
+        """Replace a dead or stuck worker, losing the bots it hosted."""
+        self._workers[index].kill()
+        self._workers[index] = _Worker(self._context)
+        self.restarts += 1
+
+    def _call(self, index: int, message: tuple[typing.Any, ...]) -> tuple[str, typing.Any]:
+        """Send a message to a worker and wait for its reply, restarting it if it fails to reply in time."""
+        worker = self._workers[index]
+        try:
+            worker.conn.send(message)
+            if worker.conn.poll(self.timeout):
+                return typing.cast(tuple[str, typing.Any], worker.conn.recv())
+            error = "timed out"
+        except (EOFError, OSError) as e:
+            error = f"worker died: {e}"
+        self._restart(index)
+        return "error", error
+
+    def ask(
+        self,
+        key: int,
+        index: int,
+        spawn: tuple[BotFactory, str, int],
+        hook: str,
+        view: HandView,
+        args: tuple[typing.Any, ...] = (),
+    ) -> tuple[str, typing.Any]:
+        """Ask a bot for a decision, creating it on its worker first if needed.
+
+        Args:
+            key (int): Bot key from register.
+            index (int): Worker the bot is pinned to.
+            spawn (tuple): Factory, name and seed to create the bot with.
+            hook (str): Player hook to call.
+            view (HandView): View of the hand.
+            args (tuple): Extra hook arguments, with cards as indices.
+
+        Returns:
+            ("ok", answer) or ("error", message).
+        """
+        if not self._workers[index].process.is_alive():
+            self._restart(index)
+
+        worker = self._workers[index]
+        if key not in worker.bots:
+            reply = self._call(index, ("new", key, *spawn))
+            if reply[0] != "ok":
+                return reply
+            worker.bots.add(key)
+
+        return self._call(index, ("ask", key, hook, view, args))
+
+    def drop(self, key: int, index: int) -> None:
+        """Forget a bot."""
+        worker = self._workers[index]
+        if key in worker.bots:
+            worker.bots.discard(key)
+            try:
+                worker.conn.send(("drop", key))
+            except OSError:
+                pass
+
+
+class SandboxedPlayer(Player):
+    """A player whose decisions are made by a bot in a worker process."""
+
+    def __init__(self, name: str, factory: BotFactory, pool: WorkerPool, seed: int | None = None) -> None:
+        """Initialize sandboxed player.
+
+        Args:
+            name (str): Player's display name.
+            factory (Callable): Picklable callable building the bot from a name and a random number generator, eg a Bot subclass.
+            pool (WorkerPool): Pool to host the bot in.
+            seed (int): Seed for the bot's random number generator.
+        """
+        super().__init__(name)
+        self.pool = pool
+        self.spawn = (factory, name, random.randrange(1 << 32) if seed is None else seed)
+        self.key, self.worker = pool.register()
+        self.errors: list[str] = []
+
+    def close(self) -> None:
+        """Release the bot from its worker."""
+        self.pool.drop(self.key, self.worker)
+
+    def _ask(self, hand: Hand, hook: str, *args: typing.Any) -> typing.Any:
+        """Ask the bot for a decision, returning None (and recording why) on failure."""
+        status, answer = self.pool.ask(self.key, self.worker, self.spawn, hook, hand_view(hand, self), args)
+        if status != "ok":
+            self.errors.append(f"{hook}: {answer}")
+            return None
+        return answer
+
+    def request_trump_call(self, hand: Hand) -> bool:
+        """Ask the bot whether to order up the lead card, passing on failure."""
+        return self._ask(hand, "request_trump_call") is True
+
+    def request_trump_choose(self, hand: Hand) -> Suit | None:
+        """Ask the bot for a trump suit, falling back to passing (or the first legal suit for the dealer)."""
+        choices = [suit for suit in SUITS if suit != hand.lead.suit]
+        answer = self._ask(hand, "request_trump_choose")
+        if isinstance(answer, int) and 0 <= answer < len(SUITS) and SUITS[answer] in choices:
+            return SUITS[answer]
+        if answer is not None:
+            self.errors.append(f"request_trump_choose: illegal answer {answer!r}")
+        return choices[0] if hand.players.dealer is self else None
+
+    def request_loner(self, hand: Hand) -> bool:
+        """Ask the bot whether to go alone, declining on failure."""
+        return self._ask(hand, "request_loner") is True
+
+    def request_replace_card(self, hand: Hand, card: Card) -> None:
+        """Ask the bot which card to discard for the lead card, keeping the hand on failure."""
+        answer = self._ask(hand, "request_replace_card", card_index(card))
+        held = [card_index(held) for held in self.cards]
+        if answer in held:
+            self.cards[held.index(answer)] = card
+        elif answer is not None and answer != card_index(card):
+            self.errors.append(f"request_replace_card: illegal answer {answer!r}")
+
+    def request_play_card(self, hand: Hand) -> Card:
+        """Ask the bot for a card, falling back to the first legal card."""
+        legal = self.legal_cards(hand)
+        answer = self._ask(hand, "request_play_card")
+        for card in legal:
+            if card_index(card) == answer:
+                return card
+        if answer is not None:
+            self.errors.append(f"request_play_card: illegal answer {answer!r}")
+        return legal[0]
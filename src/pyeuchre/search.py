@@ -0,0 +1,259 @@
+"""Compact state of the trick-play phase for tree search.
+
+A SearchState holds only what play needs (each seat's cards as a mask, the trick so far, the
+leader, trump, the sitting-out seat and tricks won) in a handful of ints and tuples. Moves are card
+indices. apply records what it changed on a shared, immutable undo chain, so undo is O(1) and
+clone copies a fixed number of fields however many moves have been played.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import EFFECTIVE_SUIT_MASKS
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import index_card
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import suit_index
+from pyeuchre.bitboard import to_mask
+from pyeuchre.cards import SUITS
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.game import Trick
+
+
+SEATS = 4
+HAND_SIZE = 5
+
+# Strength of every card within its own effective suit, keyed by [trump][card index]
+VALUE = [
+    [STRENGTH[t][EFFECTIVE_SUIT[t][i]][i] for i in range(CARD_COUNT)]
+    for t in range(len(SUITS))
+]
+
+# An undo record: seat, card, then the leader, trick, led suit, best strength, winner and tricks before the move, and
+# the previous record
+_Undo = tuple[int, int, int, tuple[int, ...], int, int, int, tuple[int, int], typing.Any]
+
+
+class SearchState:
+    """Fully determined state of the trick-play phase, with apply, undo and clone."""
+
+    __slots__ = ("hands", "trump", "makers", "skip", "leader", "trick", "tricks", "led", "best", "winner", "_undo")
+
+    def __init__(
+        self,
+        hands: typing.Sequence[int],
+        trump: int,
+        makers: int,
+        leader: int,
+        skip: int | None = None,
+        tricks: typing.Sequence[int] = (0, 0),
+        played: typing.Sequence[int] = (),
+    ) -> None:
+        """Initialize search state.
+
+        Args:
+            hands (Sequence): Mask of the cards each seat holds.
+            trump (int): Trump suit index.
+            makers (int): Team index (seat parity) of the makers.
+            leader (int): Seat leading the current trick.
+            skip (int): Seat sitting out because their partner went alone.
+            tricks (Sequence): Tricks won so far by each team.
+            played (Sequence): Card indices already played to the current trick.
+        """
+        self.hands = list(hands)
+        self.trump = trump
+        self.makers = makers
+        self.skip = skip
+        self.leader = self._next(leader - 1)
+        self.tricks: tuple[int, int] = (tricks[0], tricks[1])
+        self.trick: tuple[int, ...] = ()
+        self.led = -1
+        self.best = -1
+        self.winner = -1
+        self._undo: _Undo | None = None
+
+        for card in played:
+            self._add(card)
+
+    @classmethod
+    def from_hand(cls, hand: Hand) -> SearchState:
+        """Derive the state of a live hand, once trump has been called.
+
+        Seats are indices into hand.players.players.
+
+        Args:
+            hand (Hand): Hand being played.
+        """
+        seats = hand.players.players
+        trick = hand.trick
+        played = [] if not trick or trick.complete else [card_index(entry["card"]) for entry in trick.cards]
+        leader = seats.index(trick.cards[0]["player"] if played else hand.leader)
+        return cls(
+            [to_mask(player.cards) for player in seats],
+            suit_index(hand.trump_suit),
+            seats.index(hand.caller) & 1,
+            leader,
+            next((seat for seat, player in enumerate(seats) if player.skip), None),
+            [team.tricks for team in hand.players.teams],
+            played,
+        )
+
+    def clone(self) -> SearchState:
+        """Return an independent copy of this state, sharing its undo history."""
+        state = SearchState.__new__(SearchState)
+        state.hands = self.hands[:]
+        state.trump = self.trump
+        state.makers = self.makers
+        state.skip = self.skip
+        state.leader = self.leader
+        state.tricks = self.tricks
+        state.trick = self.trick
+        state.led = self.led
+        state.best = self.best
+        state.winner = self.winner
+        state._undo = self._undo
+        return state
+
+    def _next(self, seat: int) -> int:
+        """Return the next seat to play after seat."""
+        seat = (seat + 1) % SEATS
+        return (seat + 1) % SEATS if seat == self.skip else seat
+
+    @property
+    def seat(self) -> int:
+        """Seat to play next."""
+        seat = self.leader
+        for _card in self.trick:
+            seat = self._next(seat)
+        return seat
+
+    @property
+    def terminal(self) -> bool:
+        """Whether every card has been played."""
+        return not self.hands[self.leader] and not self.trick
+
+    @property
+    def depth(self) -> int:
+        """Number of moves that can be undone."""
+        depth, undo = 0, self._undo
+        while undo is not None:
+            depth, undo = depth + 1, undo[-1]
+        return depth
+
+    def legal(self) -> int:
+        """Return the mask of cards the seat to play may play."""
+        hand = self.hands[self.seat]
+        if not self.trick:
+            return hand
+        return hand & EFFECTIVE_SUIT_MASKS[self.trump][self.led] or hand
+
+    def moves(self) -> list[int]:
+        """Return the card indices the seat to play may play."""
+        return list(indices(self.legal()))
+
+    def _add(self, card: int) -> None:
+        """Add a card to the current trick, updating the winner."""
+        seat = self.seat
+        if not self.trick:
+            self.led = EFFECTIVE_SUIT[self.trump][card]
+        strength = STRENGTH[self.trump][self.led][card]
+        if strength > self.best:
+            self.best, self.winner = strength, seat
+        self.trick += (card,)
+
+    def apply(self, card: int) -> None:
+        """Play a card for the seat to play, completing the trick if it is the last card.
+
+        Args:
+            card (int): Card index to play.
+        """
+        seat = self.seat
+        self._undo = (seat, card, self.leader, self.trick, self.led, self.best, self.winner, self.tricks, self._undo)
+        self.hands[seat] ^= 1 << card
+        self._add(card)
+
+        if len(self.trick) == (SEATS if self.skip is None else SEATS - 1):
+            tricks = list(self.tricks)
+            tricks[self.winner & 1] += 1
+            self.tricks = (tricks[0], tricks[1])
+            self.leader = self.winner
+            self.trick = ()
+            self.led = self.best = self.winner = -1
+
+    def undo(self) -> int:
+        """Take back the last move applied, returning its card index.
+
+        Raises:
+            IndexError: If there is no move to undo.
+        """
+        if self._undo is None:
+            raise IndexError("no move to undo")
+        seat, card, self.leader, self.trick, self.led, self.best, self.winner, self.tricks, self._undo = self._undo
+        self.hands[seat] |= 1 << card
+        return card
+
+    def history(self) -> list[tuple[int, int]]:
+        """Return the (seat, card index) of each move that can be undone, oldest first."""
+        moves, undo = [], self._undo
+        while undo is not None:
+            moves.append((undo[0], undo[1]))
+            undo = undo[-1]
+        return moves[::-1]
+
+    def points(self, team: int) -> int:
+        """Return the points a team scores for the finished hand, negative if the other team scores.
+
+        Args:
+            team (int): Team index (seat parity).
+        """
+        taken = self.tricks[self.makers]
+        if taken == HAND_SIZE:
+            points = 4 if self.skip is not None else 2
+        elif taken >= 3:
+            points = 1
+        else:
+            points = -2
+        return points if team == self.makers else -points
+
+    def greedy(self) -> int:
+        """Return a quick heuristic move: lead high, win as cheaply as possible, otherwise throw low."""
+        legal = list(indices(self.legal()))
+        value = VALUE[self.trump]
+
+        if not self.trick:
+            return max(legal, key=value.__getitem__)
+
+        strength = STRENGTH[self.trump][self.led]
+        if self.winner & 1 != self.seat & 1:
+            winners = [card for card in legal if strength[card] > self.best]
+            if winners:
+                return min(winners, key=strength.__getitem__)
+        return min(legal, key=value.__getitem__)
+
+    def apply_to(self, hand: Hand) -> None:
+        """Play the moves in this state's undo history into the live hand it was derived from.
+
+        Cards go through Trick.play_card, so the hand's rules are checked and CardPlayed and TrickWon
+        are emitted as in a played hand.
+
+        Args:
+            hand (Hand): Hand this state (or the state it was cloned from) was derived from with from_hand.
+        """
+        seats = hand.players.players
+        for seat, card in self.history():
+            trick = hand.trick
+            if trick is None or trick.complete:
+                hand.start_trick()
+                trick = hand.trick
+            trick = typing.cast("Trick", trick)
+            trick.play_card(seats[seat], index_card(card))
+            if trick.complete:
+                trick.award()
@@ -0,0 +1,333 @@
+"""Asyncio game server: many tables on one event loop, with bots and remote players.
+
+Each table is a coroutine playing a Game through the players' awaitable hooks, so a table waiting
+on a remote player costs only its memory. Remote players connect over TCP or a Unix socket and
+speak JSON lines:
+
+- The client sends ``{"name": ..., "table": ..., "humans": ...}``. Clients naming the same table
+  share it once ``humans`` of them have joined; without a table name the client plays alone. Empty
+  seats are filled with bots. A join with ``humans`` that is not a whole number gets
+  ``{"type": "error", ...}`` and the connection is closed.
+- The server sends ``{"type": "seat", "table": ..., "seat": ...}``, then for each decision a
+  ``{"type": "prompt", "request": ..., "choices": [...], ...}`` which the client answers with
+  ``{"answer": ...}`` (one of the choices). Invalid answers get ``{"type": "error", ...}`` and the
+  prompt again.
+- After each hand the server sends ``{"type": "hand", "scores": [...]}``, and ``{"type": "end", ...}``
+  when the game is over or ``{"type": "abandoned"}`` if a remote player left.
+
+Cards are written as rank then suit, eg ``"10h"`` or ``"jd"``; suits as their short letter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+import typing
+
+from pyeuchre.cards import SUITS
+from pyeuchre.cards import Card
+from pyeuchre.cards import Suit
+from pyeuchre.game import Game
+from pyeuchre.game import Hand
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import Player
+from pyeuchre.people.players import RandomBot
+from pyeuchre.sim import GameResult
+from pyeuchre.sim import random_players
+
+
+SEATS = 4
+NAMES = ("North", "East", "South", "West")
+
+Choice = typing.Union[bool, str, None]
+
+
+def encode_card(card: Card) -> str:
+    """Encode a card for the protocol, eg "10h"."""
+    return card.rank.short + card.suit.short
+
+
+def _state(hand: Hand, player: Player) -> dict[str, typing.Any]:
+    """The part of a hand a player can see, for a prompt."""
+    seats = hand.players.players
+    trick = hand.trick
+    return {
+        "seat": seats.index(player),
+        "dealer": seats.index(hand.dealer),
+        "up": encode_card(hand.lead),
+        "trump": hand.trump_suit.short if hand.trump_suit else None,
+        "cards": [encode_card(card) for card in player.cards],
+        "trick": [[seats.index(entry["player"]), encode_card(entry["card"])] for entry in trick.cards] if trick else [],
+        "scores": [team.score for team in hand.players.teams],
+    }
+
+
+class RemotePlayer(Player):
+    """A player deciding over a JSON-lines stream."""
+
+    def __init__(
+        self,
+        name: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        timeout: float | None = None,
+    ) -> None:
+        """Initialize remote player.
+
+        Args:
+            name (str): Player's display name.
+            reader (StreamReader): Stream the player's answers arrive on.
+            writer (StreamWriter): Stream to send prompts to.
+            timeout (float): Seconds to wait for an answer before giving up on the player.
+        """
+        super().__init__(name)
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+
+    async def send(self, message: dict[str, typing.Any]) -> None:
+        """Send a message to the player."""
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self) -> dict[str, typing.Any]:
+        """Wait for the player's next message.
+
+        Raises:
+            ConnectionResetError: If the player disconnected.
+        """
+        line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionResetError(f"{self} disconnected")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            return {}
+        return message if isinstance(message, dict) else {}
+
+    async def ask(self, request: str, hand: Hand, choices: list[Choice], **extra: typing.Any) -> Choice:
+        """Prompt the player until they answer with one of the choices.
+
+        Args:
+            request (str): Decision being asked for.
+            hand (Hand): Hand being played.
+            choices (list): Valid answers.
+            extra: Other fields to send with the prompt.
+        """
+        prompt = {"type": "prompt", "request": request, "choices": choices, **_state(hand, self), **extra}
+        while True:
+            await self.send(prompt)
+            answer = (await self.receive()).get("answer", ...)
+            if answer in choices:
+                return answer
+            await self.send({"type": "error", "message": f"answer must be one of {choices}"})
+
+    def _card(self, code: Choice) -> Card:
+        """Return the held card with a protocol code."""
+        return next(card for card in self.cards if encode_card(card) == code)
+
+    async def arequest_trump_call(self, hand: Hand) -> bool:
+        """Ask whether to order up the lead card."""
+        return bool(await self.ask("trump_call", hand, [True, False]))
+
+    async def arequest_trump_choose(self, hand: Hand) -> Suit | None:
+        """Ask which suit to call, if any."""
+        choices: list[Choice] = [suit.short for suit in SUITS if suit != hand.lead.suit]
+        if hand.players.dealer is not self:
+            choices.append(None)
+        answer = await self.ask("trump_choose", hand, choices)
+        return next((suit for suit in SUITS if suit.short == answer), None)
+
+    async def arequest_loner(self, hand: Hand) -> bool:
+        """Ask whether to go alone."""
+        return bool(await self.ask("loner", hand, [True, False]))
+
+    async def arequest_replace_card(self, hand: Hand, card: Card) -> None:
+        """Ask which card to discard for the lead card (discarding the lead card keeps the hand)."""
+        up = encode_card(card)
+        answer = await self.ask("replace_card", hand, [*(encode_card(held) for held in self.cards), up], card=up)
+        if answer != up:
+            self.cards[self.cards.index(self._card(answer))] = card
+
+    async def arequest_play_card(self, hand: Hand) -> Card:
+        """Ask which legal card to play."""
+        legal = [encode_card(card) for card in self.legal_cards(hand)]
+        return self._card(await self.ask("play_card", hand, legal))
+
+
+async def _notify(players: Players, message: dict[str, typing.Any]) -> None:
+    """Send a message to every remote player at a table, ignoring any that have gone."""
+    for player in players:
+        if isinstance(player, RemotePlayer):
+            try:
+                await player.send(message)
+            except ConnectionError:
+                pass
+
+
+async def play_table(players: Players, rng: random.Random | None = None) -> GameResult:
+    """Play a game to completion on the running event loop.
+
+    The table yields to the loop between hands, so tables of bots alone still take turns.
+
+    Args:
+        players (Players): Players to play the game with.
+        rng (Random): Random number generator used to shuffle each hand's deck.
+    """
+    for team in players.teams:
+        team.score = 0
+
+    game = Game(players, rng=rng)
+    hands = 0
+    while game.active:
+        await game.aplay_hand()
+        hands += 1
+        await _notify(players, {"type": "hand", "scores": [team.score for team in players.teams]})
+        await asyncio.sleep(0)
+
+    first, second = (team.score for team in players.teams)
+    await _notify(players, {"type": "end", "scores": [first, second]})
+    return GameResult((first, second), 0 if first > second else 1, hands)
+
+
+async def run_tables(
+    tables: int,
+    seed: int | None = None,
+    players: typing.Callable[[random.Random], Players] = random_players,
+) -> list[GameResult]:
+    """Play a number of tables concurrently on the running event loop.
+
+    Args:
+        tables (int): Number of tables.
+        seed (int): Seed for each table's dealing and players.
+        players (Callable): Builds a table's players from its random number generator.
+    """
+    rngs = [random.Random(f"{seed}:{table}") for table in range(tables)]
+    return list(await asyncio.gather(*(play_table(players(rng), rng) for rng in rngs)))
+
+
+def _parse_join(join: dict[str, typing.Any]) -> tuple[str | None, int]:
+    """Return the table name and number of humans a join message asks for.
+
+    Raises:
+        ValueError: If humans is not an integer.
+    """
+    name = join.get("table")
+    humans = join.get("humans", 1)
+    if not isinstance(humans, int) or isinstance(humans, bool):
+        raise ValueError("humans must be an integer")
+    return (str(name), max(1, min(SEATS, humans))) if name else (None, 1)
+
+
+class _Table:
+    """A table waiting for its remote players to join."""
+
+    def __init__(self, name: str, humans: int) -> None:
+        self.name = name
+        self.humans = humans
+        self.players: list[Player] = []
+        self.done = asyncio.Event()
+
+
+class GameServer:
+    """Hosts tables for remote players on one event loop."""
+
+    def __init__(
+        self,
+        bots: typing.Callable[[str, random.Random], Player] = RandomBot,
+        seed: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Initialize game server.
+
+        Args:
+            bots (Callable): Builds a bot for an empty seat from its name and a random number generator.
+            seed (int): Seed for dealing and bots.
+            timeout (float): Seconds to wait for a remote player's answer before abandoning their table.
+        """
+        self.bots = bots
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.tables: dict[str, _Table] = {}
+        self.results: list[GameResult] = []
+        self._ids = itertools.count()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Listen on a local TCP port (0 picks a free one)."""
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Listen on a Unix socket."""
+        return await asyncio.start_unix_server(self.handle, path)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Seat a connecting player, then wait for their table to finish."""
+        player = RemotePlayer("", reader, writer, self.timeout)
+        try:
+            join = await player.receive()
+            player.name = str(join.get("name") or "Player")
+            try:
+                table_name, humans = _parse_join(join)
+            except ValueError as error:
+                await player.send({"type": "error", "message": str(error)})
+                return
+            name = table_name or f"table-{next(self._ids)}"
+
+            table = self.tables.setdefault(name, _Table(name, humans))
+            await player.send({"type": "seat", "table": name, "seat": len(table.players)})
+            table.players.append(player)
+            if len(table.players) == table.humans:
+                del self.tables[name]
+                task = asyncio.create_task(self._play(table))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            await table.done.wait()
+        except (ConnectionError, ValueError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _play(self, table: _Table) -> None:
+        """Fill a table's empty seats with bots and play its game."""
+        rng = random.Random(self.rng.getrandbits(64))
+        seats = [*table.players]
+        seats += [self.bots(NAMES[seat], rng) for seat in range(len(seats), SEATS)]
+        players = Players((Team((seats[0], seats[2])), Team((seats[1], seats[3]))))
+        try:
+            self.results.append(await play_table(players, rng))
+        except (ConnectionError, asyncio.TimeoutError):
+            await _notify(players, {"type": "abandoned"})
+        finally:
+            table.done.set()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8023, path: str | None = None) -> None:
+    """Run a game server until cancelled.
+
+    Args:
+        host (str): Host to listen on.
+        port (int): TCP port to listen on.
+        path (str): Unix socket to listen on instead of TCP.
+    """
+    game_server = GameServer()
+    server = await (game_server.start_unix(path) if path else game_server.start_tcp(host, port))
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Play a thousand concurrent tables of bots on one event loop and report throughput."""
+    loop = asyncio.new_event_loop()
+    start = loop.time()
+    results = loop.run_until_complete(run_tables(1000, seed=0))
+    elapsed = loop.time() - start
+    loop.close()
+    print(f"{len(results)} concurrent tables in {elapsed:.2f}s ({len(results) / elapsed:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Headless simulation of complete games between bots.
+
+play_game drives the full Game/Hand/Trick engine, so any Player implementations can sit at the
+table. For throughput runs between random bots, play_random_game plays whole games on card masks
+(see bitboard) with the same decision probabilities as RandomBot, skipping the object engine
+entirely; simulate_random runs it back to back. playouts plays the same games in numpy batches
+for tens of thousands of games a second.
+"""
+
+import random
+import time
+import typing
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.bitboard import legal_mask
+from pyeuchre.cards import RANKS
+from pyeuchre.cards import SUITS
+from pyeuchre.game import Game
+from pyeuchre.game import Hand
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import RandomBot
+from pyeuchre.records import GameWriter
+from pyeuchre.rng import CounterRandom
+from pyeuchre.rng import derive
+
+
+class GameResult(typing.NamedTuple):
+    """Outcome of a single simulated game."""
+
+    scores: tuple[int, int]
+    winner: int
+    hands: int
+
+
+class SimulationResult(typing.NamedTuple):
+    """Outcome of a batch of simulated games."""
+
+    results: list[GameResult]
+    elapsed: float
+
+    @property
+    def games_per_second(self) -> float:
+        """Number of games simulated per second of wall-clock time."""
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def wins(self) -> tuple[int, int]:
+        """Number of games won by each team."""
+        first = sum(result.winner == 0 for result in self.results)
+        return first, len(self.results) - first
+
+
+def random_players(rng: random.Random | None = None) -> Players:
+    """Build a table of four RandomBots.
+
+    Args:
+        rng (Random): Random number generator shared by the bots.
+    """
+    return Players(
+        (
+            Team((RandomBot("North", rng), RandomBot("South", rng))),
+            Team((RandomBot("East", rng), RandomBot("West", rng))),
+        )
+    )
+
+
+def play_game(
+    players: Players,
+    rng: random.Random | None = None,
+    writer: GameWriter | None = None,
+) -> GameResult:
+    """Play a game to completion without any input or output.
+
+    Team scores are reset first, so the same Players may be reused across games.
+
+    Args:
+        players (Players): Players to play the game with, who must not require input.
+        rng (Random): Random number generator used to shuffle each hand's deck.
+        writer (GameWriter): Writer to record the game with, eg a RecordWriter.
+    """
+    for team in players.teams:
+        team.score = 0
+
+    game = Game(players, rng=rng)
+    if writer:
+        writer.begin_game(game)
+
+    hands = 0
+    while game.active:
+        game.play_hand()
+        hands += 1
+        if writer:
+            writer.write_hand(typing.cast(Hand, game.hand))
+
+    if writer:
+        writer.end_game(game)
+
+    first, second = (team.score for team in players.teams)
+    return GameResult((first, second), 0 if first > second else 1, hands)
+
+
+def game_rng(seed: int | None, game: int) -> CounterRandom:
+    """Return the random number stream for game number game of a seeded run.
+
+    Args:
+        seed (int): Master seed of the run.
+        game (int): Game number.
+    """
+    return CounterRandom(seed).stream(game)
+
+
+def play_seeded(
+    seed: int | None,
+    game: int,
+    players: typing.Callable[[random.Random], Players] | Players = random_players,
+    writer: GameWriter | None = None,
+) -> GameResult:
+    """Play game number game of a seeded run, independently of every other game.
+
+    Args:
+        seed (int): Master seed of the run.
+        game (int): Game number.
+        players (Callable): Factory building the table from the game's bot generator, or a table to reuse as is.
+        writer (GameWriter): Writer to record the game with, eg a RecordWriter.
+    """
+    rng = game_rng(seed, game)
+    if not isinstance(players, Players):
+        # Bots draw far more often than the dealer, so they get a (faster) Mersenne Twister seeded from the game's
+        # stream rather than a CounterRandom
+        players = players(random.Random(derive(rng.key, "bots")))
+    return play_game(players, rng, writer)
+
+
+def simulate(
+    games: int,
+    players: typing.Callable[[random.Random], Players] | Players = random_players,
+    seed: int | None = None,
+    writer: GameWriter | None = None,
+) -> SimulationResult:
+    """Play a number of games back to back.
+
+    Every game draws from its own stream of the seed (see play_seeded), so with a table factory any game of the
+    run can be reproduced alone. A table passed as is keeps its bots' random number generators across games.
+
+    Args:
+        games (int): Number of games to play.
+        players (Callable): Factory building each game's table from its bot generator, or a table to use for every game.
+        seed (int): Master seed for dealing and for the tables' bots.
+        writer (GameWriter): Writer to record the games with, eg a RecordWriter.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    start = time.perf_counter()
+    results = [play_seeded(seed, game, players, writer) for game in range(games)]
+    return SimulationResult(results, time.perf_counter() - start)
+
+
+SEATS = 4
+HAND_SIZE = 5
+WINNING_SCORE = 10
+
+
+def _nth_card(mask: int, n: int) -> int:
+    """Return the card index of the nth lowest card in a mask."""
+    for _i in range(n):
+        mask &= mask - 1
+    return (mask & -mask).bit_length() - 1
+
+
+def _random_card(mask: int, draw: typing.Callable[[], float]) -> int:
+    """Return a uniformly random card index from a mask, given a draw in [0, 1)."""
+    return _nth_card(mask, int(draw() * mask.bit_count()))
+
+
+def _random_bid(hands: list[int], up: int, dealer: int, rng: random.Random) -> tuple[int, int] | None:
+    """Bid a hand between random bots, picking the lead card up for the dealer if it is ordered up.
+
+    Returns:
+        The caller's seat and the trump suit index, or None if every seat passed twice.
+    """
+    up_suit = up // len(RANKS)
+    for k in range(1, SEATS + 1):
+        seat = (dealer + k) % SEATS
+        if rng.random() < RandomBot.call_probability:
+            # The dealer picks the lead card up and discards any of their six cards
+            held = hands[dealer] | 1 << up
+            hands[dealer] = held ^ 1 << _nth_card(held, rng.randrange(HAND_SIZE + 1))
+            return seat, up_suit
+
+    others = [suit for suit in range(len(SUITS)) if suit != up_suit]
+    for k in range(1, SEATS + 1):
+        seat = (dealer + k) % SEATS
+        # Passing is a choice for everyone but the dealer
+        choice = rng.randrange(len(others) + (seat != dealer))
+        if choice < len(others):
+            return seat, others[choice]
+    return None
+
+
+def _random_tricks(hands: list[int], trump: int, leader: int, skip: int | None, rng: random.Random) -> list[int]:
+    """Play out a hand between random bots on card masks.
+
+    Returns:
+        The tricks each team (seat parity) took.
+    """
+    order = [seat for seat in range(SEATS) if seat != skip]
+    effective, strength = EFFECTIVE_SUIT[trump], STRENGTH[trump]
+    if leader == skip:
+        leader = (leader + 1) % SEATS
+    tricks = [0, 0]
+    draw = rng.random
+    for _trick in range(HAND_SIZE):
+        start = order.index(leader)
+        card = _random_card(hands[leader], draw)
+        hands[leader] ^= 1 << card
+        led = effective[card]
+        ranks = strength[led]
+        best, winner = ranks[card], leader
+        for seat in order[start + 1 :] + order[:start]:
+            card = _random_card(legal_mask(hands[seat], led, trump), draw)
+            hands[seat] ^= 1 << card
+            if ranks[card] > best:
+                best, winner = ranks[card], seat
+        tricks[winner & 1] += 1
+        leader = winner
+    return tricks
+
+
+def _random_hand(dealer: int, rng: random.Random) -> tuple[int, int] | None:
+    """Deal, bid and play one hand between random bots on card masks.
+
+    Returns:
+        The team (seat parity) awarded points and the number of points, or None if the hand was thrown in.
+    """
+    deck = list(range(CARD_COUNT))
+    rng.shuffle(deck)
+    hands = [0] * SEATS
+    for seat in range(SEATS):
+        for card in deck[seat * HAND_SIZE : (seat + 1) * HAND_SIZE]:
+            hands[seat] |= 1 << card
+
+    bid = _random_bid(hands, deck[SEATS * HAND_SIZE], dealer, rng)
+    if bid is None:
+        return None
+    caller, trump = bid
+    alone = rng.random() < RandomBot.loner_probability
+    tricks = _random_tricks(hands, trump, (dealer + 1) % SEATS, (caller + 2) % SEATS if alone else None, rng)
+
+    makers = caller & 1
+    if tricks[makers] == HAND_SIZE:
+        return makers, 4 if alone else 2
+    if tricks[makers] >= 3:
+        return makers, 1
+    return makers ^ 1, 2
+
+
+def play_random_game(rng: random.Random | None = None) -> GameResult:
+    """Play a game between four random bots on card masks, without the Game/Hand/Trick engine.
+
+    Every decision is drawn with RandomBot's probabilities, so results follow the same distribution as play_game
+    with random_players (though a seed does not replay the same games). Seats are numbered as in Players, with
+    seat 0 dealing first.
+
+    Args:
+        rng (Random): Random number generator for dealing and for the bots.
+    """
+    rng = rng or random.Random()
+    scores = [0, 0]
+    dealer = hands = 0
+    while max(scores) < WINNING_SCORE:
+        result = _random_hand(dealer, rng)
+        if result:
+            scores[result[0]] += result[1]
+        dealer = (dealer + 1) % SEATS
+        hands += 1
+    return GameResult((scores[0], scores[1]), 0 if scores[0] > scores[1] else 1, hands)
+
+
+def simulate_random(games: int, seed: int | None = None) -> SimulationResult:
+    """Play a number of games between random bots back to back with play_random_game.
+
+    Args:
+        games (int): Number of games to play.
+        seed (int): Seed for dealing and for the bots.
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    results = [play_random_game(rng) for _game in range(games)]
+    return SimulationResult(results, time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run a quick simulation with each engine and report throughput."""
+    for name, result in (("game engine", simulate(1000, seed=0)), ("mask engine", simulate_random(10000, seed=0))):
+        print(
+            f"{name}: {len(result.results)} games in {result.elapsed:.2f}s ({result.games_per_second:.0f} games/s), "
+            f"wins {result.wins}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Double-dummy solver for the trick-play phase of a hand.
+
+Given every player's cards, the solver finds how many tricks the makers take with perfect
+play by both teams. Seats are indices into ``Players.players``, so a seat's team is its
+parity, and hands are bitboard masks. Given an endgame tablebase (see tablebase), the search
+stops at its horizon and reads the exact result instead.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from pyeuchre.bitboard import EFFECTIVE_SUIT
+from pyeuchre.bitboard import EFFECTIVE_SUIT_MASKS
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import suit_index
+from pyeuchre.bitboard import to_mask
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.tablebase import Tablebase
+
+
+SEATS = 4
+
+
+class Solver:
+    """Alpha-beta search over the remaining tricks of a hand, with a bounded transposition table."""
+
+    def __init__(
+        self,
+        trump: int,
+        makers: int,
+        skip: int | None = None,
+        max_entries: int = 1 << 20,
+        tablebase: Tablebase | None = None,
+    ) -> None:
+        """Initialize solver.
+
+        Args:
+            trump (int): Trump suit index.
+            makers (int): Team index (seat parity) of the makers.
+            skip (int): Seat sitting out because their partner went alone.
+            max_entries (int): Transposition table entries kept before it is cleared.
+            tablebase (Tablebase): Endgame tablebase to read positions within its horizon from.
+        """
+        self.trump = trump
+        self.makers = makers
+        self.skip = skip
+        self.max_entries = max_entries
+        self.tablebase = tablebase
+        self.horizon = tablebase.max_cards if tablebase else 0
+        self.table: dict[tuple[int, ...], tuple[int, int]] = {}
+        self.nodes = 0
+
+        self._orders = [
+            [(leader + k) % SEATS for k in range(SEATS) if (leader + k) % SEATS != skip]
+            for leader in range(SEATS)
+        ]
+        self._follow = EFFECTIVE_SUIT_MASKS[trump]
+        self._suit = EFFECTIVE_SUIT[trump]
+        self._strength = STRENGTH[trump]
+        # Cards of each effective suit, strongest first
+        self._ranked = [
+            sorted(indices(self._follow[suit]), key=lambda i, s=suit: -self._strength[s][i])
+            for suit in range(SEATS)
+        ]
+
+    def solve(
+        self,
+        hands: typing.Sequence[int],
+        leader: int,
+        played: typing.Sequence[int] = (),
+    ) -> int:
+        """Return the most tricks the makers can take from a position.
+
+        Args:
+            hands (Sequence): Mask of the cards each seat still holds.
+            leader (int): Seat that leads (or led) the current trick.
+            played (Sequence): Card indices already played to the current trick, starting with the leader.
+        """
+        hands = list(hands)
+        if leader == self.skip:
+            leader = (leader + 1) % SEATS
+
+        if not played:
+            return self._search(hands, leader, -1, SEATS * 2)
+
+        order = self._orders[leader]
+        led = self._suit[played[0]]
+        strength = self._strength[led]
+        winner, best, trick = -1, -1, 0
+        for seat, card in zip(order, played):
+            trick |= 1 << card
+            if strength[card] > best:
+                winner, best = seat, strength[card]
+
+        return self._play(hands, order, len(played), led, best, winner, trick, -1, SEATS * 2)
+
+    def _search(self, hands: list[int], leader: int, alpha: int, beta: int) -> int:
+        """Search from the start of a trick, consulting the transposition table."""
+        remaining = hands[leader].bit_count()
+        if remaining == 0:
+            return 0
+
+        if remaining == 1:
+            order = self._orders[leader]
+            led = self._suit[hands[leader].bit_length() - 1]
+            strength = self._strength[led]
+            winner = max(order, key=lambda seat: strength[hands[seat].bit_length() - 1])
+            return int(winner & 1 == self.makers)
+
+        taken = self._probe(hands, leader, remaining)
+        if taken is not None:
+            return taken
+
+        key = (*hands, leader)
+        entry = self.table.get(key)
+        if entry:
+            low, high = entry
+            if low >= beta or low == high:
+                return low
+            if high <= alpha:
+                return high
+            alpha, beta = max(alpha, low), min(beta, high)
+        else:
+            low, high = 0, remaining
+
+        value = self._play(hands, self._orders[leader], 0, -1, -1, -1, 0, alpha, beta)
+
+        if value <= alpha:
+            high = min(high, value)
+        elif value >= beta:
+            low = max(low, value)
+        else:
+            low = high = value
+
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        self.table[key] = (low, high)
+        return value
+
+    def _probe(self, hands: list[int], leader: int, remaining: int) -> int | None:
+        """Return the makers' tricks from the tablebase, or None if the position is beyond its horizon."""
+        if remaining > self.horizon:
+            return None
+        taken = typing.cast("Tablebase", self.tablebase).probe(hands, self.trump, leader, self.skip)
+        if taken is None:
+            return None
+        return taken if leader & 1 == self.makers else remaining - taken
+
+    def _play(
+        self,
+        hands: list[int],
+        order: list[int],
+        pos: int,
+        led: int,
+        best: int,
+        winner: int,
+        trick: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        """Search the choices of the seat at position pos within the current trick."""
+        self.nodes += 1
+
+        seat = order[pos]
+        hand = hands[seat]
+        moves = hand if pos == 0 else hand & self._follow[led] or hand
+        live = hands[0] | hands[1] | hands[2] | hands[3] | trick
+
+        maximize = seat & 1 == self.makers
+        value = -1 if maximize else SEATS * 2
+        last = pos == len(order) - 1
+
+        for card in self._moves(moves, live, led, best):
+            hands[seat] = hand ^ 1 << card
+
+            if pos == 0:
+                next_led = self._suit[card]
+                next_best, next_winner = self._strength[next_led][card], seat
+            else:
+                next_led = led
+                strength = self._strength[led][card]
+                next_best, next_winner = (strength, seat) if strength > best else (best, winner)
+
+            if last:
+                won = int(next_winner & 1 == self.makers)
+                result = won + self._search(hands, next_winner, alpha - won, beta - won)
+            else:
+                result = self._play(hands, order, pos + 1, next_led, next_best, next_winner, trick | 1 << card, alpha, beta)
+
+            hands[seat] = hand
+
+            if maximize:
+                if result > value:
+                    value = result
+                    alpha = max(alpha, value)
+            elif result < value:
+                value = result
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                break
+
+        return value
+
+    def _moves(self, moves: int, live: int, led: int, best: int) -> list[int]:
+        """Return one card from each run of equivalent moves, in search order.
+
+        Two cards of the same effective suit are equivalent if no card still in play falls between them.
+        Cheap winners are tried first, then cheap losers; a leader tries their strongest cards first.
+        """
+        distinct = []
+        for suit in range(SEATS):
+            if not moves & self._follow[suit]:
+                continue
+            run = False
+            for card in self._ranked[suit]:
+                if not live >> card & 1:
+                    continue
+                if moves >> card & 1:
+                    if not run:
+                        distinct.append(card)
+                    run = True
+                else:
+                    run = False
+
+        if led < 0:
+            return sorted(distinct, key=lambda card: -self._strength[self._suit[card]][card])
+
+        strength = self._strength[led]
+        return sorted(
+            distinct,
+            key=lambda card: (0, strength[card]) if strength[card] > best else (1, self._strength[self._suit[card]][card]),
+        )
+
+
+def solve(
+    hands: typing.Sequence[int],
+    trump: int,
+    leader: int,
+    makers: int,
+    skip: int | None = None,
+    played: typing.Sequence[int] = (),
+    tablebase: Tablebase | None = None,
+) -> int:
+    """Return the most tricks the makers can take from a fully known position.
+
+    Args:
+        hands (Sequence): Mask of the cards each seat still holds.
+        trump (int): Trump suit index.
+        leader (int): Seat that leads (or led) the current trick.
+        makers (int): Team index (seat parity) of the makers.
+        skip (int): Seat sitting out because their partner went alone.
+        played (Sequence): Card indices already played to the current trick, starting with the leader.
+        tablebase (Tablebase): Endgame tablebase to stop the search at.
+    """
+    return Solver(trump, makers, skip, tablebase=tablebase).solve(hands, leader, played)
+
+
+def solve_hand(hand: Hand, tablebase: Tablebase | None = None) -> int:
+    """Return the most tricks the makers can finish a live hand with, including tricks already won.
+
+    Args:
+        hand (Hand): Hand after trump has been called.
+        tablebase (Tablebase): Endgame tablebase to stop the search at.
+    """
+    seats = hand.players.players
+    makers = next(seat for seat, player in enumerate(seats) if player in hand.trump_team.players) & 1
+    skip = next((seat for seat, player in enumerate(seats) if player.skip), None)
+
+    leader = seats.index(hand.leader)
+    played: list[int] = []
+    trick = hand.trick
+    if trick and trick.cards and len(trick.cards) < sum(not player.skip for player in seats):
+        leader = seats.index(trick.cards[0]["player"])
+        played = [card_index(entry["card"]) for entry in trick.cards]
+
+    hands = [0 if player.skip else to_mask(player.cards) for player in seats]
+    solver = Solver(suit_index(hand.trump_suit), makers, skip, tablebase=tablebase)
+    return hand.trump_team.tricks + solver.solve(hands, leader, played)
@@ -0,0 +1,297 @@
+"""Columnar, chunked and indexed store of played hands for analytic queries.
+
+Each hand is shredded into a row of small integer columns (see COLUMNS). Rows are written in
+chunks; every chunk keeps each column as a raw byte file, the column's min and max in the
+manifest, and a bitmap of the rows holding each distinct value. Queries skip chunks whose min/max
+rule them out, select rows by AND-ing bitmaps, and only read the columns they return.
+
+A store is a directory::
+
+    manifest.json
+    000000/<column>.col   one byte per row
+    000000/<column>.idx   bitmaps: value (u8), length (u32), little-endian bitmap bytes
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import struct
+import typing
+
+from pyeuchre.bitboard import TRUMP_MASKS
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import indices_mask
+from pyeuchre.bitboard import trick_winner
+from pyeuchre.cards import RANKS
+from pyeuchre.records import LEAD
+from pyeuchre.records import HandRecord
+from pyeuchre.records import hand_record
+
+
+# only import Hand for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+
+
+VERSION = 1
+SEATS = 4
+HAND_SIZE = 5
+
+# Stored for columns with no value, eg the caller of a thrown in hand
+NONE = 0xFF
+
+COLUMNS = (
+    "dealer",
+    "up_card",
+    "round",
+    "caller",
+    "trump",
+    "loner",
+    "caller_trumps",
+    "makers",
+    "tricks_0",
+    "tricks_1",
+    "points_0",
+    "points_1",
+)
+
+_BITMAP = struct.Struct("<BI")
+
+Predicate = typing.Union[int, tuple[int, int], typing.AbstractSet[int]]
+
+
+def shred_record(record: HandRecord) -> tuple[int, ...]:
+    """Shred a hand record into a row of COLUMNS.
+
+    Args:
+        record (HandRecord): Hand to shred.
+    """
+    dealer, deal = record.dealer, record.deal
+    up = deal[LEAD]
+    if record.caller is None or record.trump is None:
+        return (dealer, up, 0, NONE, NONE, 0, 0, NONE, 0, 0, 0, 0)
+
+    trump, caller = record.trump, record.caller
+    hands = [indices_mask(deal[seat * HAND_SIZE : (seat + 1) * HAND_SIZE]) for seat in range(SEATS)]
+    round_one = trump == up // len(RANKS)
+    if round_one and record.discard is not None:
+        hands[dealer] ^= 1 << up | 1 << record.discard
+
+    skip = (caller + 2) % SEATS if record.loner else None
+    order = [seat for seat in range(SEATS) if seat != skip]
+    leader = next(seat for seat in ((dealer + k) % SEATS for k in range(1, SEATS + 1)) if seat != skip)
+
+    tricks = [0, 0]
+    plays = record.plays
+    for start in range(0, len(plays), len(order)):
+        seats = sorted(order, key=lambda seat: (seat - leader) % SEATS)
+        leader = seats[trick_winner(plays[start : start + len(order)], trump)]
+        tricks[leader & 1] += 1
+
+    makers = caller & 1
+    points = [0, 0]
+    if tricks[makers] == HAND_SIZE:
+        points[makers] = 4 if record.loner else 2
+    elif tricks[makers] >= 3:
+        points[makers] = 1
+    else:
+        points[1 - makers] = 2
+
+    return (
+        dealer,
+        up,
+        1 if round_one else 2,
+        caller,
+        trump,
+        int(record.loner),
+        (hands[caller] & TRUMP_MASKS[trump]).bit_count(),
+        makers,
+        *tricks,
+        *points,
+    )
+
+
+def shred_hand(hand: Hand) -> tuple[int, ...]:
+    """Shred a finished hand into a row of COLUMNS."""
+    return shred_record(hand_record(hand))
+
+
+def _matches(predicate: Predicate, value: int) -> bool:
+    """Whether a value satisfies a predicate: an exact value, an inclusive (low, high) range or a set."""
+    if isinstance(predicate, int):
+        return value == predicate
+    if isinstance(predicate, tuple):
+        return predicate[0] <= value <= predicate[1]
+    return value in predicate
+
+
+def _overlaps(predicate: Predicate, low: int, high: int) -> bool:
+    """Whether any value in [low, high] could satisfy a predicate."""
+    if isinstance(predicate, int):
+        return low <= predicate <= high
+    if isinstance(predicate, tuple):
+        return predicate[0] <= high and low <= predicate[1]
+    return any(low <= value <= high for value in predicate)
+
+
+class HandStore:
+    """A columnar store of hands, open for appending and querying."""
+
+    def __init__(self, path: str | os.PathLike[str], chunk_size: int = 1 << 16) -> None:
+        """Open a store, creating it if needed.
+
+        Args:
+            path (PathLike): Store directory.
+            chunk_size (int): Rows per chunk.
+        """
+        self.path = pathlib.Path(path)
+        self.chunk_size = chunk_size
+        self._buffer: list[bytearray] = [bytearray() for _column in COLUMNS]
+
+        manifest = self.path / "manifest.json"
+        if manifest.exists():
+            self.manifest = json.loads(manifest.read_text())
+            if self.manifest["version"] != VERSION or tuple(self.manifest["columns"]) != COLUMNS:
+                raise ValueError("not a compatible hand store")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.manifest = {"version": VERSION, "columns": list(COLUMNS), "chunks": []}
+
+    def __enter__(self) -> HandStore:
+        """Use the store as a context manager."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Flush any buffered rows."""
+        self.flush()
+
+    @property
+    def rows(self) -> int:
+        """Number of rows written to chunks."""
+        return sum(chunk["rows"] for chunk in self.manifest["chunks"])
+
+    def append(self, row: typing.Sequence[int]) -> None:
+        """Append a row of COLUMNS, writing a chunk once chunk_size rows are buffered.
+
+        Args:
+            row (Sequence): Values in COLUMNS order.
+        """
+        for column, value in zip(self._buffer, row):
+            column.append(value)
+        if len(self._buffer[0]) >= self.chunk_size:
+            self.flush()
+
+    def append_hand(self, hand: Hand) -> None:
+        """Shred and append a finished hand."""
+        self.append(shred_hand(hand))
+
+    def append_record(self, record: HandRecord) -> None:
+        """Shred and append a hand record."""
+        self.append(shred_record(record))
+
+    def flush(self) -> None:
+        """Write any buffered rows as a new chunk."""
+        rows = len(self._buffer[0])
+        if not rows:
+            return
+
+        name = f"{len(self.manifest['chunks']):06d}"
+        directory = self.path / name
+        directory.mkdir()
+
+        stats = {}
+        for column, data in zip(COLUMNS, self._buffer):
+            (directory / f"{column}.col").write_bytes(data)
+
+            bitmaps: dict[int, int] = {}
+            for row, value in enumerate(data):
+                bitmaps[value] = bitmaps.get(value, 0) | 1 << row
+            with open(directory / f"{column}.idx", "wb") as f:
+                for value, bitmap in sorted(bitmaps.items()):
+                    encoded = bitmap.to_bytes((rows + 7) // 8, "little")
+                    f.write(_BITMAP.pack(value, len(encoded)) + encoded)
+
+            stats[column] = [min(data), max(data)]
+
+        self.manifest["chunks"].append({"name": name, "rows": rows, "stats": stats})
+        tmp = self.path / "manifest.json.tmp"
+        tmp.write_text(json.dumps(self.manifest))
+        tmp.replace(self.path / "manifest.json")
+
+        self._buffer = [bytearray() for _column in COLUMNS]
+
+    def _bitmap(self, directory: pathlib.Path, column: str, predicate: Predicate) -> int:
+        """Return the bitmap of rows in a chunk whose column satisfies a predicate."""
+        data = (directory / f"{column}.idx").read_bytes()
+        bitmap, offset = 0, 0
+        while offset < len(data):
+            value, length = _BITMAP.unpack_from(data, offset)
+            offset += _BITMAP.size
+            if _matches(predicate, value):
+                bitmap |= int.from_bytes(data[offset : offset + length], "little")
+            offset += length
+        return bitmap
+
+    def scan(
+        self,
+        columns: typing.Sequence[str],
+        where: dict[str, Predicate] | None = None,
+    ) -> typing.Generator[dict[str, list[int]], None, None]:
+        """Yield the matching rows of each chunk that has any, column by column.
+
+        Args:
+            columns (Sequence): Columns to return.
+            where (dict): Predicate for each filtered column: a value, an inclusive (low, high) range or a set of values.
+        """
+        where = where or {}
+        for chunk in self.manifest["chunks"]:
+            stats = chunk["stats"]
+            if not all(_overlaps(predicate, *stats[column]) for column, predicate in where.items()):
+                continue
+
+            directory = self.path / chunk["name"]
+            selected = (1 << chunk["rows"]) - 1
+            for column, predicate in where.items():
+                selected &= self._bitmap(directory, column, predicate)
+                if not selected:
+                    break
+            if not selected:
+                continue
+
+            rows = list(indices(selected))
+            result = {}
+            for column in columns:
+                data = (directory / f"{column}.col").read_bytes()
+                result[column] = [data[row] for row in rows]
+            yield result
+
+    def count(self, where: dict[str, Predicate] | None = None) -> int:
+        """Return the number of rows matching a filter.
+
+        Args:
+            where (dict): Predicate for each filtered column.
+        """
+        return sum(len(chunk[COLUMNS[0]]) for chunk in self.scan(COLUMNS[:1], where))
+
+    def group_by(
+        self,
+        by: str,
+        column: str,
+        where: dict[str, Predicate] | None = None,
+    ) -> dict[int, tuple[int, float]]:
+        """Return the count and mean of a column for each value of another, over rows matching a filter.
+
+        Args:
+            by (str): Column to group on.
+            column (str): Column to average.
+            where (dict): Predicate for each filtered column.
+        """
+        totals: dict[int, list[int]] = {}
+        for chunk in self.scan((by, column), where):
+            for key, value in zip(chunk[by], chunk[column]):
+                total = totals.setdefault(key, [0, 0])
+                total[0] += 1
+                total[1] += value
+        return {key: (count, total / count) for key, (count, total) in sorted(totals.items())}
@@ -0,0 +1,267 @@
+"""Precomputed hand-strength table for trump-calling decisions.
+
+For every five-card hand, trump suit and position relative to the dealer, the table holds the
+expected number of tricks the holder's team takes as makers, and the probabilities of making
+(three or more tricks) and marching (all five). The generator estimates these offline by
+double-dummy solving sampled deals; at runtime the file is memory-mapped read-only, so every
+lookup is O(1) and worker processes share the same pages.
+
+Entries are only stored for hands in canonical form with hearts as trump (see pyeuchre.canonical);
+every other hand and trump is relabelled to one of those before lookup.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import math
+import mmap
+import os
+import random
+import struct
+import typing
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import FULL_MASK
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import indices_mask
+from pyeuchre.bitboard import suit_index
+from pyeuchre.bitboard import to_mask
+from pyeuchre.canonical import TRUMP
+from pyeuchre.canonical import canonicalize
+from pyeuchre.canonical import is_canonical
+from pyeuchre.solver import Solver
+
+
+# only import Hand and Player for typing purposes - avoid circular imports
+if typing.TYPE_CHECKING:
+    from pyeuchre.game import Hand
+    from pyeuchre.people.players import Player
+
+
+MAGIC = b"PYEUHST\0"
+VERSION = 3
+HEADER = struct.Struct("<8sHHI")
+ENTRY = struct.Struct("<HHH")
+
+SEATS = 4
+HAND_SIZE = 5
+HANDS = math.comb(CARD_COUNT, HAND_SIZE)
+ENTRIES = HANDS * SEATS
+
+# Scale of the stored fixed-point values
+TRICKS_SCALE = 10000
+PROBABILITY_SCALE = 0xFFFF
+# Filler of entries not generated yet, out of range for every stored value's tricks
+MISSING = b"\xff" * ENTRY.size
+
+# Binomial coefficients, keyed by [n][k]
+_CHOOSE = [[math.comb(n, k) for k in range(HAND_SIZE + 1)] for n in range(CARD_COUNT + 1)]
+
+
+class Strength(typing.NamedTuple):
+    """Expected outcome of a hand for the holder's team as makers."""
+
+    tricks: float
+    make: float
+    march: float
+
+    @property
+    def euchre(self) -> float:
+        """Probability the makers are euchred."""
+        return 1.0 - self.make
+
+
+def rank_hand(mask: int) -> int:
+    """Return the index of a five-card hand mask among all C(24, 5) hands (colexicographic order).
+
+    Args:
+        mask (int): Five-card hand mask.
+    """
+    return sum(_CHOOSE[card][k + 1] for k, card in enumerate(indices(mask)))
+
+
+def entry_index(mask: int, trump: int, position: int) -> int:
+    """Return the table entry for a hand, trump suit index and position (seats left of the dealer).
+
+    Args:
+        mask (int): Five-card hand mask.
+        trump (int): Trump suit index.
+        position (int): Seats to the left of the dealer, 0 being the dealer.
+    """
+    (canonical,), _perm = canonicalize((mask,), trump)
+    return rank_hand(canonical) * SEATS + position
+
+
+def estimate(mask: int, trump: int, position: int, samples: int, rng: random.Random) -> Strength:
+    """Estimate a hand's strength by double-dummy solving deals of the other cards.
+
+    The other 19 cards are dealt uniformly, so the estimate does not know where the lead card is: for a
+    seat other than the dealer bidding the lead card's suit, the dealer really holds it (they pick it up
+    and discard), which this approximation ignores. The table is keyed by hand, trump and position only,
+    so it averages over every lead card.
+
+    Args:
+        mask (int): Five-card hand mask.
+        trump (int): Trump suit index.
+        position (int): Seats to the left of the dealer, 0 being the dealer.
+        samples (int): Number of deals to solve.
+        rng (Random): Random number generator for dealing.
+    """
+    rest = list(indices(FULL_MASK & ~mask))
+    solver = Solver(trump, position & 1)
+
+    tricks = makes = marches = 0
+    for _i in range(samples):
+        rng.shuffle(rest)
+        hands = [0] * SEATS
+        hands[position] = mask
+        others = (seat for seat in range(SEATS) if seat != position)
+        for k, seat in enumerate(others):
+            hands[seat] = indices_mask(rest[k * HAND_SIZE : (k + 1) * HAND_SIZE])
+
+        taken = solver.solve(hands, 1)
+        tricks += taken
+        makes += taken >= 3
+        marches += taken == HAND_SIZE
+
+    return Strength(tricks / samples, makes / samples, marches / samples)
+
+
+def _pack(strength: Strength) -> bytes:
+    """Pack a strength into a table entry."""
+    return ENTRY.pack(
+        round(strength.tricks * TRICKS_SCALE),
+        round(strength.make * PROBABILITY_SCALE),
+        round(strength.march * PROBABILITY_SCALE),
+    )
+
+
+def _generate_chunk(hands: list[int], samples: int, seed: int) -> list[tuple[int, bytes]]:
+    """Estimate every position for a chunk of canonical hand masks, in a worker process."""
+    entries = []
+    for mask in hands:
+        for position in range(SEATS):
+            rng = random.Random(f"{seed}:{mask}:{position}")
+            strength = estimate(mask, TRUMP, position, samples, rng)
+            entries.append((entry_index(mask, TRUMP, position), _pack(strength)))
+    return entries
+
+
+def generate(
+    path: str | os.PathLike[str],
+    samples: int = 16,
+    seed: int = 0,
+    start: int = 0,
+    stop: int = HANDS,
+    workers: int | None = None,
+    chunk: int = 64,
+) -> None:
+    """Fill in the table entries for a range of hand ranks, creating the file if needed.
+
+    Every entry is seeded from its own key, so ranges can be generated separately (or resumed) and
+    give the same file as a single run.
+
+    Args:
+        path (PathLike): Table file to create or update.
+        samples (int): Deals to solve per entry.
+        seed (int): Master seed.
+        start (int): First hand rank to generate.
+        stop (int): Hand rank to stop before.
+        workers (int): Worker processes, defaulting to the CPU count.
+        chunk (int): Hands per unit of work sent to a worker.
+    """
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, ENTRY.size, ENTRIES))
+            f.write(MISSING * ENTRIES)
+
+    masks = [
+        mask
+        for mask in map(indices_mask, itertools.combinations(range(CARD_COUNT), HAND_SIZE))
+        if start <= rank_hand(mask) < stop and is_canonical((mask,), TRUMP)
+    ]
+
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as m:
+        _check_header(m)
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(_generate_chunk, masks[i : i + chunk], samples, seed)
+                for i in range(0, len(masks), chunk)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                for entry, data in future.result():
+                    offset = HEADER.size + entry * ENTRY.size
+                    m[offset : offset + ENTRY.size] = data
+
+
+def _check_header(m: mmap.mmap) -> None:
+    """Raise ValueError unless a mapped file is a table this version can read."""
+    magic, version, size, count = HEADER.unpack_from(m)
+    if magic != MAGIC or version != VERSION or size != ENTRY.size or count != ENTRIES:
+        raise ValueError("not a compatible hand-strength table")
+
+
+class HandStrengthTable:
+    """Read-only, memory-mapped hand-strength table."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a table.
+
+        Args:
+            path (PathLike): Table file written by generate.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self._mmap)
+
+    def close(self) -> None:
+        """Unmap the table."""
+        self._mmap.close()
+
+    def lookup(self, mask: int, trump: int, position: int) -> Strength:
+        """Return the strength of a hand.
+
+        Args:
+            mask (int): Five-card hand mask.
+            trump (int): Trump suit index.
+            position (int): Seats to the left of the dealer, 0 being the dealer.
+
+        Raises:
+            ValueError: If the hand's entry has not been generated.
+        """
+        offset = HEADER.size + entry_index(mask, trump, position) * ENTRY.size
+        if self._mmap[offset : offset + ENTRY.size] == MISSING:
+            raise ValueError("hand-strength entry not generated")
+        tricks, make, march = ENTRY.unpack_from(self._mmap, offset)
+        return Strength(tricks / TRICKS_SCALE, make / PROBABILITY_SCALE, march / PROBABILITY_SCALE)
+
+    def pickup(self, mask: int, up: int, trump: int) -> tuple[Strength, int]:
+        """Return the dealer's strength after picking up the lead card and making the best discard.
+
+        Args:
+            mask (int): Dealer's five-card hand mask.
+            up (int): Card index of the lead card.
+            trump (int): Trump suit index.
+
+        Returns:
+            The strength and the card index to discard.
+        """
+        held = mask | 1 << up
+        return max((self.lookup(held ^ 1 << card, trump, 0), card) for card in indices(held))
+
+    def for_player(self, hand: Hand, player: Player, trump: int) -> Strength:
+        """Return the strength of a player's cards in a live hand, counting the dealer's pickup.
+
+        Args:
+            hand (Hand): Hand being bid on.
+            player (Player): Player whose cards to look up.
+            trump (int): Trump suit index being considered.
+        """
+        seats = hand.players.players
+        position = (seats.index(player) - seats.index(hand.players.dealer)) % SEATS
+        mask = to_mask(player.cards)
+        if position == 0 and trump == suit_index(hand.lead.suit):
+            return self.pickup(mask, card_index(hand.lead), trump)[0]
+        return self.lookup(mask, trump, position)
@@ -0,0 +1,337 @@
+"""On-disk endgame tablebase: exact results of the last few tricks of a hand.
+
+Once only a few cards are left, what decides the rest of a hand is who holds which of the cards
+still in play, not which cards they are. A position at the start of a trick is reduced to a key
+that keeps just that:
+
+* seats are relative to the leader, so the leader is always seat 0;
+* within each effective suit, only the order of the live cards matters, so a suit becomes the
+  sequence of seats holding its live cards, strongest first (rank compression);
+* the three non-trump suits are interchangeable, so they are sorted.
+
+generate enumerates every such key with up to max_cards cards per player (with and without a
+seat sitting out), solves it once, and writes the tricks the leader's team takes into a file
+indexed by a compact perfect hash (CHD, compress hash and displace: keys are split into buckets,
+and each bucket stores the seed d that sends each of its keys to the free slot f1 + d * f2 for
+two hashes f1 and f2 of the key). A Tablebase maps the file read-only,
+so probing a position costs a few hashes and two reads of the mapped file, whatever its size::
+
+    generate("endgames.tb", max_cards=2)
+    with Tablebase("endgames.tb") as tablebase:
+        solve(hands, trump, leader, makers, tablebase=tablebase)
+
+The file is a header (HEADER), then a little-endian u16 seed per bucket, then one 4-bit result
+per slot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import mmap
+import os
+import pathlib
+import struct
+import time
+import typing
+
+from pyeuchre.bitboard import CARD_COUNT
+from pyeuchre.bitboard import EFFECTIVE_SUIT_MASKS
+from pyeuchre.bitboard import SAME_COLOR
+from pyeuchre.bitboard import STRENGTH
+from pyeuchre.bitboard import indices
+from pyeuchre.canonical import TRUMP
+from pyeuchre.cards import SUITS
+from pyeuchre.solver import Solver
+
+
+SEATS = 4
+
+MAGIC = b"EUTB"
+VERSION = 1
+
+# magic, version, max cards per player, salt, keys, buckets, slots
+HEADER = struct.Struct("<4sHHIIII")
+_SEED = struct.Struct("<H")
+
+# Average keys per bucket, and keys per slot
+BUCKET_SIZE = 3
+LOAD = 0.95
+
+_M64 = (1 << 64) - 1
+
+
+def _ranked(trump: int, suit: int) -> list[int]:
+    """Return the card indices of an effective suit, strongest first."""
+    strength = STRENGTH[trump][suit]
+    return sorted(indices(EFFECTIVE_SUIT_MASKS[trump][suit]), key=lambda i: -strength[i])
+
+
+# Cards of each effective suit, strongest first, keyed by [trump][suit]
+RANKED = [[_ranked(t, s) for s in range(len(SUITS))] for t in range(len(SUITS))]
+
+
+def _mix(x: int) -> int:
+    """Scramble 64 bits (the splitmix64 finalizer)."""
+    x &= _M64
+    x = (x ^ x >> 30) * 0xBF58476D1CE4E5B9 & _M64
+    x = (x ^ x >> 27) * 0x94D049BB133111EB & _M64
+    return x ^ x >> 31
+
+
+def _hashes(key: int, salt: int, buckets: int, slots: int) -> tuple[int, int, int]:
+    """Return the bucket of a key, and the offset and step its bucket's seed picks a slot with."""
+    x = _mix(key ^ _mix(salt))
+    y = _mix(x)
+    return x % buckets, y % slots, (y >> 32) % max(1, slots - 1) + 1
+
+
+def position_key(hands: typing.Sequence[int], trump: int, leader: int, skip: int | None = None) -> int:
+    """Return the rank-compressed key of a position at the start of a trick.
+
+    Positions that play out the same way, up to relabelling seats from the leader, the ranks within
+    each suit and the non-trump suits, share a key.
+
+    Args:
+        hands (Sequence): Mask of the cards each seat holds.
+        trump (int): Trump suit index.
+        leader (int): Seat leading the trick.
+        skip (int): Seat sitting out because their partner went alone.
+    """
+    if leader == skip:
+        leader = (leader + 1) % SEATS
+
+    owner = [-1] * CARD_COUNT
+    for seat in range(SEATS):
+        if seat != skip:
+            for card in indices(hands[seat]):
+                owner[card] = (seat - leader) % SEATS
+
+    # Each suit as its number of live cards and the seats holding them, strongest first, two bits each
+    suits = []
+    for cards in RANKED[trump]:
+        length, owners = 0, 0
+        for card in cards:
+            if owner[card] >= 0:
+                length += 1
+                owners = owners << 2 | owner[card]
+        suits.append((length, owners))
+    suits = [suits[trump], *sorted(suits[:trump] + suits[trump + 1 :])]
+
+    key = 0 if skip is None else (skip - leader) % SEATS
+    for length, _owners in suits:
+        key = key << 4 | length
+    for length, owners in suits:
+        key = key << 2 * length | owners
+    return key
+
+
+class Tablebase:
+    """Read-only, memory-mapped endgame tablebase written by generate."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a tablebase.
+
+        Args:
+            path (PathLike): Tablebase file.
+
+        Raises:
+            ValueError: If the file is not a tablebase of this version.
+        """
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_cards, self._salt, self._keys, self._buckets, self._slots = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError("not a compatible tablebase")
+        self._values = HEADER.size + _SEED.size * self._buckets
+
+    def __enter__(self) -> Tablebase:
+        """Use the tablebase as a context manager."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the tablebase."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of positions stored."""
+        return int(self._keys)
+
+    def probe(self, hands: typing.Sequence[int], trump: int, leader: int, skip: int | None = None) -> int | None:
+        """Return the most tricks the leader's team can take from the start of a trick.
+
+        Every seat in play must hold the same number of cards.
+
+        Args:
+            hands (Sequence): Mask of the cards each seat holds.
+            trump (int): Trump suit index.
+            leader (int): Seat leading the trick.
+            skip (int): Seat sitting out because their partner went alone.
+
+        Returns:
+            The tricks taken, or None if the players hold more than max_cards cards each.
+        """
+        if leader == skip:
+            leader = (leader + 1) % SEATS
+        if hands[leader].bit_count() > self.max_cards:
+            return None
+
+        return self.lookup(position_key(hands, trump, leader, skip))
+
+    def lookup(self, key: int) -> int:
+        """Return the result stored for a position key; keys never written map to an arbitrary result."""
+        bucket, offset, step = _hashes(key, self._salt, self._buckets, self._slots)
+        (seed,) = _SEED.unpack_from(self._map, HEADER.size + _SEED.size * bucket)
+        slot = (offset + seed * step) % self._slots
+        return int(self._map[self._values + (slot >> 1)] >> 4 * (slot & 1) & 0xF)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+
+def _arrangements(counts: list[int]) -> typing.Generator[tuple[int, ...], None, None]:
+    """Yield every distinct sequence holding each seat counts[seat] times."""
+    if not any(counts):
+        yield ()
+        return
+    for seat, count in enumerate(counts):
+        if count:
+            counts[seat] -= 1
+            for rest in _arrangements(counts):
+                yield (seat, *rest)
+            counts[seat] += 1
+
+
+def _positions(cards: int, skip: int | None) -> typing.Generator[list[int], None, None]:
+    """Yield hands, led by seat 0 with TRUMP as trump, covering every key with cards cards per player."""
+    counts = [0 if seat == skip else cards for seat in range(SEATS)]
+    total = sum(counts)
+    ranked = RANKED[TRUMP]
+    # Longest non-trump suits first, and the short suit of trump's color last
+    suits = [TRUMP, *(suit for suit in range(len(SUITS)) if suit not in (TRUMP, SAME_COLOR[TRUMP])), SAME_COLOR[TRUMP]]
+
+    for lengths in itertools.product(range(total + 1), repeat=len(suits)):
+        if sum(lengths) != total or list(lengths[1:]) != sorted(lengths[1:], reverse=True):
+            continue
+        if any(length > len(ranked[suit]) for suit, length in zip(suits, lengths)):
+            continue
+        for owners in _arrangements(counts):
+            hands = [0] * SEATS
+            seats = iter(owners)
+            for suit, length in zip(suits, lengths):
+                for card in ranked[suit][:length]:
+                    hands[next(seats)] |= 1 << card
+            yield hands
+
+
+def _prime_at_least(n: int) -> int:
+    """Return the least prime at least n."""
+    while any(n % d == 0 for d in range(2, math.isqrt(n) + 1)):
+        n += 1
+    return n
+
+
+def _displace(keys: list[int], salt: int, buckets: int, slots: int) -> list[int] | None:
+    """Find a seed for each bucket sending its keys to distinct free slots, biggest buckets first."""
+    grouped: list[list[tuple[int, int]]] = [[] for _i in range(buckets)]
+    for key in keys:
+        bucket, offset, step = _hashes(key, salt, buckets, slots)
+        grouped[bucket].append((offset, step))
+
+    taken = bytearray(slots)
+    seeds = [0] * buckets
+    for bucket in sorted(range(buckets), key=lambda bucket: -len(grouped[bucket])):
+        group = grouped[bucket]
+        if not group:
+            break
+        for seed in range(1 << 8 * _SEED.size):
+            chosen = {(offset + seed * step) % slots for offset, step in group}
+            if len(chosen) == len(group) and not any(taken[slot] for slot in chosen):
+                break
+        else:
+            return None
+        for slot in chosen:
+            taken[slot] = 1
+        seeds[bucket] = seed
+    return seeds
+
+
+def write(path: str | os.PathLike[str], results: dict[int, int], max_cards: int) -> None:
+    """Write solved positions to a tablebase file.
+
+    Args:
+        path (PathLike): Tablebase file, replaced atomically.
+        results (dict): Tricks the leader's team takes, by position key.
+        max_cards (int): Most cards per player of the positions.
+    """
+    keys = list(results)
+    buckets = max(1, math.ceil(len(keys) / BUCKET_SIZE))
+    # A prime number of slots, so every step reaches every slot
+    slots = _prime_at_least(max(2, math.ceil(len(keys) / LOAD)))
+    for salt in itertools.count():
+        displaced = _displace(keys, salt, buckets, slots)
+        if displaced is not None:
+            seeds = displaced
+            break
+
+    values = bytearray((slots + 1) // 2)
+    for key, taken in results.items():
+        bucket, offset, step = _hashes(key, salt, buckets, slots)
+        slot = (offset + seeds[bucket] * step) % slots
+        values[slot >> 1] |= taken << 4 * (slot & 1)
+
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, max_cards, salt, len(keys), buckets, slots))
+        file.write(struct.pack(f"<{buckets}H", *seeds))
+        file.write(values)
+    tmp.replace(path)
+
+
+def generate(path: str | os.PathLike[str], max_cards: int = 2) -> int:
+    """Solve every endgame with up to max_cards cards per player and write them to a tablebase file.
+
+    Covers all four players in play and each seat sitting out. Two cards each is a few seconds of
+    work; three takes a few million solves.
+
+    Args:
+        path (PathLike): Tablebase file, replaced atomically.
+        max_cards (int): Most cards per player.
+
+    Returns:
+        The number of positions written.
+    """
+    results: dict[int, int] = {}
+    for skip in (None, 1, 2, 3):
+        # One solver per table shape, so positions share each other's transpositions
+        solver = Solver(TRUMP, 0, skip)
+        for cards in range(1, max_cards + 1):
+            for hands in _positions(cards, skip):
+                key = position_key(hands, TRUMP, 0, skip)
+                if key not in results:
+                    results[key] = solver.solve(hands, 0)
+    write(path, results, max_cards)
+    return len(results)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Generate an endgame tablebase."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="tablebase file")
+    parser.add_argument("--max-cards", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    positions = generate(args.path, args.max_cards)
+    print(f"{positions} positions in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
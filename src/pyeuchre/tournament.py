@@ -0,0 +1,94 @@
+"""Run large numbers of simulated games across a pool of worker processes."""
+
+import concurrent.futures
+import os
+import random
+import time
+import typing
+
+from pyeuchre.people.groups import Players
+from pyeuchre.sim import GameResult
+from pyeuchre.sim import play_seeded
+from pyeuchre.sim import random_players
+
+
+class ShardResult(typing.NamedTuple):
+    """Results of one shard of a tournament, as returned by a worker."""
+
+    shard: int
+    results: list[GameResult]
+    elapsed: float
+
+
+def run_shard(
+    shard: int,
+    first: int,
+    games: int,
+    seed: int,
+    players: typing.Callable[[random.Random], Players] = random_players,
+) -> ShardResult:
+    """Play one shard of games.
+
+    Game k of the tournament is game k of simulate with the same seed, so any shard (or game) can be rerun alone.
+
+    Args:
+        shard (int): Shard number.
+        first (int): Number of the shard's first game.
+        games (int): Number of games in the shard.
+        seed (int): Master seed of the tournament.
+        players (Callable): Picklable factory building each game's table from its bot generator.
+    """
+    start = time.perf_counter()
+    results = [play_seeded(seed, game, players) for game in range(first, first + games)]
+    return ShardResult(shard, results, time.perf_counter() - start)
+
+
+def run_tournament(
+    games: int,
+    seed: int = 0,
+    shard_size: int = 1000,
+    workers: int | None = None,
+    players: typing.Callable[[random.Random], Players] = random_players,
+) -> typing.Generator[ShardResult, None, None]:
+    """Play games across a process pool, yielding each shard as it completes.
+
+    At most two shards per worker are in flight, so memory stays bounded however many games are played.
+
+    Args:
+        games (int): Total number of games to play.
+        seed (int): Master seed of the tournament.
+        shard_size (int): Number of games per shard.
+        workers (int): Number of worker processes, defaulting to the CPU count.
+        players (Callable): Picklable factory building each game's table from its bot generator.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = iter(range((games + shard_size - 1) // shard_size))
+
+    def size(shard: int) -> int:
+        return min(shard_size, games - shard * shard_size)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = {
+            executor.submit(run_shard, shard, shard * shard_size, size(shard), seed, players)
+            for _i, shard in zip(range(workers * 2), shards)
+        }
+
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for shard in shards:
+                    pending.add(executor.submit(run_shard, shard, shard * shard_size, size(shard), seed, players))
+                    break
+
+
+def main() -> None:
+    """Run a quick tournament on every core and report throughput."""
+    start = time.perf_counter()
+    games = sum(len(shard.results) for shard in run_tournament(20000, shard_size=500))
+    elapsed = time.perf_counter() - start
+    print(f"{games} games in {elapsed:.2f}s ({games / elapsed:.0f} games/s on {os.cpu_count()} cores)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Tests for tracking hidden cards and sampling consistent deals."""
+
+import collections
+import itertools
+import math
+import random
+
+import pytest
+
+from pyeuchre.beliefs import HOLDERS
+from pyeuchre.beliefs import KITTY
+from pyeuchre.beliefs import Beliefs
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import to_mask
+from pyeuchre.events import CardPlayed
+from pyeuchre.events import DecisionMade
+from pyeuchre.game import Game
+from pyeuchre.sim import random_players
+
+
+def _plays(seed, check):
+    """Call check with the hand and player at every card played in a hand, before the card leaves the hand."""
+    game = Game(random_players(random.Random(seed)), rng=random.Random(seed))
+
+    def decided(event):
+        if event.request == "request_play_card":
+            check(event.hand, event.player)
+
+    game.events.subscribe(decided, DecisionMade)
+    game.play_hand()
+
+
+def _bits(cards):
+    """Return the mask of card indices."""
+    return sum(1 << card for card in cards)
+
+
+def _actual(hand):
+    """Return the mask of cards each seat holds."""
+    return [to_mask(player.cards) for player in hand.players.players]
+
+
+def _discard(hand):
+    """Return the card index the dealer discarded, or None if the lead card was turned down."""
+    return None if hand.discard is None else card_index(hand.discard)
+
+
+def _brute_force(beliefs):
+    """Enumerate every assignment of the hidden cards consistent with the beliefs."""
+    holders = [holder for holder in range(HOLDERS) if holder != beliefs.seat]
+
+    def deal(i, left):
+        if i == len(holders):
+            if not left:
+                yield {}
+            return
+        holder = holders[i]
+        for cards in itertools.combinations(indices(left & beliefs.possible[holder]), beliefs.counts[holder]):
+            mask = _bits(cards)
+            for rest in deal(i + 1, left & ~mask):
+                yield {holder: mask, **rest}
+
+    return [tuple(rest.get(holder, 0) for holder in range(HOLDERS)) for rest in deal(0, beliefs.hidden)]
+
+
+def test_initial_counts():
+    beliefs = Beliefs(0, 0, 0b11111, 1, 5, picked_up=False)
+    assert beliefs.counts == [0, 5, 5, 5, 3]
+    assert beliefs.hidden.bit_count() == 18
+
+    picked = Beliefs(0, 0, 0b11111, 1, 5, picked_up=True)
+    assert picked.counts == [0, 5, 5, 5, 4]
+    # The lead card is with the dealer or was discarded
+    assert [possible >> 5 & 1 for possible in picked.possible] == [0, 1, 0, 0, 1]
+    # 19 cards dealt 5, 5, 5, 4, with the lead card in 9 of the 19 places
+    assert picked.count() == math.factorial(19) // (math.factorial(5) ** 3 * math.factorial(4)) * 9 // 19
+
+
+def test_samples_are_consistent_with_play():
+    def check(hand, player):
+        seats = hand.players.players
+        actual = _actual(hand)
+        for seat, observer in enumerate(seats):
+            if observer.skip:
+                continue
+            beliefs = Beliefs.from_hand(hand, observer, _discard(hand) if hand.dealer is observer else None)
+            assert beliefs.own == actual[seat]
+            # The real deal is among those considered
+            for other in range(4):
+                if other != seat:
+                    assert actual[other] & ~beliefs.possible[other] == 0
+                    assert actual[other].bit_count() == beliefs.counts[other]
+
+            for _i in range(5):
+                sample = beliefs.sample(rng)
+                assert sample[seat] == beliefs.own
+                assert sum(sample) == beliefs.own | beliefs.hidden
+                assert [mask.bit_count() for mask in sample] == [*map(int.bit_count, actual), beliefs.counts[KITTY]]
+                for holder in range(HOLDERS):
+                    if holder != seat:
+                        assert sample[holder] & ~beliefs.possible[holder] == 0
+
+    rng = random.Random(0)
+    for seed in range(20):
+        _plays(seed, check)
+
+
+def test_count_matches_enumeration():
+    checked = 0
+
+    def check(hand, player):
+        nonlocal checked
+        if len(player.cards) > 2:
+            return
+        beliefs = Beliefs.from_hand(hand, player, _discard(hand) if hand.dealer is player else None)
+        assert beliefs.count() == len(_brute_force(beliefs))
+        checked += 1
+
+    for seed in range(5):
+        _plays(seed, check)
+    assert checked
+
+
+def _late_beliefs():
+    """Return beliefs four tricks into a hand where the other seats have shown out of trump and diamonds."""
+    # Spades are trump, so the jack of clubs (14) is the left bower; seat 0 dealt, picked up 23 and discarded 18
+    beliefs = Beliefs(0, 3, _bits([19, 20, 21, 22, 23]), 0, 23, picked_up=True, discard=18)
+    tricks = [[(0, 19), (1, 6), (2, 0), (3, 1)], [(0, 20), (1, 12), (2, 13), (3, 7)], [(0, 21), (1, 8), (2, 2), (3, 9)]]
+    tricks.append([(1, 10), (2, 3), (3, 15), (0, 22)])
+    for trick in tricks:
+        for seat, card in trick:
+            beliefs.play(seat, card)
+    return beliefs
+
+
+def test_voids_constrain_late_deals():
+    beliefs = _late_beliefs()
+    assert beliefs.hidden == _bits([4, 5, 11, 14, 16, 17])
+    assert beliefs.counts == [0, 1, 1, 1, 3]
+    # Only the kitty can hold the left bower, and only seat 1 or the kitty the last diamond
+    assert [possible >> 14 & 1 for possible in beliefs.possible] == [0, 0, 0, 0, 1]
+    assert [possible >> 11 & 1 for possible in beliefs.possible] == [0, 1, 0, 0, 1]
+    assert beliefs.count() == len(_brute_force(beliefs))
+
+
+def test_sample_is_uniform():
+    beliefs = _late_beliefs()
+    deals = _brute_force(beliefs)
+    assert beliefs.count() == len(deals)
+
+    rng = random.Random(1)
+    expected = 1000
+    seen = collections.Counter(tuple(beliefs.sample(rng)) for _i in range(expected * len(deals)))
+    assert set(seen) == {(beliefs.own, *deal[1:]) for deal in deals}
+    # Pearson's chi-squared statistic within five standard deviations of its mean
+    chi2 = sum((count - expected) ** 2 / expected for count in seen.values())
+    dof = len(deals) - 1
+    assert chi2 < dof + 5 * math.sqrt(2 * dof)
+
+
+def test_events_match_from_hand():
+    for seed in range(10):
+        game = Game(random_players(random.Random(seed)), rng=random.Random(seed))
+        followed = []
+
+        def decided(event):
+            if event.request != "request_play_card":
+                return
+            hand = event.hand
+            observer = hand.players.players[1]
+            fresh = Beliefs.from_hand(hand, observer, _discard(hand) if hand.dealer is observer else None)
+            if not followed:
+                followed.append(fresh)
+            state = followed[0]
+            assert (fresh.possible, fresh.counts, fresh.own) == (state.possible, state.counts, state.own)
+            assert (fresh.led, fresh.played) == (state.led, state.played)
+
+        game.events.subscribe(decided, DecisionMade)
+        game.events.subscribe(lambda event: followed[0].update(event), CardPlayed)
+        game.play_hand()
+        assert followed
+
+
+def test_renege_has_no_consistent_deal():
+    # Spades are trump; seat 1 shows out of hearts, diamonds, clubs and spades in turn
+    beliefs = Beliefs(0, 3, _bits([0, 6, 12, 18, 1]), 3, 23, picked_up=False)
+    tricks = [[(0, 0), (1, 7), (2, 3), (3, 4)], [(0, 6), (1, 13), (2, 8), (3, 9)]]
+    tricks += [[(0, 12), (1, 19), (2, 15), (3, 16)], [(0, 18), (1, 2), (2, 20), (3, 21)]]
+    for trick in tricks:
+        for seat, card in trick:
+            beliefs.play(seat, card)
+    assert beliefs.possible[1] == 0
+    assert beliefs.count() == 0
+    with pytest.raises(ValueError):
+        beliefs.sample(random.Random())
+
+
+def test_from_hand_needs_trump():
+    game = Game(random_players(random.Random(0)), rng=random.Random(0))
+    game.deal_hand()
+    with pytest.raises(ValueError):
+        Beliefs.from_hand(game.hand, game.hand.players.players[0])
@@ -0,0 +1,34 @@
+"""Tests for the benchmark suite."""
+
+import json
+
+from pyeuchre.bench import BENCHMARKS
+from pyeuchre.bench import compare
+from pyeuchre.bench import main
+from pyeuchre.bench import run_benchmarks
+from pyeuchre.bench import to_json
+
+
+def test_run_benchmarks_quick():
+    results = run_benchmarks(rounds=2, round_time=0.001, warmup=0)
+    assert set(results) == set(BENCHMARKS)
+    for result in results.values():
+        assert len(result.samples) == 2
+        assert result.best <= result.median
+        assert result.ops_per_second > 0
+
+
+def test_compare_flags_regressions():
+    results = to_json(run_benchmarks(["is_trump", "parse_card"], rounds=2, round_time=0.001, warmup=0))
+    slower = json.loads(json.dumps(results))
+    slower["results"]["is_trump"]["median"] *= 2
+    ratios = compare(results, slower)
+    assert ratios["is_trump"][1]
+    assert not ratios["parse_card"][1]
+
+
+def test_main_writes_json(tmp_path):
+    out = tmp_path / "bench.json"
+    assert main(["players", "--rounds", "2", "--round-time", "0.001", "--json", str(out)]) == 0
+    assert main(["players", "--rounds", "2", "--round-time", "0.001", "--compare", str(out), "--threshold", "100"]) == 0
+    assert list(json.loads(out.read_text())["results"]) == ["players"]
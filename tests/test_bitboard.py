@@ -0,0 +1,68 @@
+"""Tests for the bitboard card representation."""
+
+from pyeuchre import bitboard
+from pyeuchre.cards import RANKS, SUITS, Card, Deck, is_trump
+
+
+def test_card_index_roundtrip():
+    for i, card in enumerate(Deck().cards):
+        assert bitboard.card_index(card) == i
+        assert bitboard.index_card(i) == card
+
+
+def test_mask_roundtrip():
+    cards = Deck().cards[3:8]
+    mask = bitboard.to_mask(cards)
+    assert mask.bit_count() == 5
+    assert bitboard.from_mask(mask) == cards
+
+
+def test_deck_roundtrip():
+    deck = Deck()
+    deck.shuffle()
+    order = bitboard.deck_to_indices(deck)
+    assert sorted(order) == list(range(bitboard.CARD_COUNT))
+    assert bitboard.deck_from_indices(order).cards == deck.cards
+
+
+def test_trump_masks_match_is_trump():
+    for t, trump in enumerate(SUITS):
+        assert bitboard.TRUMP_MASKS[t].bit_count() == 7
+        for i, card in enumerate(bitboard.CARDS):
+            assert bitboard.is_trump(i, t) == is_trump(card, trump)
+
+
+def test_effective_suit_masks_partition_deck():
+    for t in range(len(SUITS)):
+        masks = bitboard.EFFECTIVE_SUIT_MASKS[t]
+        assert sum(masks) == bitboard.FULL_MASK
+        assert sorted(mask.bit_count() for mask in masks) == [5, 6, 6, 7]
+
+
+def test_left_bower_follows_trump():
+    hearts, diamonds = 0, 1
+    left = bitboard.card_index(Card(SUITS[diamonds], RANKS[bitboard.JACK]))
+    assert bitboard.effective_suit(left, hearts) == hearts
+    assert bitboard.effective_suit(left, diamonds) == diamonds
+
+    hand = 1 << left | 1 << bitboard.card_index(Card(SUITS[diamonds], RANKS[0]))
+    assert bitboard.follow_mask(hand, hearts, hearts) == 1 << left
+    assert bitboard.follow_mask(hand, diamonds, hearts) == hand ^ 1 << left
+
+
+def test_legal_cards_follow_effective_suit():
+    hearts, diamonds = SUITS[0], SUITS[1]
+    left = Card(diamonds, RANKS[bitboard.JACK])
+    nine = Card(diamonds, RANKS[0])
+    ace = Card(SUITS[2], RANKS[5])
+    cards = [nine, left, ace]
+
+    assert bitboard.legal_cards(cards, hearts, hearts) == [left]
+    assert bitboard.legal_cards(cards, diamonds, hearts) == [nine]
+    assert bitboard.legal_cards(cards, SUITS[3], hearts) == cards
+    assert bitboard.legal_cards(cards, None, hearts) == cards
+    assert bitboard.legal_mask(bitboard.to_mask(cards), 0, 0) == bitboard.to_mask([left])
+
+    assert bitboard.is_legal(left, cards, hearts, hearts)
+    assert not bitboard.is_legal(nine, cards, hearts, hearts)
+    assert bitboard.is_legal(ace, cards, SUITS[3], hearts)
@@ -0,0 +1,40 @@
+"""Tests for search-based bots."""
+
+import random
+
+from pyeuchre.bitboard import TRUMP_MASKS
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import index_card
+from pyeuchre.bitboard import indices
+from pyeuchre.bitboard import suit_index
+from pyeuchre.game import Hand
+from pyeuchre.people.bots import ISMCTSBot
+from pyeuchre.people.groups import Players, Team
+from pyeuchre.people.players import RandomBot
+from pyeuchre.search import VALUE
+from pyeuchre.sim import play_game
+
+
+def test_ismcts_bot_plays_game():
+    rng = random.Random(1)
+    bots = [ISMCTSBot(name, rng, time_budget=None, iterations=8) for name in ("North", "South")]
+    players = Players((Team(tuple(bots)), Team((RandomBot("East", rng), RandomBot("West", rng)))))
+    result = play_game(players, rng)
+    assert max(result.scores) >= 10
+
+
+def test_ismcts_bot_weighs_passing():
+    rng = random.Random(2)
+    bot = ISMCTSBot("East", rng, time_budget=None, iterations=64)
+    players = Players((Team((RandomBot("North", rng), RandomBot("South", rng))), Team((bot, RandomBot("West", rng)))))
+    hand = Hand(players, rng=rng)
+    up = card_index(hand.lead)
+    trump = suit_index(hand.lead.suit)
+    strongest = sorted(indices(TRUMP_MASKS[trump] & ~(1 << up)), key=lambda i: -VALUE[trump][i])
+
+    # Five of the six other trump cards are worth ordering up; nines and tens of the other suits are not
+    bot.cards = [index_card(i) for i in strongest[:5]]
+    assert 0 <= bot._evaluate_pass(hand, True) <= 1
+    assert bot.request_trump_call(hand)
+    bot.cards = [index_card(suit * 6 + rank) for suit in range(4) for rank in (0, 1) if suit != trump][:5]
+    assert not bot.request_trump_call(hand)
@@ -0,0 +1,41 @@
+"""Tests for suit-isomorphism canonicalization."""
+
+import random
+
+from pyeuchre import bitboard
+from pyeuchre.canonical import PERMUTATIONS, TRUMP, canonicalize, invert, is_canonical, permute_card, permute_mask
+from pyeuchre.cards import SUITS
+from pyeuchre.solver import solve
+from pyeuchre.utility.input import parse_card
+
+
+def test_permutations_keep_colors():
+    assert len(PERMUTATIONS) == 8
+    for perm in PERMUTATIONS:
+        assert permute_mask(permute_mask(0xABCDEF, perm), invert(perm)) == 0xABCDEF
+
+
+def test_permute_card_keeps_bowers():
+    # Swapping the colors maps the jack of diamonds to the jack of spades
+    assert permute_card(parse_card("j d"), (2, 3, 0, 1)) == parse_card("j s")
+
+
+def test_canonicalize_is_class_invariant():
+    rng = random.Random(0)
+    for _i in range(50):
+        masks = [bitboard.indices_mask(rng.sample(range(24), 5)) for _j in range(3)]
+        canonical, perm = canonicalize(masks)
+        assert is_canonical(canonical)
+        assert tuple(permute_mask(m, invert(perm)) for m in canonical) == tuple(masks)
+        for other in PERMUTATIONS:
+            assert canonicalize([permute_mask(m, other) for m in masks])[0] == canonical
+
+
+def test_canonical_trump_preserves_solution():
+    rng = random.Random(1)
+    for _i in range(10):
+        cards = rng.sample(range(24), 12)
+        hands = [bitboard.indices_mask(cards[s * 3:(s + 1) * 3]) for s in range(4)]
+        trump = rng.randrange(len(SUITS))
+        canonical, _perm = canonicalize(hands, trump)
+        assert solve(canonical, TRUMP, 0, 0) == solve(hands, trump, 0, 0)
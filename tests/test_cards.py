@@ -1,7 +1,7 @@
 """Tests for card functions and classes."""
 
 import pytest
-from pyeuchre.cards import Rank, RANKS, Suit, SUITS, Card, Deck, is_trump
+from pyeuchre.cards import Rank, RANKS, Suit, SUITS, Card, CARDS, Deck, is_trump
 
 # TODO add test for gt, lt, color comparisons for ranks and suits
 
@@ -78,3 +78,35 @@ def test_trump():
     assert is_trump(Card(Suit((1, "s", "♠", "spades")), Rank((1, False, "10", "ten"))), Suit((1, "s", "♠", "spades")))
     assert not is_trump(Card(Suit((0, "d", "♦", "diamonds")), Rank((2, True, "j", "jack"))), Suit((1, "s", "♠", "spades")))
     assert not is_trump(Card(Suit((1, "c", "♣", "clubs")), Rank((1, False, "10", "ten"))), Suit((1, "s", "♠", "spades")))
+
+def test_cards_are_interned():
+    import copy
+    import pickle
+
+    for i, card in enumerate(CARDS):
+        assert card.id == i
+        assert Card(card.suit, card.rank) is card
+        assert pickle.loads(pickle.dumps(card)) is card
+        assert copy.deepcopy(card) is card
+    assert Suit((1, "s", "♠", "spades")) is SUITS[3]
+    assert Rank((2, True, "j", "jack")) is RANKS[2]
+    assert Deck().cards[5] is CARDS[5]
+    assert len({card: None for card in Deck().cards + Deck().cards}) == 24
+
+def test_interning_rejects_conflicts():
+    with pytest.raises(ValueError):
+        Suit((0, "s", "♠", "spades"))
+    with pytest.raises(ValueError):
+        Rank((2, False, "j", "jack"))
+    assert SUITS[3].color == 1 and RANKS[2].trumper
+
+def test_card_ids_follow_suit_and_rank():
+    assert all(Card(suit, rank).id == suit.id * len(RANKS) + rank.id for suit in SUITS for rank in RANKS)
+    # Cards outside the standard deck are numbered after it
+    joker = Card(SUITS[0], Rank((6, False, "x", "joker")))
+    assert joker.id >= len(CARDS) and Card(SUITS[0], joker.rank) is joker
+
+def test_foreign_comparisons():
+    assert CARDS[0] != "9h" and SUITS[0] != 0 and RANKS[0] != None
+    with pytest.raises(TypeError):
+        RANKS[0] < 1
@@ -0,0 +1,68 @@
+"""Tests for self-play training data shards."""
+
+import numpy as np
+
+from pyeuchre import features
+from pyeuchre.dataset import SampleReader
+from pyeuchre.dataset import SampleWriter
+from pyeuchre.sim import simulate
+
+
+def test_write_and_read_shards(tmp_path):
+    with SampleWriter(tmp_path, shard_size=1000) as writer:
+        simulate(10, seed=0, writer=writer)
+
+    reader = SampleReader(tmp_path)
+    assert len(reader) == writer.rows > 1000
+    assert reader.manifest["games"] == 10
+    shards = list(reader)
+    assert len(shards) == len(reader.manifest["shards"]) > 1
+    assert all(len(shard["action"]) == 1000 for shard in shards[:-1])
+
+    for shard in shards:
+        assert isinstance(shard["features"], np.memmap)
+        assert shard["features"].shape == (len(shard["action"]), features.WIDTH)
+        assert (shard["legal"] >> shard["action"].astype(np.uint32) & 1).all()
+        assert set(np.unique(shard["won"])) <= {-1, 1}
+
+    games = np.concatenate([shard["game"] for shard in shards])
+    won = np.concatenate([shard["won"] for shard in shards])
+    assert (np.diff(games.astype(np.int64)) >= 0).all()
+    # Both teams decide in every game, so half the samples of each game are from the winners
+    for game in range(10):
+        assert set(won[games == game]) == {-1, 1}
+
+
+def test_same_seed_same_samples(tmp_path):
+    for name in ("a", "b"):
+        with SampleWriter(tmp_path / name, shard_size=4096) as writer:
+            simulate(3, seed=1, writer=writer)
+    a, b = (next(iter(SampleReader(tmp_path / name))) for name in ("a", "b"))
+    for field in a:
+        assert (a[field] == b[field]).all()
+
+
+def test_append_to_dataset(tmp_path):
+    with SampleWriter(tmp_path, shard_size=1 << 16) as writer:
+        simulate(2, seed=2, writer=writer)
+    first = writer.rows
+    before = {field: np.array(array) for field, array in next(iter(SampleReader(tmp_path))).items()}
+    with SampleWriter(tmp_path, shard_size=1 << 16) as writer:
+        simulate(2, seed=3, writer=writer)
+    reader = SampleReader(tmp_path)
+    assert reader.manifest["games"] == 4
+    assert len(reader) == writer.rows > first
+    # The partly filled shard is resumed rather than left behind
+    (shard,) = reader
+    for field, array in before.items():
+        assert (shard[field][:first] == array).all()
+    assert (shard["game"][first:] >= 2).all()
+
+
+def test_resume_fills_last_shard(tmp_path):
+    with SampleWriter(tmp_path, shard_size=1000) as writer:
+        simulate(1, seed=4, writer=writer)
+    with SampleWriter(tmp_path, shard_size=1000) as writer:
+        simulate(10, seed=5, writer=writer)
+    shards = SampleReader(tmp_path).manifest["shards"]
+    assert all(shard["rows"] == 1000 for shard in shards[:-1])
@@ -0,0 +1,32 @@
+"""Tests for the vectorized batch dealer."""
+
+import numpy as np
+
+from pyeuchre import bitboard
+from pyeuchre.dealer import deal_permutations, deck_from_permutation, permutation_masks
+from pyeuchre.game import Hand
+from pyeuchre.sim import random_players
+
+
+def test_deal_permutations():
+    perms = deal_permutations(100, np.random.default_rng(0))
+    assert perms.shape == (100, 24)
+    assert (np.sort(perms, axis=1) == np.arange(24)).all()
+
+
+def test_permutation_masks_partition_deck():
+    masks = permutation_masks(deal_permutations(100, np.random.default_rng(0)))
+    assert masks.shape == (100, 6)
+    assert (np.bitwise_or.reduce(masks, axis=1) == bitboard.FULL_MASK).all()
+    assert [int(m).bit_count() for m in masks[0]] == [5, 5, 5, 5, 1, 3]
+
+
+def test_deck_from_permutation_deals_rows():
+    perm = deal_permutations(1, np.random.default_rng(1))[0]
+    masks = permutation_masks(perm[None])[0]
+    players = random_players()
+    hand = Hand(players, deck=deck_from_permutation(perm), shuffle_deck=False)
+    for seat, player in enumerate(players):
+        assert bitboard.to_mask(player.cards) == masks[seat]
+    assert bitboard.card_index(hand.lead) == perm[20]
+    assert bitboard.to_mask(hand.kitty) == masks[5]
@@ -0,0 +1,90 @@
+"""Tests for numbering deals."""
+
+import itertools
+import random
+
+import pytest
+
+from pyeuchre import bitboard
+from pyeuchre import deals
+from pyeuchre.canonical import PERMUTATIONS, canonicalize, permute_mask
+from pyeuchre.game import Hand
+from pyeuchre.sim import random_players
+
+
+def test_count():
+    assert deals.count() == 42504 * 11628 * 2002 * 126 * 4
+    assert deals.count() < 2**63
+    # Only a few deals are fixed by a relabelling, so there are just over an eighth as many classes
+    assert deals.count() / 8 < deals.count(symmetric=True) < deals.count() / 7.99
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_rank_unrank_round_trip(symmetric):
+    rng = random.Random(0)
+    total = deals.count(symmetric)
+    for index in [0, 1, total - 1, *(rng.randrange(total) for _i in range(200))]:
+        masks = deals.unrank_masks(index, symmetric)
+        assert [mask.bit_count() for mask in masks] == [5, 5, 5, 5, 1, 3]
+        assert sum(masks) == bitboard.FULL_MASK
+        assert deals.rank_masks(masks, symmetric) == index
+
+
+def test_unrank_out_of_range():
+    with pytest.raises(IndexError):
+        deals.unrank_masks(deals.count())
+    with pytest.raises(IndexError):
+        deals.unrank_masks(-1, symmetric=True)
+
+
+def test_seat_zero_is_most_significant():
+    assert deals.unrank_masks(0)[:5] == (0x1F, 0x1F << 5, 0x1F << 10, 0x1F << 15, 1 << 20)
+    # The last deal gives seat 0 the five highest cards
+    assert deals.unrank_masks(deals.count() - 1)[0] == 0x1F << 19
+    # Deals ranked by seat 0's hand first
+    first = [deals.unrank_masks(index)[0] for index in range(0, deals.count(), deals.count() // 100)]
+    assert first == sorted(first)
+
+
+def test_symmetric_rank_is_class_invariant():
+    rng = random.Random(1)
+    for _i in range(50):
+        masks = deals.unrank_masks(rng.randrange(deals.count()))
+        index = deals.rank_masks(masks, symmetric=True)
+        for perm in PERMUTATIONS:
+            assert deals.rank_masks([permute_mask(mask, perm) for mask in masks], symmetric=True) == index
+        assert deals.unrank_masks(index, symmetric=True)[:5] == canonicalize(masks[:5])[0]
+
+
+def test_symmetric_counts_match_enumeration():
+    # Deal two single cards from the whole deck: count classes by brute force
+    pairs = {
+        canonicalize([1 << a, 1 << b])[0]
+        for a, b in itertools.permutations(range(bitboard.CARD_COUNT), 2)
+    }
+    assert deals._count(bitboard.FULL_MASK, (1, 1), deals.SYMMETRIES) == len(pairs)
+
+
+def test_hand_round_trip():
+    rng = random.Random(2)
+    players = random_players(rng)
+    for symmetric in (False, True):
+        for _i in range(20):
+            index = rng.randrange(deals.count(symmetric))
+            hand = Hand(players, deck=deals.unrank(index, symmetric), shuffle_deck=False)
+            assert deals.rank(hand, symmetric) == index
+            assert deals.hand_masks(hand) == deals.unrank_masks(index, symmetric)
+
+
+def test_shards_cover_range():
+    ranges = [deals.shard_range(shard, 7, symmetric=True) for shard in range(7)]
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == deals.count(symmetric=True)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+def test_iter_deals():
+    decks = list(deals.iter_deals(100, 110))
+    assert len(decks) == 10
+    assert [deals.rank_masks(deals.unrank_masks(100 + i)) for i in range(10)] == list(range(100, 110))
+    assert bitboard.deal_order(decks[0]) == [i for mask in deals.unrank_masks(100) for i in bitboard.indices(mask)]
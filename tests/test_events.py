@@ -0,0 +1,74 @@
+"""Tests for game events."""
+
+import random
+
+from pyeuchre.events import CardPlayed
+from pyeuchre.events import DecisionMade
+from pyeuchre.events import HandDealt
+from pyeuchre.events import HandScored
+from pyeuchre.events import LonerDeclared
+from pyeuchre.events import TrickWon
+from pyeuchre.events import TrumpCalled
+from pyeuchre.game import Game
+from pyeuchre.sim import random_players
+
+
+def test_events_follow_the_game():
+    game = Game(random_players(random.Random(4)), rng=random.Random(4))
+    events = []
+    game.events.subscribe(events.append)
+    while game.active:
+        game.play_hand()
+
+    hands = [i for i, event in enumerate(events) if isinstance(event, HandDealt)]
+    assert len(hands) == sum(isinstance(event, HandScored) for event in events)
+    for start, end in zip(hands, [*hands[1:], len(events)]):
+        decisions = [event for event in events[start:end] if isinstance(event, DecisionMade)]
+        hand = [type(event) for event in events[start:end] if not isinstance(event, DecisionMade)]
+        assert hand[-1] is HandScored
+        if TrumpCalled not in hand:
+            assert hand == [HandDealt, HandScored]
+            assert [event.request for event in decisions] == ["request_trump_call"] * 4 + ["request_trump_choose"] * 4
+            continue
+        plays = hand.count(CardPlayed)
+        assert hand.count(TrickWon) == 5
+        assert plays == (15 if LonerDeclared in hand else 20)
+        assert [event.request for event in decisions].count("request_play_card") == plays
+        assert all(event.answer is None for event in decisions if event.request == "request_replace_card")
+
+    scored = [event for event in events if isinstance(event, HandScored) and event.team]
+    assert sum(event.points for event in scored) == sum(team.score for team in game.players.teams)
+
+    won = [event for event in events if isinstance(event, TrickWon)]
+    assert all(event.player is event.trick.winner for event in won)
+
+
+def test_subscribe_to_some_kinds_and_unsubscribe():
+    game = Game(random_players())
+    seen = []
+    game.events.subscribe(seen.append, TrickWon)
+    game.play_hand()
+    assert all(isinstance(event, TrickWon) for event in seen)
+
+    game.events.unsubscribe(seen.append)
+    assert game.events.handlers == {}
+    count = len(seen)
+    game.play_hand()
+    assert len(seen) == count
+
+
+def test_handlers_may_unsubscribe_while_called():
+    game = Game(random_players(random.Random(0)), rng=random.Random(0))
+    seen = []
+
+    def once(event):
+        seen.append(("once", event))
+        game.events.unsubscribe(once, TrickWon)
+
+    game.events.subscribe(once, TrickWon)
+    game.events.subscribe(lambda event: seen.append(("always", event)), TrickWon)
+    game.play_hand()
+    # Unsubscribing during the first event must not skip the next handler
+    assert [kind for kind, _event in seen[:2]] == ["once", "always"]
+    assert seen[0][1] is seen[1][1]
+    assert sum(kind == "once" for kind, _event in seen) == 1
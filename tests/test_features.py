@@ -0,0 +1,68 @@
+"""Tests for encoding decision points."""
+
+import random
+
+from pyeuchre import features
+from pyeuchre.events import DecisionMade
+from pyeuchre.game import Game
+from pyeuchre.sim import random_players
+
+
+def _follow(seed, check):
+    """Call check with every decision of a hand, as it is made."""
+    game = Game(random_players(random.Random(seed)), rng=random.Random(seed))
+    game.events.subscribe(check, DecisionMade)
+    game.play_hand()
+
+
+def test_layout_is_contiguous():
+    groups = sorted(features.LAYOUT.values(), key=lambda group: group.start)
+    assert groups[0].start == 0
+    assert all(a.stop == b.start for a, b in zip(groups, groups[1:]))
+    assert groups[-1].stop == features.WIDTH
+
+
+def test_every_decision_encodes_and_maps_to_a_legal_action():
+    kinds = set()
+
+    def check(event):
+        hand, player, request, args, answer = event
+        kinds.add(request)
+        row = features.encode(hand, player, request, args)
+        assert row.shape == (features.WIDTH,)
+        assert row[features.LAYOUT["kind"]].sum() == 1
+        assert row[features.LAYOUT["up_card"]].sum() == 1
+        assert row[features.LAYOUT["dealer"]].sum() == 1
+
+        held = row[features.LAYOUT["cards"]].sum()
+        action = features.to_action(hand, player, request, args, answer)
+        assert features.legal_mask(hand, player, request, args) >> action & 1
+        if request == "request_replace_card":
+            assert held == 6
+            assert features.from_action(request, action) in features.held_cards(hand, player, request, args)
+        elif request == "request_play_card":
+            assert held == len(player.cards)
+            assert features.from_action(request, action) is answer
+            played = row[features.LAYOUT["trick"]].sum() + row[features.LAYOUT["played"]].sum()
+            assert played == sum(len(trick.cards) for trick in hand.tricks)
+            seats = hand.players.players
+            leader = seats.index(hand.trick.cards[0]["player"]) if hand.trick.cards else seats.index(player)
+            assert row[features.LAYOUT["leader"]].sum() == 1
+            assert row[features.LAYOUT["leader"]].argmax() == (leader - seats.index(player)) % 4
+        else:
+            assert features.from_action(request, action) == answer
+
+    for seed in range(20):
+        _follow(seed, check)
+    assert kinds == set(features.REQUESTS)
+
+
+def test_observation_is_relative_to_the_player():
+    def check(event):
+        seats = event.hand.players.players
+        dealer = seats.index(event.hand.dealer)
+        for seat, player in enumerate(seats):
+            row = features.encode(event.hand, player, event.request, event.args)
+            assert row[features.LAYOUT["dealer"]].argmax() == (dealer - seat) % 4
+
+    _follow(0, check)
@@ -0,0 +1,95 @@
+"""Tests for game flow classes."""
+
+import random
+
+import pytest
+
+from pyeuchre.cards import SUITS
+from pyeuchre.exceptions import RenegeError
+from pyeuchre.game import Hand, Trick
+from pyeuchre.people.groups import Players, Team
+from pyeuchre.people.players import Player, RandomBot
+from pyeuchre.sim import random_players
+from pyeuchre.utility.input import parse_card
+
+
+def _trick(trump, plays):
+    trick = Trick(None, trump)
+    players = [Player(str(i)) for i in range(len(plays))]
+    for player, card in zip(players, plays):
+        trick.add(player, parse_card(card))
+    return trick, players
+
+
+def test_trick_right_bower_wins():
+    trick, players = _trick(SUITS[0], ["a h", "j d", "j h", "k h"])
+    assert trick.winner is players[2]
+    assert trick.winning_card == parse_card("j h")
+
+
+def test_trick_left_bower_beats_trump_ace():
+    trick, players = _trick(SUITS[0], ["a h", "j d", "9 h"])
+    assert trick.winner is players[1]
+
+
+def test_trick_left_bower_leads_trump():
+    trick, players = _trick(SUITS[0], ["j d", "a d", "9 h"])
+    assert trick.suit == SUITS[0]
+    assert trick.winner is players[0]
+
+
+def test_trick_off_suit_cannot_win():
+    trick, players = _trick(SUITS[3], ["9 c", "a d", "10 c", "j c"])
+    assert trick.winner is players[3]
+
+    trick, players = _trick(SUITS[3], ["9 d", "a c", "10 d", "k h"])
+    assert trick.winner is players[2]
+
+
+def test_trick_running_winner():
+    trick = Trick(None, SUITS[2])
+    first, second = Player("first"), Player("second")
+    trick.add(first, parse_card("q d"))
+    assert trick.winner is first
+    trick.add(second, parse_card("9 c"))
+    assert trick.winner is second
+
+
+def test_hand_score():
+    players = random_players()
+    hand = Hand(players)
+    makers, defenders = players.teams
+    hand.trump_team = makers
+
+    makers.tricks, defenders.tricks = 3, 2
+    assert hand.score() == (makers, 1)
+
+    makers.tricks, defenders.tricks = 5, 0
+    assert hand.score() == (makers, 2)
+
+    hand.loner_player = makers[0]
+    assert hand.score() == (makers, 4)
+
+    makers.tricks, defenders.tricks = 2, 3
+    assert hand.score() == (defenders, 2)
+
+
+class _Renegade(RandomBot):
+    def request_play_card(self, hand):
+        legal = self.legal_cards(hand)
+        return next((card for card in self.cards if card not in legal), legal[0])
+
+
+def test_trick_play_rejects_renege():
+    rng = random.Random(0)
+    north, south = RandomBot("North", random.Random(1)), RandomBot("South", random.Random(2))
+    east, west = _Renegade("East", random.Random(3)), RandomBot("West", random.Random(4))
+    players = Players((Team((north, south)), Team((east, west))))
+    # Deal until East holds a card that does not follow but could have followed
+    with pytest.raises(RenegeError):
+        for _i in range(50):
+            hand = Hand(players, rng=rng)
+            hand.trump_suit = SUITS[0]
+            hand.leader = players.players[0]
+            hand.start_trick()
+            hand.trick.play()
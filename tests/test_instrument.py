@@ -0,0 +1,48 @@
+"""Tests for opt-in instrumentation."""
+
+import io
+
+from pyeuchre import instrument
+from pyeuchre.instrument import Dumper
+from pyeuchre.instrument import Histogram
+from pyeuchre.sim import simulate
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for i in range(1, 101):
+        histogram.record(i / 1000)
+    assert histogram.count == 100
+    assert abs(histogram.mean - 0.0505) < 1e-9
+    assert 0.05 <= histogram.quantile(0.5) <= 0.05 * 1.1
+    assert 0.099 <= histogram.quantile(0.99) <= 0.1
+    assert histogram.quantile(1) == histogram.max == 0.1
+
+
+def test_disabled_records_nothing():
+    probe = instrument.Instrumentation()
+    simulate(5, seed=0)
+    assert instrument.current is None
+    assert probe.snapshot() == {"counters": {}, "phases": {}, "decisions": {}}
+
+
+def test_enabled_records_phases_and_decisions():
+    probe = instrument.enable()
+    try:
+        result = simulate(5, seed=0)
+    finally:
+        instrument.disable()
+
+    hands = sum(game.hands for game in result.results)
+    snapshot = probe.snapshot()
+    assert snapshot["counters"]["deal"] == snapshot["counters"]["bidding"] == hands
+    assert snapshot["counters"]["trick"] == snapshot["counters"]["start_trick"]
+    assert snapshot["phases"]["trick"]["p50"] <= snapshot["phases"]["trick"]["p99"]
+    # Every seat holds a random bot, and decisions of the same seat are pooled across games
+    assert {"RandomBot[0].play_card", "RandomBot[1].trump_call"} <= set(snapshot["decisions"])
+
+    stream = io.StringIO()
+    Dumper(probe, stream=stream).dump()
+    assert "RandomBot[0].play_card" in stream.getvalue()
+    probe.reset()
+    assert probe.snapshot()["counters"] == {}
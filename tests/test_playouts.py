@@ -0,0 +1,31 @@
+"""Tests for vectorized random-bot playouts."""
+
+import statistics
+
+import numpy as np
+
+from pyeuchre.playouts import play_random_games
+from pyeuchre.playouts import simulate_random
+from pyeuchre.sim import simulate
+
+
+def test_games_finish():
+    results = play_random_games(500, np.random.default_rng(0))
+    assert len(results) == 500
+    for result in results:
+        assert max(result.scores) >= 10
+        assert result.scores[result.winner] == max(result.scores)
+        assert result.hands > 0
+
+
+def test_simulate_random_seeded():
+    first = simulate_random(1000, seed=1, batch=300)
+    assert first.results == simulate_random(1000, seed=1, batch=300).results
+    assert sum(first.wins) == 1000
+
+
+def test_matches_game_engine():
+    results = simulate_random(4000, seed=2).results
+    engine = simulate(300, seed=2).results
+    assert abs(statistics.mean(r.hands for r in results) - statistics.mean(r.hands for r in engine)) < 1
+    assert abs(statistics.mean(sum(r.scores) for r in results) - statistics.mean(sum(r.scores) for r in engine)) < 1
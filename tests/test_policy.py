@@ -0,0 +1,60 @@
+"""Tests for policy bots and batched inference."""
+
+import asyncio
+
+import numpy as np
+
+from pyeuchre import features
+from pyeuchre.policy import MLP
+from pyeuchre.policy import BatchScheduler
+from pyeuchre.policy import arun_batched
+from pyeuchre.policy import play_batched
+from pyeuchre.policy import policy_players
+from pyeuchre.policy import select
+from pyeuchre.sim import play_seeded
+
+
+def _model():
+    return MLP.random((16,), np.random.default_rng(0))
+
+
+def test_mlp_scores_batches(tmp_path):
+    model = _model()
+    x = np.random.default_rng(1).integers(0, 2, (7, features.WIDTH), dtype=np.uint8)
+    assert model(x).shape == (7, features.ACTIONS)
+    assert np.allclose(model(x[2:3]), model(x)[2:3], atol=1e-5)
+    assert MLP.random().weights[0].shape == (features.WIDTH, features.ACTIONS)
+
+    model.save(tmp_path / "model.npz")
+    assert np.array_equal(MLP.load(tmp_path / "model.npz")(x), model(x))
+
+
+def test_select_only_legal_actions():
+    rng = np.random.default_rng(2)
+    scores = rng.standard_normal((100, features.ACTIONS)).astype(np.float32)
+    legal = rng.integers(1, 1 << features.ACTIONS, 100, dtype=np.uint32)
+    for temperature in (0.0, 1.0):
+        actions = select(scores, legal, temperature, rng)
+        assert ((legal >> actions.astype(np.uint32)) & 1).all()
+    best = select(scores, np.full(100, (1 << features.ACTIONS) - 1, dtype=np.uint32))
+    assert (best == scores.argmax(axis=1)).all()
+
+
+def test_batched_games_match_unbatched():
+    model = _model()
+    batched = play_batched(12, model, tables=5, seed=3)
+    assert batched.results == play_batched(12, model, tables=12, seed=3).results
+
+    scheduler = BatchScheduler(model)
+    alone = [play_seeded(3, game, lambda rng: policy_players(scheduler, rng)) for game in range(12)]
+    assert batched.results == alone
+    # Decisions made alone never reach the scheduler
+    assert scheduler.batches == 0
+
+
+def test_scheduler_batches_across_tables():
+    scheduler = BatchScheduler(_model())
+    results = asyncio.run(arun_batched(16, scheduler, tables=8, seed=4))
+    assert len(results) == 16
+    assert scheduler.mean_batch > 4
+    assert scheduler.tables == 0
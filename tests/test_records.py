@@ -0,0 +1,49 @@
+"""Tests for game records and replay."""
+
+import pytest
+
+from pyeuchre.records import RecordReader, RecordWriter, replay
+from pyeuchre.sim import simulate
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / "games.rec"
+    with RecordWriter(path, buffer_size=100) as writer:
+        result = simulate(5, seed=2, writer=writer)
+
+    reader = RecordReader(path)
+    records = list(reader)
+    assert len(records) == 5
+    for record, game in zip(records, result.results):
+        assert record.scores == game.scores
+        assert len(record.hands) == game.hands
+        assert all(len(hand.plays) in (0, 15, 20) for hand in record.hands)
+        replayed = replay(record)
+        assert tuple(team.score for team in replayed.players.teams) == game.scores
+    reader.close()
+
+
+def test_record_appends(tmp_path):
+    path = tmp_path / "games.rec"
+    for seed in (1, 2):
+        with RecordWriter(path) as writer:
+            simulate(2, seed=seed, writer=writer)
+
+    reader = RecordReader(path)
+    assert len(list(reader)) == 4
+    reader.close()
+
+
+def test_truncated_file_is_corrupt(tmp_path):
+    path = tmp_path / "games.rec"
+    with RecordWriter(path) as writer:
+        simulate(1, seed=3, writer=writer)
+    data = path.read_bytes()
+
+    # Cut inside the last hand record, and between the last hand and the end of the game
+    for size in (len(data) - 10, len(data) - 3):
+        path.write_bytes(data[:size])
+        reader = RecordReader(path)
+        with pytest.raises(ValueError, match="corrupt record file"):
+            list(reader)
+        reader.close()
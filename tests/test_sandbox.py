@@ -0,0 +1,121 @@
+"""Tests for the out-of-process bot sandbox."""
+
+import os
+import random
+import time
+
+from pyeuchre.game import Game
+from pyeuchre.people.groups import Players
+from pyeuchre.people.groups import Team
+from pyeuchre.people.players import RandomBot
+from pyeuchre.sandbox import HIDDEN
+from pyeuchre.sandbox import SandboxedPlayer
+from pyeuchre.sandbox import WorkerPool
+from pyeuchre.sandbox import hand_view
+from pyeuchre.sandbox import rebuild_hand
+from pyeuchre.sim import play_game
+from pyeuchre.sim import random_players
+
+
+class SlowBot(RandomBot):
+    def request_play_card(self, hand):
+        time.sleep(5)
+        return super().request_play_card(hand)
+
+
+class CrashingBot(RandomBot):
+    def request_play_card(self, hand):
+        os._exit(1)
+
+
+class CheatingBot(RandomBot):
+    def request_play_card(self, hand):
+        return self.cards[-1] if len(self.cards) > 1 else self.cards[0]
+
+
+def _players(pool, factories):
+    seats = [SandboxedPlayer(f"P{i}", factory, pool, seed=i) for i, factory in enumerate(factories)]
+    return Players((Team((seats[0], seats[2])), Team((seats[1], seats[3])))), seats
+
+
+def test_rebuild_hand_matches_view():
+    game = Game(random_players())
+    game.deal_hand()
+    hand = game.hand
+    hand.process_call_trump()
+    player = hand.players.players[1]
+    if hand.trump_suit:
+        hand.start_trick()
+        hand.trick.play()
+        hand.start_trick()
+    view = hand_view(hand, player)
+    copy = RandomBot("copy")
+    assert hand_view(rebuild_hand(view, copy), copy) == view
+
+
+def test_rebuilt_hand_allows_the_same_cards():
+    checked = 0
+    for seed in range(10):
+        game = Game(random_players(random.Random(seed)), rng=random.Random(seed))
+        game.deal_hand()
+        hand = game.hand
+        hand.process_call_trump()
+        if not hand.trump_suit:
+            continue
+        # At the start of the second trick, and after its lead
+        hand.start_trick()
+        hand.trick.play()
+        hand.start_trick()
+        for _i in range(2):
+            for player in hand.players.players:
+                if player.skip:
+                    continue
+                rebuilt = rebuild_hand(hand_view(hand, player), RandomBot("copy"))
+                copy = rebuilt.players.players[hand.players.players.index(player)]
+                assert len(rebuilt.trick.cards) == len(hand.trick.cards)
+                assert rebuilt.trick.legal_cards(copy) == hand.trick.legal_cards(player)
+                checked += 1
+            leader = next(p for p in hand.players.ordered(hand.leader) if not p.skip)
+            card = leader.request_play_card(hand)
+            hand.trick.play_card(leader, card)
+    assert checked
+
+
+def test_rebuilt_hand_keeps_the_discard():
+    for seed in range(50):
+        game = Game(random_players(random.Random(seed)), rng=random.Random(seed))
+        game.deal_hand()
+        hand = game.hand
+        hand.process_call_trump()
+        if hand.discard is not None:
+            break
+    dealer = hand.players.dealer
+    other = next(player for player in hand.players.players if player is not dealer)
+
+    # Only the dealer knows what they discarded, but every seat knows the lead card was picked up
+    assert rebuild_hand(hand_view(hand, dealer), RandomBot("copy")).discard == hand.discard
+    view = hand_view(hand, other)
+    assert view.discard == HIDDEN
+    assert rebuild_hand(view, RandomBot("copy")).discard is not None
+
+
+def test_sandboxed_game_finishes():
+    with WorkerPool(workers=2, timeout=5.0) as pool:
+        players, seats = _players(pool, [RandomBot] * 4)
+        for _i in range(3):
+            result = play_game(players)
+            assert max(result.scores) >= 10
+        assert all(not seat.errors for seat in seats)
+        assert pool.restarts == 0
+
+
+def test_sandbox_falls_back_and_restarts():
+    with WorkerPool(workers=2, timeout=0.2) as pool:
+        players, seats = _players(pool, [SlowBot, CrashingBot, CheatingBot, RandomBot])
+        game = Game(players)
+        game.play_hand()
+        game.play_hand()
+        assert pool.restarts > 0
+        assert seats[0].errors or seats[1].errors
+        assert all(error.startswith("request_play_card") for seat in seats for error in seat.errors)
+        assert not seats[3].errors
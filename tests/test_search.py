@@ -0,0 +1,113 @@
+"""Tests for the tree-search state."""
+
+import random
+
+import pytest
+
+from pyeuchre.bitboard import card_index
+from pyeuchre.bitboard import indices
+from pyeuchre.events import CardPlayed
+from pyeuchre.exceptions import RenegeError
+from pyeuchre.game import Game
+from pyeuchre.search import SearchState
+from pyeuchre.sim import random_players
+
+
+def _state(seed):
+    rng = random.Random(seed)
+    cards = rng.sample(range(24), 20)
+    hands = [sum(1 << c for c in cards[s * 5:(s + 1) * 5]) for s in range(4)]
+    return SearchState(hands, 0, 0, 1)
+
+
+def test_search_state_plays_out():
+    state = _state(0)
+    while not state.terminal:
+        assert state.legal() & state.hands[state.seat] == state.legal()
+        state.apply(state.greedy())
+    assert sum(state.tricks) == 5
+    assert state.points(0) == -state.points(1)
+    assert state.depth == 20
+
+
+def test_search_state_loner_skips_partner():
+    state = SearchState([0b1, 0b10, 0b100, 0b1000], 0, 0, 2, skip=2)
+    assert state.leader == 3
+    state.apply(3)
+    assert state.seat == 0
+
+
+def test_undo_restores_every_position():
+    state = _state(1)
+    positions = []
+    while not state.terminal:
+        positions.append((state.hands[:], state.leader, state.trick, state.tricks, state.seat, state.legal()))
+        state.apply(random.Random(len(positions)).choice(state.moves()))
+
+    while positions:
+        state.undo()
+        assert (state.hands[:], state.leader, state.trick, state.tricks, state.seat, state.legal()) == positions.pop()
+    assert state.depth == 0
+
+
+def test_clone_is_independent():
+    state = _state(2)
+    state.apply(state.greedy())
+    clone = state.clone()
+    clone.apply(clone.greedy())
+    clone.undo()
+    clone.undo()
+    assert clone.depth == 0
+    assert state.depth == 1
+    assert state.hands != clone.hands
+
+
+def test_from_hand_and_apply_to():
+    for seed in range(20):
+        rng = random.Random(seed)
+        game = Game(random_players(rng), rng=rng)
+        game.deal_hand()
+        hand = game.hand
+        hand.process_call_trump()
+        if not hand.trump_suit:
+            continue
+
+        hand.start_trick()
+        state = SearchState.from_hand(hand)
+        assert state.trick == ()
+        while not state.terminal:
+            state.apply(state.greedy())
+
+        played = []
+        game.events.subscribe(played.append, CardPlayed)
+        state.apply_to(hand)
+        assert [card_index(event.card) for event in played] == [card for _seat, card in state.history()]
+        assert not hand.active
+        assert tuple(team.tricks for team in hand.players.teams) == state.tricks
+        assert len(hand.tricks) == 5
+        assert hand.score()[1] == abs(state.points(0))
+        return
+    raise AssertionError("no hand was called")
+
+
+def test_apply_to_checks_follow_suit():
+    for seed in range(50):
+        rng = random.Random(seed)
+        game = Game(random_players(rng), rng=rng)
+        game.deal_hand()
+        hand = game.hand
+        hand.process_call_trump()
+        if not hand.trump_suit:
+            continue
+        hand.start_trick()
+        state = SearchState.from_hand(hand)
+        state.apply(state.greedy())
+        # The next seat plays a card that does not follow although it could
+        held, legal = state.hands[state.seat], state.legal()
+        if legal == held:
+            continue
+        state.apply(next(indices(held & ~legal)))
+        with pytest.raises(RenegeError):
+            state.apply_to(hand)
+        return
+    raise AssertionError("no seat could renege")
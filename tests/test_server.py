@@ -0,0 +1,76 @@
+"""Tests for the asyncio game server."""
+
+import asyncio
+import json
+
+from pyeuchre.server import GameServer
+from pyeuchre.server import run_tables
+
+
+def test_run_tables_concurrently():
+    results = asyncio.run(run_tables(200, seed=3))
+    assert len(results) == 200
+    assert all(max(result.scores) >= 10 for result in results)
+    assert results == asyncio.run(run_tables(200, seed=3))
+
+
+async def _client(port, name, table=None, humans=1, bad_answer=False):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps({"name": name, "table": table, "humans": humans}).encode() + b"\n")
+    messages = []
+    while line := await reader.readline():
+        message = json.loads(line)
+        messages.append(message)
+        if message["type"] == "prompt":
+            answer = message["choices"][-1]
+            if bad_answer:
+                answer, bad_answer = "nonsense", False
+            writer.write(json.dumps({"answer": answer}).encode() + b"\n")
+        elif message["type"] in ("end", "abandoned"):
+            break
+    writer.close()
+    return messages
+
+
+def test_server_plays_remote_players():
+    async def main():
+        game_server = GameServer(seed=0)
+        server = await game_server.start_tcp()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return game_server, await asyncio.gather(
+                _client(port, "Solo", bad_answer=True),
+                _client(port, "Ann", table="shared", humans=2),
+                _client(port, "Bob", table="shared", humans=2),
+            )
+
+    game_server, (solo, ann, bob) = asyncio.run(main())
+    assert len(game_server.results) == 2
+    for messages in (solo, ann, bob):
+        assert messages[0]["type"] == "seat"
+        assert messages[-1]["type"] == "end"
+        assert max(messages[-1]["scores"]) >= 10
+        assert any(message["type"] == "prompt" and message["request"] == "play_card" for message in messages)
+    assert {ann[0]["seat"], bob[0]["seat"]} == {0, 1}
+    assert any(message["type"] == "error" for message in solo)
+
+
+def test_server_rejects_bad_joins():
+    async def join(port, message):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps(message).encode() + b"\n")
+        reply = json.loads(await reader.readline())
+        rest = await reader.readline()
+        writer.close()
+        return reply, rest
+
+    async def main():
+        game_server = GameServer(seed=0)
+        server = await game_server.start_tcp()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await join(port, {"table": "t", "humans": humans}) for humans in (None, [2], "two", 1.5)]
+
+    for reply, rest in asyncio.run(main()):
+        assert reply["type"] == "error"
+        assert rest == b""
@@ -0,0 +1,41 @@
+"""Tests for headless simulation."""
+
+import random
+import statistics
+
+from pyeuchre.sim import play_game
+from pyeuchre.sim import play_random_game
+from pyeuchre.sim import random_players
+from pyeuchre.sim import simulate
+from pyeuchre.sim import simulate_random
+
+
+def test_play_game_finishes():
+    result = play_game(random_players())
+    assert max(result.scores) >= 10
+    assert result.scores[result.winner] == max(result.scores)
+    assert result.hands > 0
+
+
+def test_simulate_seeded():
+    first = simulate(20, seed=1)
+    second = simulate(20, seed=1)
+    assert first.results == second.results
+    assert sum(first.wins) == 20
+    assert first.games_per_second > 0
+
+
+def test_play_random_game_finishes():
+    result = play_random_game(random.Random(0))
+    assert max(result.scores) >= 10
+    assert result.scores[result.winner] == max(result.scores)
+    assert result.hands > 0
+
+
+def test_simulate_random_matches_game_engine():
+    first = simulate_random(2000, seed=1)
+    assert first.results == simulate_random(2000, seed=1).results
+    assert sum(first.wins) == 2000
+    # Same decision probabilities, so about as many hands per game as the game engine (about 10)
+    engine = simulate(300, seed=1)
+    assert abs(statistics.mean(r.hands for r in first.results) - statistics.mean(r.hands for r in engine.results)) < 1
@@ -0,0 +1,62 @@
+"""Tests for the double-dummy solver."""
+
+import random
+
+from pyeuchre import bitboard
+from pyeuchre.game import Hand
+from pyeuchre.sim import random_players
+from pyeuchre.solver import solve, solve_hand
+
+
+def _minimax(hands, trump, leader, makers, skip, played=()):
+    """Plain minimax without pruning, to check the solver against."""
+    seats = [(leader + k) % 4 for k in range(4) if (leader + k) % 4 != skip]
+    if not hands[seats[0]] and not played:
+        return 0
+    if len(played) == len(seats):
+        winner = seats[bitboard.trick_winner(played, trump)]
+        return (winner % 2 == makers) + _minimax(hands, trump, winner, makers, skip)
+
+    seat = seats[len(played)]
+    moves = hands[seat]
+    if played:
+        led = bitboard.effective_suit(played[0], trump)
+        moves = bitboard.follow_mask(moves, led, trump) or moves
+
+    values = []
+    for card in bitboard.indices(moves):
+        hands[seat] ^= 1 << card
+        values.append(_minimax(hands, trump, leader, makers, skip, (*played, card)))
+        hands[seat] ^= 1 << card
+    return max(values) if seat % 2 == makers else min(values)
+
+
+def _deal(rng, size, skip=None):
+    cards = rng.sample(range(24), size * 4)
+    return [0 if seat == skip else bitboard.to_mask(bitboard.CARDS[c] for c in cards[seat * size:(seat + 1) * size]) for seat in range(4)]
+
+
+def test_solver_matches_minimax():
+    rng = random.Random(0)
+    for _i in range(40):
+        skip = rng.choice([None, None, 1, 2])
+        hands = _deal(rng, 3, skip)
+        trump, leader, makers = rng.randrange(4), rng.choice([s for s in range(4) if s != skip]), rng.randrange(2)
+        assert solve(hands, trump, leader, makers, skip) == _minimax(list(hands), trump, leader, makers, skip)
+
+
+def test_solver_mid_trick():
+    rng = random.Random(1)
+    for _i in range(20):
+        hands = _deal(rng, 3)
+        played = [hands[0].bit_length() - 1]
+        hands[0] ^= 1 << played[0]
+        assert solve(hands, 2, 0, 1, played=played) == _minimax(list(hands), 2, 0, 1, None, tuple(played))
+
+
+def test_solve_full_hand():
+    players = random_players(random.Random(2))
+    hand = Hand(players, rng=random.Random(2))
+    hand.trump_suit = hand.lead.suit
+    hand.trump_team = players.teams[0]
+    assert 0 <= solve_hand(hand) <= 5
@@ -0,0 +1,58 @@
+"""Tests for the columnar hand store."""
+
+from pyeuchre.records import RecordReader, RecordWriter
+from pyeuchre.sim import simulate
+from pyeuchre.store import COLUMNS, HandStore, shred_record
+
+
+def _hands(tmp_path, games=10):
+    path = tmp_path / "games.rec"
+    with RecordWriter(path) as writer:
+        simulate(games, seed=3, writer=writer)
+    reader = RecordReader(path)
+    hands = [hand for game in reader for hand in game.hands]
+    reader.close()
+    return hands
+
+
+def test_store_query(tmp_path):
+    hands = _hands(tmp_path)
+    with HandStore(tmp_path / "store", chunk_size=16) as store:
+        for hand in hands:
+            store.append_record(hand)
+
+    store = HandStore(tmp_path / "store")
+    assert store.rows == len(hands) == store.count()
+    assert len(store.manifest["chunks"]) == (len(hands) + 15) // 16
+
+    called = store.count({"round": {1, 2}})
+    assert called == sum(hand.caller is not None for hand in hands)
+    assert store.count({"loner": 1, "round": (1, 2)}) == sum(hand.loner for hand in hands)
+
+    for chunk in store.scan(["tricks_0", "tricks_1"], {"round": (1, 2)}):
+        assert all(a + b == 5 for a, b in zip(chunk["tricks_0"], chunk["tricks_1"]))
+
+    groups = store.group_by("trump", "points_0", {"round": (1, 2)})
+    assert sum(count for count, _mean in groups.values()) == called
+
+
+def test_store_reopens(tmp_path):
+    hands = _hands(tmp_path, 2)
+    with HandStore(tmp_path / "store") as store:
+        store.append_record(hands[0])
+    with HandStore(tmp_path / "store") as store:
+        store.append_record(hands[1])
+        assert store.rows == 1
+    assert HandStore(tmp_path / "store").rows == 2
+
+
+def test_shred_points_match_scores(tmp_path):
+    path = tmp_path / "games.rec"
+    with RecordWriter(path) as writer:
+        simulate(10, seed=4, writer=writer)
+    reader = RecordReader(path)
+    for game in reader:
+        rows = [shred_record(hand) for hand in game.hands]
+        points = (sum(row[COLUMNS.index("points_0")] for row in rows), sum(row[COLUMNS.index("points_1")] for row in rows))
+        assert points == game.scores
+    reader.close()
@@ -0,0 +1,40 @@
+"""Tests for the hand-strength table."""
+
+import random
+
+import pytest
+
+from pyeuchre import bitboard
+from pyeuchre.strength import HandStrengthTable, estimate, generate, rank_hand
+
+
+def test_rank_hand_bounds():
+    assert rank_hand(0b11111) == 0
+    assert rank_hand(0b11111 << 19) == 42503
+
+
+def test_estimate_right_bower_hand():
+    # Both bowers and the ace, king and queen of hearts
+    mask = bitboard.TRUMP_MASKS[0] & ~0b11
+    strength = estimate(mask, 0, 1, 8, random.Random(0))
+    assert strength.tricks == 5 and strength.make == 1 and strength.euchre == 0
+
+
+def test_generate_and_lookup(tmp_path):
+    path = tmp_path / "strength.bin"
+    generate(path, samples=2, stop=6, workers=1)
+
+    table = HandStrengthTable(path)
+    # Entries hold the estimate seeded from their key, to the stored precision
+    stored = table.lookup(0b11111, 0, 1)
+    expected = estimate(0b11111, 0, 1, 2, random.Random(f"0:{0b11111}:1"))
+    assert stored.tricks == pytest.approx(expected.tricks, abs=1e-4)
+    assert stored.make == pytest.approx(expected.make, abs=1e-4)
+    # Entries outside the generated range are not mistaken for results
+    with pytest.raises(ValueError):
+        table.lookup(0b11111 << 19, 0, 1)
+    # The same hand in diamonds, with diamonds as trump, is relabelled to the stored entry
+    assert table.lookup(0b11111 << 6, 1, 1) == table.lookup(0b11111, 0, 1)
+    strength, out = table.pickup(0b11111, 5, 0)
+    assert out in bitboard.indices(0b111111)
+    table.close()
@@ -0,0 +1,100 @@
+"""Tests for the endgame tablebase."""
+
+import random
+
+import pytest
+
+from pyeuchre import tablebase
+from pyeuchre.canonical import PERMUTATIONS
+from pyeuchre.canonical import permute_mask
+from pyeuchre.game import Hand
+from pyeuchre.sim import random_players
+from pyeuchre.solver import Solver
+from pyeuchre.solver import solve
+from pyeuchre.solver import solve_hand
+
+
+@pytest.fixture(scope="module")
+def endgames(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tablebase") / "endgames.tb"
+    tablebase.generate(path, max_cards=2)
+    with tablebase.Tablebase(path) as base:
+        yield base
+
+
+def _deal(rng, size, skip=None):
+    cards = rng.sample(range(24), size * 4)
+    return [0 if seat == skip else sum(1 << c for c in cards[seat * size : (seat + 1) * size]) for seat in range(4)]
+
+
+def test_key_ignores_what_does_not_matter():
+    rng = random.Random(0)
+    for _i in range(100):
+        hands, trump, leader = _deal(rng, 3), rng.randrange(4), rng.randrange(4)
+        key = tablebase.position_key(hands, trump, leader)
+        # Relabelling suits, including the non-trump suits among themselves
+        for perm in PERMUTATIONS:
+            assert tablebase.position_key([permute_mask(h, perm) for h in hands], perm[trump], leader) == key
+        # Rotating the table along with the leader
+        rotated = hands[1:] + hands[:1]
+        assert tablebase.position_key(rotated, trump, (leader - 1) % 4) == key
+
+
+def test_key_compresses_ranks():
+    # Hearts trump: ace over king of hearts and ten over nine of clubs play like the right bower over the
+    # ten of hearts and queen over jack of clubs
+    assert tablebase.position_key([1 << 5, 1 << 4, 1 << 12, 1 << 13], 0, 0) == tablebase.position_key(
+        [1 << 2, 1 << 1, 1 << 14, 1 << 15], 0, 0
+    )
+    assert tablebase.position_key([1 << 5, 1 << 4, 1 << 12, 1 << 13], 0, 0) != tablebase.position_key(
+        [1 << 4, 1 << 5, 1 << 12, 1 << 13], 0, 0
+    )
+
+
+def test_probe_matches_solver(endgames):
+    assert endgames.max_cards == 2
+    rng = random.Random(1)
+    for _i in range(300):
+        size = rng.choice([1, 2])
+        skip = rng.choice([None, None, 0, 1, 2, 3])
+        hands, trump, leader = _deal(rng, size, skip), rng.randrange(4), rng.randrange(4)
+        lead = (leader + 1) % 4 if leader == skip else leader
+        assert endgames.probe(hands, trump, leader, skip) == solve(hands, trump, lead, lead & 1, skip)
+    assert endgames.probe(_deal(rng, 3), 0, 0) is None
+
+
+def test_solver_stops_at_horizon(endgames):
+    rng = random.Random(2)
+    for _i in range(30):
+        skip = rng.choice([None, None, 1, 2])
+        hands, trump = _deal(rng, 4, skip), rng.randrange(4)
+        leader, makers = rng.choice([s for s in range(4) if s != skip]), rng.randrange(2)
+        plain = Solver(trump, makers, skip)
+        fast = Solver(trump, makers, skip, tablebase=endgames)
+        assert fast.solve(hands, leader) == plain.solve(hands, leader)
+        assert fast.nodes < plain.nodes
+
+
+def test_solve_hand_with_tablebase(endgames):
+    players = random_players(random.Random(3))
+    hand = Hand(players, rng=random.Random(3))
+    hand.trump_suit = hand.lead.suit
+    hand.trump_team = players.teams[0]
+    assert solve_hand(hand, endgames) == solve_hand(hand)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.tb"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        tablebase.Tablebase(path)
+
+
+def test_write_round_trip(tmp_path):
+    rng = random.Random(4)
+    results = {key: rng.randrange(4) for key in rng.sample(range(1 << 40), 5000)}
+    tablebase.write(tmp_path / "keys.tb", results, max_cards=3)
+    with tablebase.Tablebase(tmp_path / "keys.tb") as base:
+        assert len(base) == len(results)
+        assert base.max_cards == 3
+        assert all(base.lookup(key) == taken for key, taken in results.items())
@@ -0,0 +1,16 @@
+"""Tests for the multi-process tournament runner."""
+
+from pyeuchre.sim import simulate
+from pyeuchre.tournament import run_shard, run_tournament
+
+
+def test_tournament_shards_reproducible():
+    shards = sorted(run_tournament(7, seed=3, shard_size=3, workers=2))
+    assert [len(shard.results) for shard in shards] == [3, 3, 1]
+    assert shards[1].results == run_shard(1, 3, 3, 3).results
+    assert shards[2].results == run_shard(2, 6, 1, 3).results
+
+
+def test_tournament_matches_simulate():
+    shards = sorted(run_tournament(5, seed=8, shard_size=2, workers=2))
+    assert [result for shard in shards for result in shard.results] == simulate(5, seed=8).results